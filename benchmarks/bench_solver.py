@@ -0,0 +1,279 @@
+"""
+Solver Benchmark
+Times model build, CBC solve and result extraction on synthetic instances
+
+Usage:
+    python benchmarks/bench_solver.py
+    python benchmarks/bench_solver.py --shapes 3x4x3 50x50x6 --repeat 5
+    python benchmarks/bench_solver.py --config configs/Microtech_Default.json
+"""
+
+import argparse
+import datetime
+import json
+import multiprocessing
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from instances import generate_instance
+
+import pulp
+from tabulate import tabulate
+
+from cbc_runner import cbc_arguments, run_cbc, solve_with_cbc
+from config_io import load_config_file
+from mps_model import read_cbc_solution, write_material_mps
+from pulp import LpStatus
+from problem import Allocation
+from solver import ContainerSolver, available_backends, build_material_model, extract_allocation
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows; CBC memory is then not recorded
+    resource = None
+
+
+# From the 3×4×3 Microtech default up to the largest manifests we plan for
+DEFAULT_SHAPES = ["3x4x3", "10x10x3", "25x25x4", "50x50x6", "100x100x8"]
+
+RESULTS_FOLDER = Path(__file__).resolve().parent / "results"
+
+
+def parse_shape(text):
+    """Parse 'LxMxS' into a (locations, materials, sizes) tuple"""
+    try:
+        shape = tuple(int(part) for part in text.lower().split("x"))
+    except ValueError:
+        shape = ()
+    if len(shape) != 3 or min(shape) <= 0:
+        raise argparse.ArgumentTypeError(f"invalid shape '{text}', expected e.g. 10x10x3")
+    return shape
+
+
+def solve_block_pulp(mat, requirements, stock, problem, threads, time_limit):
+    """Build, solve and extract one block through PuLP; returns (status, allocation, times)"""
+    start = time.perf_counter()
+    prob, x = build_material_model(mat, requirements, stock, problem.locations, problem.sizes)
+    built = time.perf_counter()
+    status = LpStatus[solve_with_cbc(prob, threads, time_limit=time_limit)]
+    solved = time.perf_counter()
+    allocation = extract_allocation(x) if status == "Optimal" else None
+    return status, allocation, (built - start, solved - built, time.perf_counter() - solved)
+
+
+def solve_block_direct(mat, requirements, stock, problem, threads, time_limit):
+    """Write, solve and read one block through a direct MPS file; same return as above"""
+    mps_path = os.path.join(tempfile.gettempdir(), "bench-block.mps")
+    sol_path = os.path.join(tempfile.gettempdir(), "bench-block.sol")
+    start = time.perf_counter()
+    write_material_mps(mps_path, requirements, stock, problem.sizes)
+    built = time.perf_counter()
+    run_cbc(cbc_arguments(mps_path, sol_path, threads, time_limit=time_limit), sol_path)
+    solved = time.perf_counter()
+    status, values = read_cbc_solution(sol_path, len(problem.locations) * len(problem.sizes))
+    allocation = values if status == "Optimal" else None
+    extracted = time.perf_counter()
+    os.remove(mps_path)
+    os.remove(sol_path)
+    return status, allocation, (built - start, solved - built, extracted - solved)
+
+
+MODEL_BUILDERS = {
+    'pulp': solve_block_pulp,
+    'direct': solve_block_direct
+}
+
+
+def run_phases(problem, threads=None, time_limit=None, model="pulp"):
+    """
+    Solve every material block with CBC, timing each phase separately
+
+    Returns:
+        Dict with build, solve and extract times in seconds, the number of
+        blocks stopped on the time limit and the total number of containers
+        (None unless every block was solved to optimality)
+    """
+    build = solve = extract = 0.0
+    timed_out = 0
+    blocks = []
+
+    solve_block = MODEL_BUILDERS[model]
+    for j, mat in enumerate(problem.materials):
+        status, allocation, times = solve_block(mat, list(problem.material_requirements(j)),
+                                                list(problem.material_stock(j)), problem,
+                                                threads, time_limit)
+        timed_out += status == "Not Solved"
+        blocks.append(allocation)
+        build += times[0]
+        solve += times[1]
+        extract += times[2]
+
+    total = None
+    if all(block is not None for block in blocks):
+        start = time.perf_counter()
+        allocation = Allocation.from_blocks(problem.locations, problem.materials,
+                                            problem.sizes, blocks)
+        total = allocation.total()
+        extract += time.perf_counter() - start
+
+    return {'build': build, 'solve': solve, 'extract': extract, 'timed_out': timed_out,
+            'total_containers': total}
+
+
+def measure_peak_memory(problem, threads=None, time_limit=None, model="pulp"):
+    """Peak Python heap use of one phased solve, in bytes"""
+    tracemalloc.start()
+    try:
+        run_phases(problem, threads, time_limit, model)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def time_end_to_end(problem, backend, workers, time_limit=None, model="auto"):
+    """Time ContainerSolver.solve_problem with a fresh, uncached solver"""
+    solver = ContainerSolver(workers=workers, backend=backend, incremental=False,
+                             time_limit=time_limit, model=model)
+    try:
+        start = time.perf_counter()
+        result = solver.solve_problem(problem)
+        elapsed = time.perf_counter() - start
+    finally:
+        solver.close()
+    return elapsed, result.get('total_containers'), result.get('presolve')
+
+
+def benchmark_instance(name, problem, args):
+    """Run all measurements for one instance and return its result record"""
+    runs = [run_phases(problem, args.threads, args.time_limit, args.model)
+            for _ in range(args.repeat)]
+    end_to_end = {}
+    presolve = {}
+    reference = runs[0]['total_containers']
+    # Only comparable when every CBC block finished within the time limit
+    parity = True if reference is not None else None
+    for backend in args.backends:
+        timings = []
+        for _ in range(args.repeat):
+            elapsed, total, presolve[backend] = time_end_to_end(
+                problem, backend, args.workers, args.time_limit, args.model
+            )
+            timings.append(elapsed)
+            if parity is not None:
+                parity = parity and total == reference
+        end_to_end[backend] = statistics.median(timings)
+
+    record = {
+        'instance': name,
+        'shape': list(problem.shape),
+        'variables': problem.shape[0] * problem.shape[1] * problem.shape[2],
+        'build_s': statistics.median(run['build'] for run in runs),
+        'solve_s': statistics.median(run['solve'] for run in runs),
+        'extract_s': statistics.median(run['extract'] for run in runs),
+        'end_to_end_s': end_to_end,
+        'presolve': presolve,
+        'peak_memory_bytes': measure_peak_memory(problem, args.threads, args.time_limit,
+                                                 args.model),
+        'timed_out_blocks': max(run['timed_out'] for run in runs),
+        'total_containers': reference,
+        'parity': parity
+    }
+    if resource is not None:
+        # Largest child process so far, i.e. the biggest CBC run (KiB on Linux)
+        record['cbc_peak_rss'] = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return record
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Benchmark the container solver.")
+    parser.add_argument("--shapes", nargs="+", type=parse_shape,
+                        default=[parse_shape(shape) for shape in DEFAULT_SHAPES],
+                        help="instance shapes as LOCATIONSxMATERIALSxSIZES "
+                             f"(default: {' '.join(DEFAULT_SHAPES)})")
+    parser.add_argument("--config", nargs="*", default=[],
+                        help="also benchmark these saved configuration files")
+    parser.add_argument("--seed", type=int, default=0, help="generator seed (default: 0)")
+    parser.add_argument("--scale", type=int, default=10,
+                        help="max containers of one size per cell (default: 10)")
+    parser.add_argument("--slack", type=float, default=1.25,
+                        help="stock as a multiple of the containers needed (default: 1.25)")
+    parser.add_argument("--repeat", type=int, default=1,
+                        help="runs per instance; medians are reported (default: 1)")
+    parser.add_argument("--backends", nargs="+", choices=available_backends(), default=["dp"],
+                        help="backends timed end to end (default: dp)")
+    parser.add_argument("-w", "--workers", type=int, default=1,
+                        help="worker processes for the end-to-end solves (default: 1)")
+    parser.add_argument("--model", choices=sorted(MODEL_BUILDERS), default="pulp",
+                        help="how CBC models are built: PuLP objects or a direct MPS writer "
+                             "(default: pulp)")
+    parser.add_argument("--threads", type=int, help="CBC threads per block")
+    parser.add_argument("--time-limit", type=float, default=10,
+                        help="CBC time limit per block in seconds, 0 for none (default: 10)")
+    parser.add_argument("-o", "--output",
+                        help="results file (default: benchmarks/results/bench-<timestamp>.json)")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.repeat = max(1, args.repeat)
+
+    instances = [(path, load_config_file(path)) for path in args.config]
+    instances += [
+        ("x".join(map(str, shape)),
+         generate_instance(*shape, seed=args.seed, scale=args.scale, slack=args.slack))
+        for shape in args.shapes
+    ]
+
+    records = []
+    for name, problem in instances:
+        print(f"Benchmarking {name}...", file=sys.stderr, flush=True)
+        records.append(benchmark_instance(name, problem, args))
+
+    report = {
+        'created': datetime.datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'pulp': pulp.__version__,
+        'parameters': {
+            'seed': args.seed, 'scale': args.scale, 'slack': args.slack,
+            'repeat': args.repeat, 'workers': args.workers, 'threads': args.threads,
+            'model': args.model,
+            'time_limit': args.time_limit
+        },
+        'results': records
+    }
+
+    if args.output:
+        output = Path(args.output)
+    else:
+        RESULTS_FOLDER.mkdir(exist_ok=True)
+        output = RESULTS_FOLDER / f"bench-{datetime.datetime.now():%Y%m%d-%H%M%S}.json"
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+    rows = [
+        [record['instance'], f"{record['build_s'] * 1000:.1f}", f"{record['solve_s'] * 1000:.1f}",
+         f"{record['extract_s'] * 1000:.1f}",
+         " / ".join(f"{backend} {seconds * 1000:.1f}"
+                    for backend, seconds in record['end_to_end_s'].items()),
+         f"{record['peak_memory_bytes'] / 1024:.0f}", record['timed_out_blocks'],
+         {True: "yes", False: "NO", None: "-"}[record['parity']]]
+        for record in records
+    ]
+    print(tabulate(rows, headers=["Instance", "Build ms", "CBC ms", "Extract ms",
+                                  "End to end ms", "Peak KiB", "Timed out", "Parity"]))
+    print(f"\nResults written to {output}")
+    return 0 if all(record['parity'] is not False for record in records) else 1
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
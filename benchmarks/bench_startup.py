@@ -0,0 +1,142 @@
+"""
+Startup Benchmark
+Times desktop app startup up to the first drawn frame in fresh processes
+
+Usage:
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --repeat 10 --budget 400
+    python benchmarks/bench_startup.py --import-only
+"""
+
+import argparse
+import datetime
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+
+SRC_FOLDER = Path(__file__).resolve().parent.parent / "src"
+
+RESULTS_FOLDER = Path(__file__).resolve().parent / "results"
+
+# Modules that must not be imported before the first frame
+HEAVY_MODULES = ["pulp", "tabulate", "scipy", "solver", "diagnosis"]
+
+# Runs in a fresh interpreter and prints one JSON line. The window is built
+# without the background prewarm, and root.update() draws the first frame.
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+sys.path.insert(0, {src!r})
+import tkinter as tk
+from container_app import ContainerAllocatorApp
+imported = time.perf_counter()
+record = {{'import_s': imported - start, 'first_frame_s': None}}
+if not {import_only!r}:
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        record['no_display'] = str(e)
+    else:
+        app = ContainerAllocatorApp(root, prewarm=False)
+        root.update()
+        record['first_frame_s'] = time.perf_counter() - start
+        root.destroy()
+record['heavy_modules'] = [name for name in {heavy!r} if name in sys.modules]
+print(json.dumps(record))
+"""
+
+
+def run_probe(import_only):
+    """
+    Start the app in a new Python process
+
+    Returns:
+        Probe record with 'import_s', 'first_frame_s' (None without a
+        display or with import_only), 'heavy_modules' loaded by then, and
+        'process_s', the wall time including interpreter startup
+    """
+    code = PROBE.format(src=str(SRC_FOLDER), import_only=import_only, heavy=HEAVY_MODULES)
+    start = time.perf_counter()
+    completed = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                               check=True)
+    record = json.loads(completed.stdout.strip().splitlines()[-1])
+    record['process_s'] = time.perf_counter() - start
+    return record
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Benchmark desktop app startup")
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="fresh processes to start (default: 5)")
+    parser.add_argument("--budget", type=float,
+                        help="fail if the median time to first frame (or to import, without "
+                             "a display) is above this many milliseconds")
+    parser.add_argument("--import-only", action="store_true",
+                        help="only time the imports, e.g. on a machine without a display")
+    parser.add_argument("--output", help="write the JSON report here instead of benchmarks/results/")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.repeat = max(1, args.repeat)
+
+    records = []
+    for run in range(args.repeat):
+        print(f"Starting run {run + 1}/{args.repeat}...", file=sys.stderr, flush=True)
+        records.append(run_probe(args.import_only))
+
+    if records[0].get('no_display'):
+        print(f"No display ({records[0]['no_display']}), timing imports only", file=sys.stderr)
+
+    def median_ms(key):
+        values = [record[key] for record in records if record[key] is not None]
+        return statistics.median(values) * 1000 if values else None
+
+    summary = {
+        'import_ms': median_ms('import_s'),
+        'first_frame_ms': median_ms('first_frame_s'),
+        'process_ms': median_ms('process_s'),
+        'heavy_modules': sorted({name for record in records for name in record['heavy_modules']})
+    }
+    report = {
+        'created': datetime.datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'parameters': {'repeat': args.repeat, 'import_only': args.import_only,
+                       'budget_ms': args.budget},
+        'summary': summary,
+        'runs': records
+    }
+
+    if args.output:
+        output = Path(args.output)
+    else:
+        RESULTS_FOLDER.mkdir(exist_ok=True)
+        output = RESULTS_FOLDER / f"startup-{datetime.datetime.now():%Y%m%d-%H%M%S}.json"
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+    for label, key in (("Imports", 'import_ms'), ("First frame", 'first_frame_ms'),
+                       ("Process", 'process_ms')):
+        value = summary[key]
+        print(f"{label + ':':<13}{'-' if value is None else f'{value:.1f} ms'}")
+    print(f"Heavy modules before first frame: {', '.join(summary['heavy_modules']) or 'none'}")
+    print(f"\nResults written to {output}")
+
+    failed = bool(summary['heavy_modules'])
+    measured = summary['first_frame_ms'] or summary['import_ms']
+    if args.budget is not None and measured > args.budget:
+        print(f"Startup took {measured:.1f} ms, over the {args.budget:.0f} ms budget",
+              file=sys.stderr)
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
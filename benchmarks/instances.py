@@ -0,0 +1,68 @@
+"""
+Synthetic Instance Generator
+Seeded random allocation instances that are feasible by construction
+"""
+
+import math
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from problem import AllocationProblem
+
+
+# Container sizes in the order they are added to an instance
+SIZE_LADDER = [1, 2, 4, 8, 16, 24, 32, 48]
+
+
+def generate_instance(n_locations, n_materials, n_sizes, seed=0, scale=10, slack=1.25,
+                      density=0.7):
+    """
+    Generate a random instance with a known feasible allocation
+
+    Every (location, material) cell that is used gets a random mix of
+    containers and its requirement is the SCU of that mix. The stock of a
+    material is the total of its mixes scaled by slack, so the mixes
+    themselves are always a feasible allocation.
+
+    Args:
+        n_locations: Number of locations
+        n_materials: Number of materials
+        n_sizes: Number of container sizes, taken from SIZE_LADDER
+        seed: Random seed; the same arguments always give the same instance
+        scale: Maximum containers of one size in a cell's mix (SCU magnitude)
+        slack: Stock as a multiple of the containers the mixes use
+        density: Fraction of (location, material) cells with a requirement
+
+    Returns:
+        AllocationProblem
+    """
+    if not 1 <= n_sizes <= len(SIZE_LADDER):
+        raise ValueError(f"n_sizes must be between 1 and {len(SIZE_LADDER)}")
+
+    rnd = random.Random(seed)
+    sizes = SIZE_LADDER[:n_sizes]
+    problem = AllocationProblem(
+        [f"Location {i}" for i in range(n_locations)],
+        [f"Material {j}" for j in range(n_materials)],
+        sizes
+    )
+
+    used = [0] * (n_materials * n_sizes)
+    for i in range(n_locations):
+        for j in range(n_materials):
+            if rnd.random() >= density:
+                continue
+            amount = 0
+            for k, size in enumerate(sizes):
+                count = rnd.randint(0, scale)
+                used[j * n_sizes + k] += count
+                amount += count * size
+            problem.requirements[i * n_materials + j] = amount
+
+    for index, count in enumerate(used):
+        problem.available[index] = math.ceil(count * slack)
+
+    return problem
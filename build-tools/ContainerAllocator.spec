@@ -24,7 +24,9 @@ a = Analysis(
         'tkinter', 'tkinter.ttk', 'tkinter.messagebox', 
         'tkinter.simpledialog', 'tkinter.filedialog',
         'pulp', 'pulp.apis', 'pulp.apis.coin_api', 
-        'tabulate', 'json', 'os', 'pathlib'
+        'tabulate', 'json', 'os', 'pathlib',
+        # Imported lazily after the first frame (container_app.PREWARM_MODULES)
+        'solver_worker', 'sensitivity_dialog', 'diagnosis'
     ],
     hookspath=[],
     hooksconfig={},
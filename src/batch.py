@@ -0,0 +1,161 @@
+"""
+Batch Solver
+Solves every configuration in a folder across a process pool, streaming
+one JSON line per configuration as soon as it is solved
+
+Usage:
+    python src/batch.py                      # the configured config folder
+    python src/batch.py missions/ --workers 8 --output results.jsonl
+"""
+
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import sys
+from array import array
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from cli import solve_config
+from settings import SettingsManager
+from solver import ContainerSolver, available_backends
+
+
+# Solver owned by each worker process, created by _init_worker
+_worker_solver = None
+
+
+def _init_worker(backend):
+    global _worker_solver
+    # Configs in a batch are unrelated, so keeping the previous solve is no use
+    _worker_solver = ContainerSolver(backend=backend, incremental=False)
+
+
+def _solve_path(path):
+    return solve_config(path, _worker_solver)
+
+
+def iter_config_files(folder):
+    """Lazily yield the configuration files in folder"""
+    with os.scandir(folder) as entries:
+        for entry in entries:
+            if entry.is_file() and entry.name.lower().endswith(".json"):
+                yield entry.path
+
+
+def _percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted sequence"""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def run_batch(paths, out, workers=None, backend="auto"):
+    """
+    Solve configuration files in a process pool and stream the results
+
+    Only a bounded number of files is in flight at any time and each result
+    is written and dropped as soon as it arrives, so memory stays flat no
+    matter how many files there are.
+
+    Args:
+        paths: Iterable of configuration file paths
+        out: Text stream that receives one JSON line per configuration
+        workers: Number of worker processes (default: CPU count)
+        backend: Solver backend used by the workers
+
+    Returns:
+        Summary dict with solved/infeasible/errored counts and p50/p95 solve times
+    """
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = workers * 4
+    counts = {'solved': 0, 'infeasible': 0, 'errored': 0}
+    # 8 bytes per file is the only thing that grows with the batch
+    solve_times = array('d')
+
+    paths = iter(paths)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(backend,)) as executor:
+        # Future -> configuration path
+        in_flight = {}
+        exhausted = False
+        while in_flight or not exhausted:
+            while not exhausted and len(in_flight) < max_in_flight:
+                path = next(paths, None)
+                if path is None:
+                    exhausted = True
+                else:
+                    in_flight[executor.submit(_solve_path, path)] = path
+            if not in_flight:
+                break
+
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                path = in_flight.pop(future)
+                try:
+                    entry = future.result()
+                except Exception as e:
+                    # One bad file must not stop the batch
+                    entry = {'config': str(path), 'success': False, 'status': "Error",
+                             'error': f"{type(e).__name__}: {e}"}
+                if entry['success']:
+                    counts['solved'] += 1
+                elif entry['status'] == "Error":
+                    counts['errored'] += 1
+                else:
+                    counts['infeasible'] += 1
+                if 'solve_time' in entry:
+                    solve_times.append(entry['solve_time'])
+
+                out.write(json.dumps(entry, ensure_ascii=False) + "\n")
+                out.flush()
+
+    ordered = sorted(solve_times)
+    return dict(
+        counts,
+        total=sum(counts.values()),
+        p50_solve_time=_percentile(ordered, 0.50),
+        p95_solve_time=_percentile(ordered, 0.95)
+    )
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        description="Solve every configuration in a folder, one JSON line per result."
+    )
+    parser.add_argument("folder", nargs="?",
+                        help="folder of configuration files (default: the configured config folder)")
+    parser.add_argument("-o", "--output", help="write JSON lines to this file instead of stdout")
+    parser.add_argument("-w", "--workers", type=int, default=None,
+                        help="worker processes (default: CPU count)")
+    parser.add_argument("--backend", choices=available_backends(), default="auto",
+                        help="solver backend (default: auto)")
+    return parser
+
+
+def main(argv=None):
+    """Batch entry point; returns the process exit code"""
+    args = build_parser().parse_args(argv)
+
+    folder = args.folder or SettingsManager().get_config_folder()
+    if not folder or not os.path.isdir(folder):
+        print("No configuration folder given or configured.", file=sys.stderr)
+        return 2
+
+    out = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    try:
+        summary = run_batch(iter_config_files(folder), out, args.workers, args.backend)
+    finally:
+        if args.output:
+            out.close()
+
+    # Summary goes to stderr so stdout stays pure JSON lines
+    print(json.dumps({'summary': summary}), file=sys.stderr)
+    return 0 if summary['errored'] == 0 and summary['infeasible'] == 0 else 1
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
@@ -0,0 +1,148 @@
+"""
+CBC Runner
+Runs the bundled CBC binary for a PuLP model in a process that can be killed
+"""
+
+import os
+import subprocess
+import threading
+
+from pulp import PULP_CBC_CMD, LpMaximize
+
+
+class SolveCancelled(Exception):
+    """Raised when a running solve has been cancelled"""
+
+
+class CancelToken:
+    """Cancellation flag shared between the UI thread and a running solve"""
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._process = None
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def cancel(self):
+        """Request cancellation and kill the CBC process that is running, if any"""
+        self._event.set()
+        with self._lock:
+            if self._process is not None and self._process.poll() is None:
+                self._process.kill()
+
+    def check(self):
+        """Raise SolveCancelled if cancellation was requested"""
+        if self._event.is_set():
+            raise SolveCancelled()
+
+    def attach(self, process):
+        """Register the running CBC process; kills it at once if already cancelled"""
+        with self._lock:
+            self._process = process
+            if self._event.is_set():
+                process.kill()
+
+    def detach(self):
+        with self._lock:
+            self._process = None
+
+
+def cbc_path():
+    """Path of the CBC binary bundled with PuLP"""
+    return PULP_CBC_CMD().path
+
+
+def cbc_arguments(mps_path, sol_path, threads=None, mst_path=None, time_limit=None, maximize=False):
+    """Command line for solving an MPS file the way PULP_CBC_CMD does"""
+    args = [cbc_path(), mps_path]
+    if maximize:
+        args.append("-max")
+    if mst_path:
+        args += ["-mips", mst_path]
+    if threads:
+        args += ["-threads", str(threads)]
+    if time_limit:
+        args += ["-sec", str(time_limit)]
+    args += ["-timeMode", "elapsed", "-branch", "-printingOptions", "all",
+             "-solution", sol_path]
+    return args
+
+
+def run_cbc(args, sol_path, cancel=None):
+    """
+    Run CBC with its output discarded, killable through the cancel token
+
+    Raises:
+        SolveCancelled: If the solve was cancelled
+        RuntimeError: If CBC failed or did not write a solution file
+    """
+    popen_kwargs = {}
+    if os.name == "nt":
+        # Prevent a console window flashing up from the GUI build
+        startupinfo = subprocess.STARTUPINFO()
+        startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+        popen_kwargs['startupinfo'] = startupinfo
+
+    if cancel is not None:
+        cancel.check()
+    process = subprocess.Popen(args, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                               stderr=subprocess.DEVNULL, **popen_kwargs)
+    if cancel is not None:
+        cancel.attach(process)
+    try:
+        returncode = process.wait()
+    finally:
+        if cancel is not None:
+            cancel.detach()
+
+    if cancel is not None:
+        cancel.check()
+    if returncode != 0 or not os.path.exists(sol_path):
+        raise RuntimeError(f"CBC exited with code {returncode}")
+
+
+def solve_with_cbc(prob, threads=None, warm_start=False, cancel=None, time_limit=None):
+    """
+    Solve prob with CBC the same way PULP_CBC_CMD does
+
+    Unlike prob.solve(), the CBC process handle is attached to the cancel
+    token so a cancel request terminates the running solve.
+
+    Args:
+        prob: LpProblem to solve; variable values are assigned in place
+        threads: Optional number of CBC threads
+        warm_start: Pass the variables' initial values to CBC as a MIP start
+        cancel: Optional CancelToken
+        time_limit: Optional limit in seconds; a solve stopped on the limit
+            is reported as not solved
+
+    Returns:
+        PuLP status code
+
+    Raises:
+        SolveCancelled: If the solve was cancelled
+    """
+    solver = PULP_CBC_CMD(threads=threads, warmStart=warm_start)
+    tmp_mps, tmp_sol, tmp_mst = solver.create_tmp_files(prob.name, "mps", "sol", "mst")
+
+    try:
+        vs, variable_names, constraint_names, _ = prob.writeMPS(tmp_mps, rename=1)
+
+        if warm_start:
+            solver.writesol(tmp_mst, prob, vs, variable_names, constraint_names)
+        run_cbc(cbc_arguments(tmp_mps, tmp_sol, threads, tmp_mst if warm_start else None,
+                              time_limit, prob.sense == LpMaximize),
+                tmp_sol, cancel)
+
+        status, values, _, _, _, sol_status = solver.readsol_MPS(
+            tmp_sol, prob, vs, variable_names, constraint_names
+        )
+        prob.assignVarsVals(values)
+        prob.assignStatus(status, sol_status)
+        return status
+
+    finally:
+        solver.delete_tmp_files(tmp_mps, tmp_sol, tmp_mst)
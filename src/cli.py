@@ -0,0 +1,204 @@
+"""
+Container Allocator Command Line
+Solves saved configuration files without starting the GUI
+
+Usage:
+    python src/cli.py configs/Microtech_Default.json
+    python src/cli.py --format csv --output results.csv missions/*.json
+"""
+
+import argparse
+import csv
+import io
+import json
+import logging
+import multiprocessing
+import sys
+import time
+
+from config_io import load_config_file
+from diagnosis import describe_diagnosis
+from objectives import DEFAULT_OBJECTIVES, OBJECTIVES, normalize_objectives
+from solver import ContainerSolver, available_backends
+from timing import Trace
+
+
+def solve_config(path, solver, trace=None):
+    """
+    Load and solve one configuration file
+
+    Args:
+        path: Configuration file
+        solver: ContainerSolver used for the solve
+        trace: Optional Trace that receives the load and solver phase timings
+
+    Returns:
+        JSON-serializable dict with the outcome for this file
+    """
+    entry = {'config': str(path)}
+    trace = trace or Trace("solve")
+    try:
+        with trace.span("load"):
+            problem = load_config_file(path)
+    except (OSError, ValueError) as e:
+        entry.update(success=False, status="Error", error=str(e))
+        return entry
+
+    start = time.perf_counter()
+    result = solver.solve_problem(problem)
+    entry['solve_time'] = round(time.perf_counter() - start, 6)
+    trace.add_all(result.get('timings'))
+    if 'presolve' in result:
+        trace.details['presolve'] = result['presolve']
+
+    if result['success']:
+        entry.update(
+            success=True,
+            status="Optimal",
+            total_containers=result['total_containers'],
+            allocation=[
+                {'location': loc, 'material': mat, 'size': size, 'count': count}
+                for loc, mat, size, count in result['allocation'].nonzero()
+            ]
+        )
+    elif 'error' in result:
+        entry.update(success=False, status="Error", error=result['error'])
+    else:
+        entry.update(
+            success=False,
+            status=result.get('status', "Infeasible"),
+            infeasible_materials=result.get('infeasible_materials', []),
+            diagnosis=result.get('diagnosis', [])
+        )
+    return entry
+
+
+def format_json(entries):
+    return json.dumps(entries, indent=2, ensure_ascii=False) + "\n"
+
+
+def format_csv(entries):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(["config", "status", "location", "material", "size", "count"])
+    for entry in entries:
+        if not entry['success']:
+            writer.writerow([entry['config'], entry['status'], "", "", "", ""])
+            continue
+        for row in entry['allocation']:
+            writer.writerow([entry['config'], entry['status'], row['location'],
+                             row['material'], row['size'], row['count']])
+    return buffer.getvalue()
+
+
+def format_table(entries):
+    # tabulate is only needed for this format
+    from tabulate import tabulate
+
+    parts = []
+    for entry in entries:
+        parts.append(f"{entry['config']}: {entry['status']}")
+        if entry['success']:
+            rows = [[row['location'], row['material'], f"{row['size']}×SCU", f"{row['count']}×"]
+                    for row in entry['allocation']]
+            parts.append(tabulate(rows, headers=["Location", "Material", "Size", "Containers"],
+                                  tablefmt="fancy_grid", stralign="center"))
+            parts.append(f"Total containers allocated: {entry['total_containers']}")
+        elif entry.get('infeasible_materials'):
+            parts.append(f"Materials without a feasible allocation: "
+                         f"{', '.join(entry['infeasible_materials'])}")
+            for diagnosis in entry.get('diagnosis', []):
+                parts.extend(f"  {line}" for line in describe_diagnosis(diagnosis))
+        elif entry.get('error'):
+            parts.append(f"Error: {entry['error']}")
+        parts.append("")
+    return "\n".join(parts)
+
+
+FORMATTERS = {
+    'json': format_json,
+    'csv': format_csv,
+    'table': format_table
+}
+
+
+def _objective_list(text):
+    """argparse type for --objectives"""
+    try:
+        return normalize_objectives(name.strip() for name in text.split(",") if name.strip())
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
+def _size_list(text):
+    """argparse type for --reserve"""
+    try:
+        return tuple(int(size) for size in text.split(",") if size.strip())
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid size list: '{text}'")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        description="Solve Container Allocator configuration files without the GUI."
+    )
+    parser.add_argument("configs", nargs="+", help="configuration JSON files to solve")
+    parser.add_argument("-f", "--format", choices=sorted(FORMATTERS), default="json",
+                        help="output format (default: json)")
+    parser.add_argument("-o", "--output", help="write results to this file instead of stdout")
+    parser.add_argument("-w", "--workers", type=int, default=1,
+                        help="worker processes per solve (default: 1)")
+    parser.add_argument("--backend", choices=available_backends(), default="auto",
+                        help="solver backend; auto uses the DP engine for small blocks and an "
+                             "in-process MILP or CBC for the rest (default: auto)")
+    parser.add_argument("--model", choices=["auto", "pulp", "direct"], default="auto",
+                        help="how CBC models are built; auto writes MPS directly for large "
+                             "blocks (default: auto)")
+    parser.add_argument("--objectives", type=_objective_list, default=DEFAULT_OBJECTIVES,
+                        help="comma-separated objective stack solved in order, from "
+                             f"{', '.join(OBJECTIVES)}; containers is added last if missing "
+                             "(default: containers)")
+    parser.add_argument("--reserve", type=_size_list, default=(),
+                        help="comma-separated container sizes the reserve objective keeps in "
+                             "stock, e.g. 24,32")
+    parser.add_argument("--trace", help="append per-file timing spans to this JSON lines file")
+    parser.add_argument("-v", "--verbose", action="store_true",
+                        help="log timing breakdowns to stderr")
+    return parser
+
+
+def main(argv=None):
+    """Command line entry point; returns the process exit code"""
+    args = build_parser().parse_args(argv)
+    if args.verbose:
+        logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    solver = ContainerSolver(workers=args.workers, backend=args.backend, model=args.model,
+                             objectives=args.objectives, reserve_sizes=args.reserve)
+    entries = []
+    try:
+        for path in args.configs:
+            trace = Trace("solve", config=str(path))
+            entry = solve_config(path, solver, trace)
+            trace.details['status'] = entry['status']
+            trace.finish()
+            if args.trace:
+                trace.write(args.trace)
+            entries.append(entry)
+    finally:
+        solver.close()
+
+    text = FORMATTERS[args.format](entries)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8', newline='') as f:
+            f.write(text)
+    else:
+        sys.stdout.write(text)
+
+    # Non-zero exit code if anything could not be solved, for cron jobs
+    return 0 if all(entry['success'] for entry in entries) else 1
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
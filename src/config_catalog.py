@@ -0,0 +1,204 @@
+"""
+Configuration Catalog
+Persistent index of the configuration folder (name, modification time, size,
+material/location counts and content hash) so Load dialogs do not have to
+open every file
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+from config_io import decode_config_bytes, validate_config_structure
+from persistence import atomic_write
+
+
+# Index folder kept in the configuration folder. Writing inside a subfolder
+# leaves the configuration folder's mtime alone, which the scan relies on
+CATALOG_FOLDER = ".catalog"
+CATALOG_FILE = "catalog.json"
+
+CATALOG_VERSION = 1
+
+# A folder modified this recently may still change within the same mtime
+# tick, so its mtime is not trusted to skip the next scan
+MTIME_SLACK = 2.0
+
+
+def read_entry(path, stat=None):
+    """
+    Catalog entry for one configuration file
+
+    Args:
+        path: Configuration file
+        stat: Optional os.stat_result of path, to save a stat call
+
+    Returns:
+        Dict with 'name' (file stem), 'file', 'mtime', 'mtime_ns', 'size',
+        'hash' (SHA-256 of the content), 'materials' and 'locations'
+        (counts) and 'valid'; unreadable files get 'valid': False
+
+    Raises:
+        OSError: If the file cannot be read
+    """
+    path = Path(path)
+    stat = stat or path.stat()
+    content = path.read_bytes()
+    entry = {
+        'name': path.stem,
+        'file': path.name,
+        'mtime': stat.st_mtime,
+        'mtime_ns': stat.st_mtime_ns,
+        'size': stat.st_size,
+        'hash': hashlib.sha256(content).hexdigest(),
+        'materials': 0,
+        'locations': 0,
+        'valid': False
+    }
+    try:
+        config_data = decode_config_bytes(content)
+    except ValueError:
+        return entry
+    if validate_config_structure(config_data):
+        entry['materials'] = len(config_data['configuration']['materials'])
+        entry['locations'] = len(config_data['configuration']['locations'])
+        entry['valid'] = True
+    return entry
+
+
+class ConfigCatalog:
+    """Incrementally updated index of the .json files in a configuration folder"""
+
+    def __init__(self, folder):
+        """
+        Args:
+            folder: Configuration folder; the index is stored in its
+                CATALOG_FOLDER
+        """
+        self.folder = Path(folder)
+        self.path = self.folder / CATALOG_FOLDER / CATALOG_FILE
+        # File name -> entry, see read_entry
+        self.entries = {}
+        self.folder_mtime_ns = None
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        """Read the stored index; a missing or broken index just means a full scan"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == CATALOG_VERSION:
+                self.entries = {entry['file']: entry for entry in data['entries']}
+                self.folder_mtime_ns = data.get('folder_mtime_ns')
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Error reading configuration catalog: {e}")
+
+    def save(self):
+        """Write the index next to the configurations"""
+        data = {
+            'version': CATALOG_VERSION,
+            'folder_mtime_ns': self.folder_mtime_ns,
+            'entries': list(self.entries.values())
+        }
+        try:
+            self.path.parent.mkdir(exist_ok=True)
+            # The index can be rebuilt, so it is not fsynced
+            atomic_write(self.path, json.dumps(data, separators=(',', ':')).encode('utf-8'),
+                         durable=False)
+        except OSError as e:
+            print(f"Error saving configuration catalog: {e}")
+
+    def refresh(self, force=False):
+        """
+        Bring the index up to date with the folder
+
+        When the folder's mtime is unchanged since the last scan, no file
+        was added, removed or renamed and the index is used as it is. Files
+        whose mtime or size changed are read again; the others are not
+        opened. Edits that rewrite a file in place keep the folder mtime,
+        so pass force=True (the dialogs' Refresh) or call update_file after
+        writing one.
+
+        Returns:
+            Dict with the 'added', 'updated' and 'removed' file names
+
+        Raises:
+            OSError: If the folder cannot be read
+        """
+        with self._lock:
+            changes = {'added': [], 'updated': [], 'removed': []}
+            folder_mtime_ns = self.folder.stat().st_mtime_ns
+            if not force and folder_mtime_ns == self.folder_mtime_ns:
+                return changes
+
+            seen = set()
+            with os.scandir(self.folder) as dir_entries:
+                for dir_entry in dir_entries:
+                    if not dir_entry.name.endswith(".json") or not dir_entry.is_file():
+                        continue
+                    seen.add(dir_entry.name)
+                    stat = dir_entry.stat()
+                    known = self.entries.get(dir_entry.name)
+                    if (known is not None and known['mtime_ns'] == stat.st_mtime_ns
+                            and known['size'] == stat.st_size):
+                        continue
+                    try:
+                        self.entries[dir_entry.name] = read_entry(dir_entry.path, stat)
+                    except OSError:
+                        # Deleted or locked while scanning; picked up next time
+                        seen.discard(dir_entry.name)
+                        continue
+                    changes['updated' if known is not None else 'added'].append(dir_entry.name)
+
+            changes['removed'] = [name for name in self.entries if name not in seen]
+            for name in changes['removed']:
+                del self.entries[name]
+
+            # Trust the folder mtime next time only if it had settled
+            if time.time() - folder_mtime_ns / 1e9 < MTIME_SLACK:
+                folder_mtime_ns = None
+            if any(changes.values()) or folder_mtime_ns != self.folder_mtime_ns:
+                self.folder_mtime_ns = folder_mtime_ns
+                self.save()
+            return changes
+
+    def update_file(self, path):
+        """Re-index one file after the app wrote it"""
+        path = Path(path)
+        with self._lock:
+            try:
+                self.entries[path.name] = read_entry(path)
+            except OSError:
+                self.entries.pop(path.name, None)
+            self.save()
+
+    def remove_file(self, path):
+        """Drop one file from the index after it was deleted"""
+        with self._lock:
+            if self.entries.pop(Path(path).name, None) is not None:
+                self.save()
+
+    def sorted_entries(self):
+        """Entries newest first"""
+        with self._lock:
+            return sorted(self.entries.values(), key=lambda entry: entry['mtime'], reverse=True)
+
+
+# One catalog per folder for the lifetime of the process
+_catalogs = {}
+_catalogs_lock = threading.Lock()
+
+
+def get_catalog(folder):
+    """Shared ConfigCatalog of a folder; the index file is read only once"""
+    key = os.path.normcase(os.path.abspath(folder))
+    with _catalogs_lock:
+        if key not in _catalogs:
+            _catalogs[key] = ConfigCatalog(folder)
+        return _catalogs[key]
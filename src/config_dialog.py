@@ -1,9 +1,12 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog
+import datetime
 import os
 import json
 from pathlib import Path
 
+from config_catalog import get_catalog
+
 
 class ConfigDialog:
     """Dialog for saving and loading configurations with simplified UI"""
@@ -109,29 +112,24 @@ class ConfigDialog:
             tk.Button(button_frame, text="Delete", command=self.delete_config).pack(side=tk.RIGHT, padx=(10, 0))
         
         tk.Button(button_frame, text="Cancel", command=self.cancel).pack(side=tk.RIGHT)
-        tk.Button(button_frame, text="Refresh", command=self.refresh_config_list).pack(side=tk.LEFT)
+        tk.Button(button_frame, text="Refresh",
+                  command=lambda: self.refresh_config_list(force=True)).pack(side=tk.LEFT)
     
-    def refresh_config_list(self):
+    def refresh_config_list(self, force=False):
         """Refresh the list of available configurations"""
         self.config_listbox.delete(0, tk.END)
         
         try:
-            # Get all .json files in the config folder
-            json_files = list(self.config_folder.glob("*.json"))
-            json_files.sort(key=lambda x: x.stat().st_mtime, reverse=True)  # Sort by modification time
+            # The catalog only re-reads files that changed since the last scan
+            catalog = get_catalog(self.config_folder)
+            catalog.refresh(force)
+            entries = catalog.sorted_entries()
             
-            for json_file in json_files:
-                # Display name without .json extension
-                display_name = json_file.stem
-                
-                # Add modification time
-                mtime = json_file.stat().st_mtime
-                import datetime
-                mod_time = datetime.datetime.fromtimestamp(mtime).strftime("%Y-%m-%d %H:%M")
-                
-                self.config_listbox.insert(tk.END, f"{display_name} ({mod_time})")
+            for entry in entries:
+                mod_time = datetime.datetime.fromtimestamp(entry['mtime']).strftime("%Y-%m-%d %H:%M")
+                self.config_listbox.insert(tk.END, f"{entry['name']} ({mod_time})")
             
-            if not json_files:
+            if not entries:
                 self.config_listbox.insert(tk.END, "No configurations found")
                 
         except Exception as e:
@@ -224,6 +222,7 @@ class ConfigDialog:
         if result:
             try:
                 config_path.unlink()
+                get_catalog(self.config_folder).remove_file(config_path)
                 self.refresh_config_list()
                 messagebox.showinfo("Deleted", f"Configuration '{config_path.stem}' deleted.", parent=self.dialog)
             except Exception as e:
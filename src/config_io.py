@@ -0,0 +1,252 @@
+"""
+Configuration File I/O
+Reading, validating and building configuration files without any Tk dependency
+
+Version 2 files store only the non-zero cells as [row, column, value]
+index triples into the configuration lists and may be gzip-compressed.
+Version 1 files, with every "location|material" and "material|size" cell
+keyed by name, are still read.
+"""
+
+import gzip
+import json
+
+from persistence import atomic_write
+from problem import AllocationProblem
+
+
+CONFIG_VERSION = "2.0"
+
+# First bytes of a gzip stream; compressed files keep the .json extension
+GZIP_MAGIC = b"\x1f\x8b"
+
+
+def build_config_data(problem):
+    """
+    Build the JSON structure written by Save Configuration
+
+    Args:
+        problem: AllocationProblem holding the names and grid values
+
+    Returns:
+        Dict ready to be written with write_config_file
+    """
+    n_mat, n_size = len(problem.materials), len(problem.sizes)
+    return {
+        "metadata": {
+            "version": CONFIG_VERSION,
+            "description": "Container Allocator Configuration"
+        },
+        "configuration": {
+            "materials": list(problem.materials),
+            "sizes": list(problem.sizes),
+            "locations": list(problem.locations)
+        },
+        # [location index, material index, SCU] of each non-zero requirement
+        "requirements": [
+            [index // n_mat, index % n_mat, amount]
+            for index, amount in enumerate(problem.requirements) if amount
+        ],
+        # [material index, size index, count] of each non-zero stock
+        "availability": [
+            [index // n_size, index % n_size, count]
+            for index, count in enumerate(problem.available) if count
+        ]
+    }
+
+
+def config_version(config_data):
+    """Major format version of config data; files without metadata are version 1"""
+    version = str(config_data.get("metadata", {}).get("version", "1.0"))
+    try:
+        return int(version.split(".")[0])
+    except ValueError:
+        return 1
+
+
+def dump_config_text(config_data):
+    """
+    Serialize config data as indented JSON with one sparse cell per line
+
+    json.dump with indent spreads every [row, column, value] triple over
+    five lines, so the cell lists are written by hand.
+    """
+    parts = []
+    for key, value in config_data.items():
+        if key in ("requirements", "availability") and isinstance(value, list):
+            if value:
+                cells = ",\n".join(f"    [{a}, {b}, {c}]" for a, b, c in value)
+                text = "[\n" + cells + "\n  ]"
+            else:
+                text = "[]"
+        else:
+            text = json.dumps(value, indent=2, ensure_ascii=False).replace("\n", "\n  ")
+        parts.append(f"  {json.dumps(key)}: {text}")
+    return "{\n" + ",\n".join(parts) + "\n}\n"
+
+
+def write_config_file(path, config_data, compress=False):
+    """
+    Write config data to a file atomically
+
+    Args:
+        path: Target file
+        config_data: Dict from build_config_data
+        compress: Write the file gzip-compressed
+    """
+    data = dump_config_text(config_data).encode('utf-8')
+    if compress:
+        # mtime=0 keeps identical configurations byte-identical
+        data = gzip.compress(data, mtime=0)
+    atomic_write(path, data)
+
+
+def decode_config_bytes(content):
+    """
+    Parse the content of a configuration file, compressed or not
+
+    Raises:
+        ValueError: If the content is not valid JSON
+    """
+    if content[:2] == GZIP_MAGIC:
+        try:
+            content = gzip.decompress(content)
+        except (OSError, EOFError) as e:
+            raise ValueError(f"Corrupt compressed configuration: {e}")
+    return json.loads(content)
+
+
+def read_config_data(path):
+    """
+    Read the JSON data of a configuration file, compressed or not
+
+    Raises:
+        ValueError: If the file is not valid JSON
+    """
+    with open(path, 'rb') as f:
+        return decode_config_bytes(f.read())
+
+
+def validate_config_structure(config_data):
+    """Validate that the config data has the expected structure"""
+    try:
+        # Check required top-level keys
+        if not isinstance(config_data, dict):
+            return False
+
+        config = config_data.get("configuration", {})
+        if not isinstance(config, dict):
+            return False
+
+        # Check required configuration keys
+        required_keys = ["materials", "sizes", "locations"]
+        for key in required_keys:
+            if key not in config:
+                return False
+            if not isinstance(config[key], list):
+                return False
+            if len(config[key]) == 0:
+                return False
+
+        # Validate sizes are integers
+        for size in config["sizes"]:
+            if not isinstance(size, int) or size <= 0:
+                return False
+
+        return True
+
+    except Exception:
+        return False
+
+
+def parse_config_data(config_data):
+    """
+    Build an AllocationProblem from validated config data
+
+    Cells missing from the file are treated as zero. Version 1 keys that do
+    not match the configured names are ignored, like the GUI loader does.
+
+    Raises:
+        ValueError: If a cell value is not an integer, or a version 2 cell
+            is malformed or out of range
+    """
+    config = config_data["configuration"]
+    problem = AllocationProblem(config["locations"], config["materials"], config["sizes"])
+    if config_version(config_data) >= 2:
+        _fill_sparse(problem.requirements, config_data.get("requirements", []),
+                     len(problem.locations), len(problem.materials), "requirements")
+        _fill_sparse(problem.available, config_data.get("availability", []),
+                     len(problem.materials), len(problem.sizes), "availability")
+        return problem
+
+    n_mat, n_size = len(problem.materials), len(problem.sizes)
+    for section in ("requirements", "availability"):
+        if not isinstance(config_data.get(section, {}), dict):
+            raise ValueError(f"Invalid {section}: expected an object of cells")
+
+    for key, value in config_data.get("requirements", {}).items():
+        if "|" in key:
+            loc, mat = key.split("|", 1)
+            i = problem.location_index.get(loc)
+            j = problem.material_index.get(mat)
+            if i is not None and j is not None:
+                problem.requirements[i * n_mat + j] = _cell_value(value, key, "requirements")
+
+    for key, value in config_data.get("availability", {}).items():
+        if "|" in key:
+            mat, size_str = key.split("|", 1)
+            try:
+                size = int(size_str)
+            except ValueError:
+                continue
+            j = problem.material_index.get(mat)
+            k = problem.size_index.get(size)
+            if j is not None and k is not None:
+                problem.available[j * n_size + k] = _cell_value(value, key, "availability")
+
+    return problem
+
+
+def _cell_value(value, key, section):
+    """Integer value of a version 1 cell; only integers and integer strings are accepted"""
+    # int() would truncate floats and take booleans as 0 and 1
+    if isinstance(value, bool) or not isinstance(value, (int, str)):
+        raise ValueError(f"Invalid {section} cell '{key}': {value!r} is not a whole number")
+    try:
+        number = int(value)
+    except ValueError:
+        raise ValueError(f"Invalid {section} cell '{key}': {value!r} is not a whole number")
+    # The problem arrays hold signed 64-bit values
+    if not -2 ** 63 <= number < 2 ** 63:
+        raise ValueError(f"Invalid {section} cell '{key}': {value!r} is too large")
+    return number
+
+
+def _fill_sparse(values, cells, n_rows, n_columns, section):
+    """Write [row, column, value] cells straight into a flat row-major array"""
+    try:
+        for row, column, value in cells:
+            if not (0 <= row < n_rows and 0 <= column < n_columns):
+                raise ValueError(f"cell [{row}, {column}] is out of range")
+            values[row * n_columns + column] = value
+    except (TypeError, ValueError, OverflowError) as e:
+        raise ValueError(f"Invalid {section} cell: {e}")
+
+
+def load_config_file(path):
+    """
+    Load and validate a configuration file of either version
+
+    Returns:
+        AllocationProblem
+
+    Raises:
+        ValueError: If the file is not a valid configuration
+    """
+    config_data = read_config_data(path)
+
+    if not validate_config_structure(config_data):
+        raise ValueError(f"{path} is not a valid configuration file")
+
+    return parse_config_data(config_data)
+
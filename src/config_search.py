@@ -0,0 +1,322 @@
+"""
+Configuration Search
+Inverted index over the saved configurations of a folder, answering free-text
+and structured queries such as "deliver Titanium to NB Int" or "more than 200
+SCU" without opening the files
+"""
+
+import json
+import re
+import threading
+
+from config_catalog import CATALOG_FOLDER, get_catalog
+from config_io import load_config_file
+from persistence import atomic_write
+
+
+SEARCH_FILE = "search.json"
+
+SEARCH_VERSION = 1
+
+# Query words that only carry the phrasing
+STOPWORDS = {
+    "all", "any", "and", "at", "config", "configs", "configuration", "configurations",
+    "deliver", "delivers", "delivering", "delivery", "for", "from", "in", "need",
+    "needing", "needs", "of", "require", "requires", "requiring", "scu", "that",
+    "the", "to", "which", "with"
+}
+
+# Comparison phrases of numeric conditions and the operator each stands for
+COMPARISONS = {
+    ">": ">", ">=": ">=", "<": "<", "<=": "<=", "=": "=",
+    "more than": ">", "over": ">", "above": ">", "greater than": ">",
+    "at least": ">=", "less than": "<", "under": "<", "below": "<",
+    "at most": "<=", "exactly": "="
+}
+
+_CONDITION = re.compile(
+    r"(?<= )(" + "|".join(sorted((re.escape(phrase) for phrase in COMPARISONS), key=len, reverse=True))
+    + r") (\d+)(?: scu)?(?= )"
+)
+
+_WORD = re.compile(r"[a-z0-9]+")
+_TOKEN = re.compile(r">=|<=|[<>=]|[a-z0-9]+")
+
+
+def _words(text):
+    return _WORD.findall(text.lower())
+
+
+def index_terms(name, problem):
+    """
+    Search terms and totals of one configuration
+
+    Args:
+        name: File stem
+        problem: AllocationProblem of the file
+
+    Returns:
+        (terms, totals) where terms is a set of 'w:' (word of the file or a
+        listed name), 'm:' (material with a requirement), 'l:' (location
+        with a requirement) and 'd:location|material' (delivery) terms,
+        and totals maps each required material, lower case, to its SCU
+    """
+    terms = {"w:" + word for word in _words(name)}
+    for label in problem.materials + problem.locations:
+        terms.update("w:" + word for word in _words(label))
+
+    n_mat = len(problem.materials)
+    totals = {}
+    for i, loc in enumerate(problem.locations):
+        for j, mat in enumerate(problem.materials):
+            amount = problem.requirements[i * n_mat + j]
+            if amount > 0:
+                terms.update(("m:" + mat.lower(), "l:" + loc.lower(),
+                              f"d:{loc.lower()}|{mat.lower()}"))
+                totals[mat.lower()] = totals.get(mat.lower(), 0) + amount
+    return terms, totals
+
+
+def parse_query(text, materials, locations):
+    """
+    Split a query into its structured and free-text parts
+
+    Material and location names are matched as whole phrases, longest
+    first, so "NB Int" is one location and not two words.
+
+    Args:
+        text: Query as typed
+        materials: Known material names, lower case
+        locations: Known location names, lower case
+
+    Returns:
+        Dict with 'materials', 'locations', 'conditions' (list of
+        (operator, amount) pairs) and 'words' (remaining free text)
+    """
+    # Space-separated tokens with the comparison operators kept as tokens
+    query = " " + " ".join(_TOKEN.findall(text.lower())) + " "
+    conditions = []
+
+    def take_condition(match):
+        conditions.append((COMPARISONS[match.group(1)], int(match.group(2))))
+        return " "
+
+    query = _CONDITION.sub(take_condition, query)
+
+    found = {'materials': [], 'locations': []}
+    names = [(name, 'materials') for name in materials] + [(name, 'locations') for name in locations]
+    for name, kind in sorted(names, key=lambda item: len(item[0]), reverse=True):
+        phrase = " " + " ".join(_words(name)) + " "
+        if phrase.strip() and phrase in query:
+            found[kind].append(name)
+            query = query.replace(phrase, " ")
+
+    return {
+        'materials': found['materials'],
+        'locations': found['locations'],
+        'conditions': conditions,
+        'words': [word for word in query.split() if word not in STOPWORDS]
+    }
+
+
+def _compare(value, operator, amount):
+    if operator == ">":
+        return value > amount
+    if operator == ">=":
+        return value >= amount
+    if operator == "<":
+        return value < amount
+    if operator == "<=":
+        return value <= amount
+    return value == amount
+
+
+class ConfigSearchIndex:
+    """Inverted index of a configuration folder, kept in step with its catalog"""
+
+    def __init__(self, catalog):
+        """
+        Args:
+            catalog: ConfigCatalog of the folder; the index is stored next
+                to the catalog file
+        """
+        self.catalog = catalog
+        self.path = catalog.folder / CATALOG_FOLDER / SEARCH_FILE
+        # Term -> set of file names
+        self.postings = {}
+        # File name -> {'hash', 'terms', 'totals'}
+        self.files = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        """Read the stored index; a missing or broken index is rebuilt by update"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == SEARCH_VERSION:
+                for name, record in data['files'].items():
+                    self._add(name, record)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            self.postings, self.files = {}, {}
+            print(f"Error reading configuration search index: {e}")
+
+    def save(self, files=None):
+        """
+        Write the index next to the catalog
+
+        Args:
+            files: Snapshot of self.files to write; defaults to a copy taken
+                under the lock
+        """
+        if files is None:
+            with self._lock:
+                files = dict(self.files)
+        data = {'version': SEARCH_VERSION, 'files': files}
+        try:
+            self.path.parent.mkdir(exist_ok=True)
+            # The index can be rebuilt, so it is not fsynced
+            atomic_write(self.path, json.dumps(data, separators=(',', ':')).encode('utf-8'),
+                         durable=False)
+        except OSError as e:
+            print(f"Error saving configuration search index: {e}")
+
+    def _add(self, name, record):
+        self.files[name] = record
+        for term in record['terms']:
+            self.postings.setdefault(term, set()).add(name)
+
+    def _remove(self, name):
+        record = self.files.pop(name, None)
+        if record is None:
+            return
+        for term in record['terms']:
+            files = self.postings.get(term)
+            if files is not None:
+                files.discard(name)
+                if not files:
+                    del self.postings[term]
+
+    def update(self):
+        """
+        Re-index the files whose content hash changed in the catalog
+
+        Call after catalog.refresh(); files whose hash is unchanged are not
+        opened. Files are read and indexed without holding the lock, so
+        searches keep running meanwhile; the new records are swapped in at
+        the end. A file that cannot be indexed gets no terms.
+
+        Returns:
+            Number of files indexed again or dropped
+        """
+        entries = {entry['file']: entry for entry in self.catalog.sorted_entries()}
+        with self._lock:
+            indexed = {name: record['hash'] for name, record in self.files.items()}
+
+        stale = [name for name in indexed if name not in entries]
+        fresh = {}
+        for name, entry in entries.items():
+            if indexed.get(name) == entry['hash']:
+                continue
+            terms, totals = set(), {}
+            if entry['valid']:
+                try:
+                    problem = load_config_file(self.catalog.folder / name)
+                    terms, totals = index_terms(entry['name'], problem)
+                except Exception as e:
+                    # One bad file must not break every search
+                    print(f"Error indexing configuration {name}: {e}")
+            fresh[name] = {'hash': entry['hash'], 'terms': sorted(terms), 'totals': totals}
+
+        if not stale and not fresh:
+            return 0
+        with self._lock:
+            for name in stale:
+                self._remove(name)
+            for name, record in fresh.items():
+                self._remove(name)
+                self._add(name, record)
+            files = dict(self.files)
+        self.save(files)
+        return len(fresh) + len(stale)
+
+    def search(self, text):
+        """
+        Files matching a query
+
+        Named materials and locations must have a requirement; when both
+        are named, every material must be delivered to every location.
+        Comparisons ("> 200", "more than 200 SCU", "at most 50") apply to
+        the total requirement of the named materials, or of the whole
+        configuration when none is named. Other words must each be part
+        of the file name or start a word of the file name or of a listed
+        material or location.
+
+        Args:
+            text: Query as typed
+
+        Returns:
+            Set of matching file names; every file for an empty query
+        """
+        with self._lock:
+            materials = [term[2:] for term in self.postings if term.startswith("m:")]
+            locations = [term[2:] for term in self.postings if term.startswith("l:")]
+            query = parse_query(text, materials, locations)
+
+            matches = set(self.files)
+            terms = ["m:" + mat for mat in query['materials']] + ["l:" + loc for loc in query['locations']]
+            terms += [f"d:{loc}|{mat}" for loc in query['locations'] for mat in query['materials']]
+            for term in terms:
+                matches &= self.postings.get(term, set())
+
+            for operator, amount in query['conditions']:
+                matches = {
+                    name for name in matches
+                    if _compare(sum(self.files[name]['totals'].get(mat, 0) for mat in query['materials'])
+                                if query['materials'] else sum(self.files[name]['totals'].values()),
+                                operator, amount)
+                }
+
+            for word in query['words']:
+                found = {name for name in matches if word in name.lower()}
+                for term, files in self.postings.items():
+                    if term.startswith("w:" + word):
+                        found |= files & matches
+                matches = found
+            return matches
+
+
+# One index per folder for the lifetime of the process
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_search_index(folder):
+    """Shared ConfigSearchIndex of a folder"""
+    catalog = get_catalog(folder)
+    with _indexes_lock:
+        if catalog not in _indexes:
+            _indexes[catalog] = ConfigSearchIndex(catalog)
+        return _indexes[catalog]
+
+
+def search_configs(folder, text, refresh=True):
+    """
+    Search the configurations of a folder
+
+    Args:
+        folder: Configuration folder
+        text: Query, e.g. "deliver Titanium to NB Int" or "> 200 SCU"
+        refresh: Bring the catalog and index up to date first
+
+    Returns:
+        Matching catalog entries, newest first
+    """
+    index = get_search_index(folder)
+    if refresh:
+        index.catalog.refresh()
+        index.update()
+    matches = index.search(text)
+    return [entry for entry in index.catalog.sorted_entries() if entry['file'] in matches]
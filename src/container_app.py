@@ -5,21 +5,51 @@ Main application window and coordination logic
 
 import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog, filedialog
-import json
+import importlib
 import os
+import queue
+import threading
 
-from solver import ContainerSolver
+from solve_cache import SolveCache
 from ui_components import InputGrids, OutputDisplay, ManagementButtons
 from dialogs import ItemSelectionDialog
 from settings import SettingsManager
 from simple_config_dialogs import SimpleConfigDialogs
+from config_catalog import get_catalog
+from config_io import (build_config_data, parse_config_data, read_config_data,
+                       validate_config_structure, write_config_file)
+from timing import Trace, format_duration
+
+
+# Modules only needed by Calculate, the result views and the what-if window.
+# They pull in PuLP and tabulate, so they are imported after the first frame
+PREWARM_MODULES = ("solver_worker", "tabulate", "diagnosis", "sensitivity_dialog")
+
+# Delay before prewarming, so Tk draws the window first
+PREWARM_DELAY_MS = 100
+
+
+def prewarm_imports(modules=PREWARM_MODULES):
+    """Import modules ahead of their first use; runs on a background thread"""
+    for name in modules:
+        importlib.import_module(name)
 
 
 class ContainerAllocatorApp:
     """Main application class that coordinates all components"""
     
-    def __init__(self, root):
+    def __init__(self, root, trace_file=None, prewarm=True):
+        """
+        Args:
+            root: Tk root window
+            trace_file: Optional JSON lines file for calculate timings; overrides
+                the timing trace setting
+            prewarm: Import the solver and start its worker process in the
+                background once the window is shown, instead of on the first
+                Calculate
+        """
         self.root = root
+        self.trace_file = trace_file
         self.root.title("Container Allocator")
         self.root.geometry("1400x900")
         # Initialize settings manager
@@ -30,12 +60,47 @@ class ContainerAllocatorApp:
         self.locations = []
 
         # Initialize components
-        self.solver = ContainerSolver()
+        self.solve_cache = SolveCache(self.settings_manager.get_solve_cache_size(),
+                                      self.settings_manager.get_solve_cache_folder())
+        # Started on the first Calculate, or earlier by the prewarm
+        self.solver = None
         self.input_grids = None
         self.output_display = None
         self.mgmt_buttons = None
+        # Background solve state
+        self._solve_thread = None
+        self._solve_queue = queue.Queue()
+        self._prewarm_thread = None
         
         self.build_ui()
+        # Another running instance may have saved settings meanwhile
+        self.root.bind("<FocusIn>", self._on_focus_in, add="+")
+        if prewarm:
+            self.root.after(PREWARM_DELAY_MS, self._start_prewarm)
+
+    def _start_prewarm(self):
+        """Import the solver modules on a background thread"""
+        self._prewarm_thread = threading.Thread(target=prewarm_imports, name="prewarm",
+                                                daemon=True)
+        self._prewarm_thread.start()
+        self.root.after(50, self._poll_prewarm)
+
+    def _poll_prewarm(self):
+        """Start the solver worker once the prewarm imports are done"""
+        if self._prewarm_thread.is_alive():
+            self.root.after(50, self._poll_prewarm)
+            return
+        self._prewarm_thread = None
+        # Calculate may have started it already
+        if self.solver is None:
+            self._sync_solver()
+
+    def _on_focus_in(self, event):
+        """Pick up settings saved by another instance while this window was in the background"""
+        # One stat of the settings file unless it changed
+        if self.settings_manager.reload_if_changed():
+            self.solve_cache.cache_dir = self.settings_manager.get_solve_cache_folder()
+            self.set_status("Settings changed in another window were loaded")
 
     def build_ui(self):
         """Build the main UI structure"""
@@ -63,12 +128,18 @@ class ContainerAllocatorApp:
         left_buttons = ttk.Frame(button_frame)
         left_buttons.pack(side=tk.LEFT)
         
-        ttk.Button(left_buttons, text="Calculate Allocation", 
-                  command=self.calculate, style='Accent.TButton').pack(side=tk.LEFT, padx=(0, 10))
+        self.calculate_button = ttk.Button(left_buttons, text="Calculate Allocation", 
+                                           command=self.calculate, style='Accent.TButton')
+        self.calculate_button.pack(side=tk.LEFT, padx=(0, 10))
+        # Only shown while a calculation is running
+        self.cancel_button = ttk.Button(left_buttons, text="Cancel", 
+                                        command=self.cancel_calculation)
         ttk.Button(left_buttons, text="Clear All", 
                   command=self.clear_inputs).pack(side=tk.LEFT, padx=(0, 10))
         ttk.Button(left_buttons, text="Load Example", 
-                  command=self.load_example).pack(side=tk.LEFT)
+                  command=self.load_example).pack(side=tk.LEFT, padx=(0, 10))
+        ttk.Button(left_buttons, text="What-if...",
+                   command=self.show_sensitivity).pack(side=tk.LEFT)
 
         # Right side buttons (Configuration management)
         right_buttons = ttk.Frame(button_frame)
@@ -84,10 +155,16 @@ class ContainerAllocatorApp:
         self.output_display.pack(fill=tk.BOTH, expand=True, pady=(10, 0))
 
         # Status bar
+        status_frame = ttk.Frame(main_frame)
+        status_frame.pack(fill=tk.X, pady=(5, 0))
+        
         self.status_var = tk.StringVar(value="Ready")
-        status_bar = ttk.Label(main_frame, textvariable=self.status_var, 
+        status_bar = ttk.Label(status_frame, textvariable=self.status_var, 
                               relief=tk.SUNKEN, anchor=tk.W)
-        status_bar.pack(fill=tk.X, pady=(5, 0))
+        status_bar.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        
+        # Solve progress, only shown while a calculation is running
+        self.progress_bar = ttk.Progressbar(status_frame, length=200, mode='determinate')
 
     def rebuild_grids(self):
         """Rebuild input grids after configuration changes"""
@@ -185,10 +262,8 @@ class ContainerAllocatorApp:
             self.set_status(f"Removed container size: {size_to_remove}-SCU")
 
     # Core functionality methods
-    def validate_inputs(self):
+    def validate_inputs(self, problem):
         """Validate that inputs are reasonable"""
-        req_vars, cont_vars = self.input_grids.get_variables()
-        
         # Check if configuration is complete
         if not self.materials:
             messagebox.showwarning("Configuration Error", "Please add at least one material before calculating.")
@@ -198,57 +273,163 @@ class ContainerAllocatorApp:
             messagebox.showwarning("Configuration Error", "Please add at least one location before calculating.")
             return False
         
+        # Negative amounts have no meaning and no allocation can satisfy them
+        if any(amount < 0 for amount in problem.requirements):
+            messagebox.showwarning("Input Error", "Location requirements cannot be negative.")
+            return False
+        if any(count < 0 for count in problem.available):
+            messagebox.showwarning("Input Error", "Available containers cannot be negative.")
+            return False
+
         # Check if any requirements are set
-        total_requirements = sum(var.get() for var in req_vars.values())
-        if total_requirements == 0:
+        if not any(problem.requirements):
             messagebox.showwarning("Input Error", "Please enter at least one location requirement.")
             return False
 
         # Check if any containers are available
-        total_containers = sum(var.get() for var in cont_vars.values())
-        if total_containers == 0:
+        if not any(problem.available):
             messagebox.showwarning("Input Error", "Please enter at least one available container.")
             return False
 
         return True
 
     def calculate(self):
-        """Perform the optimization calculation"""
-        if not self.validate_inputs():
+        """Start the optimization calculation on a background thread"""
+        if self._solve_thread is not None:
             return
 
+        trace = Trace("calculate")
+        try:
+            # Get input data (Tk variables may only be read on this thread)
+            with trace.span("read inputs"):
+                problem = self.input_grids.get_problem()
+        except Exception as e:
+            messagebox.showerror("Calculation Error", f"An error occurred during calculation:\n{str(e)}")
+            self.set_status("Error occurred")
+            return
+
+        with trace.span("validate"):
+            valid = self.validate_inputs(problem)
+        if not valid:
+            return
+        trace.details['shape'] = list(problem.shape)
+
+        with trace.span("start solver"):
+            self._sync_solver()
+
+        # Cancel may be pressed before the thread starts solving
+        self.solver.prepare_solve()
         self.set_status("Calculating...")
-        self.root.update()
+        self._set_calculating(True)
+        self._solve_thread = threading.Thread(target=self._solve_worker, args=(problem, trace),
+                                              daemon=True)
+        self._solve_thread.start()
+        self.root.after(50, self._poll_solve)
+
+    def cancel_calculation(self):
+        """Cancel the running calculation"""
+        if self._solve_thread is not None:
+            self.solver.cancel()
+            self.set_status("Cancelling...")
+
+    def _solve_worker(self, problem, trace):
+        """Run the solver off the Tk thread and queue the outcome"""
+        def report_progress(done, total):
+            self._solve_queue.put(('progress', (done, total)))
 
         try:
-            # Get input data
-            req_vars, cont_vars = self.input_grids.get_variables()
-            requirements = {
-                loc: {mat: req_vars[(loc, mat)].get() for mat in self.materials} 
-                for loc in self.locations
-            }
-            available = {
-                mat: {size: cont_vars[(mat, size)].get() for size in self.sizes} 
-                for mat in self.materials
-            }
+            result = self.solver.solve_problem(problem, progress=report_progress)
+            # Solver phases are summed over material blocks, so with worker
+            # processes they can add up to more than the elapsed time
+            trace.add_all(result.get('timings'))
+            if 'presolve' in result:
+                trace.details['presolve'] = result['presolve']
+            self._solve_queue.put(('result', (problem, result, trace)))
+        except Exception as e:
+            self._solve_queue.put(('error', e))
 
-            # Solve the problem
-            result = self.solver.solve(requirements, available, self.locations, self.materials, self.sizes)
+    def _poll_solve(self):
+        """Handle messages from the solve thread; reschedules itself until done"""
+        try:
+            while True:
+                kind, payload = self._solve_queue.get_nowait()
+                if kind == 'progress':
+                    done, total = payload
+                    self.progress_bar.configure(maximum=total, value=done)
+                    self.set_status(f"Calculating... {done}/{total} materials")
+                    continue
 
-            # Display results
+                self._solve_thread = None
+                self._set_calculating(False)
+                if kind == 'result':
+                    self._show_result(*payload)
+                else:
+                    messagebox.showerror("Calculation Error", 
+                                       f"An error occurred during calculation:\n{str(payload)}")
+                    self.set_status("Error occurred")
+                return
+        except queue.Empty:
+            self.root.after(50, self._poll_solve)
+
+    def _set_calculating(self, running):
+        """Toggle the Calculate/Cancel buttons and the progress bar"""
+        if running:
+            self.calculate_button.state(['disabled'])
+            self.cancel_button.pack(side=tk.LEFT, padx=(0, 10), after=self.calculate_button)
+            self.progress_bar.configure(value=0, maximum=1)
+            self.progress_bar.pack(side=tk.RIGHT, padx=(5, 0))
+        else:
+            self.calculate_button.state(['!disabled'])
+            self.cancel_button.pack_forget()
+            self.progress_bar.pack_forget()
+
+    def _show_result(self, problem, result, trace):
+        """Display a finished solve"""
+        materials = problem.materials
+        try:
             if result['success']:
-                self.output_display.show_solution(result, requirements, available, 
-                                                self.locations, self.materials, self.sizes)
-                self.set_status("Solution found successfully")
+                with trace.span("render"):
+                    self.output_display.show_solution(result, problem)
+                if result.get('cached'):
+                    stats = self.solve_cache.stats()
+                    message = (f"Solution found (cached, {stats['hits']} hits / "
+                               f"{stats['misses']} misses)")
+                else:
+                    resolved = len(result.get('resolved_materials', materials))
+                    message = (f"Solution found successfully "
+                               f"(re-solved {resolved} of {len(materials)} materials)")
+            elif result.get('cancelled'):
+                message = "Calculation cancelled"
             else:
-                self.output_display.show_no_solution(requirements, available, 
-                                                   self.materials, self.locations, self.sizes)
-                self.set_status("No solution found")
+                with trace.span("render"):
+                    self.output_display.show_no_solution(problem, result.get('infeasible_materials'),
+                                                         result.get('diagnosis'))
+                message = "No solution found"
+
+            trace.details['outcome'] = message
+            total = trace.finish()
+            trace_file = self.trace_file or self.settings_manager.get_timing_trace_file()
+            if trace_file:
+                trace.write(trace_file)
+            self.set_status(f"{message} in {format_duration(total)} — {trace.summary()}")
 
         except Exception as e:
             messagebox.showerror("Calculation Error", f"An error occurred during calculation:\n{str(e)}")
             self.set_status("Error occurred")
 
+    def show_sensitivity(self):
+        """Open the what-if analysis window on the current inputs"""
+        try:
+            problem = self.input_grids.get_problem()
+        except ValueError as e:
+            messagebox.showerror("What-if Analysis", str(e))
+            return
+        if not problem.materials or not problem.locations:
+            messagebox.showwarning("What-if Analysis", "Add locations and materials first.")
+            return
+        from sensitivity_dialog import SensitivityDialog
+        SensitivityDialog(self.root, problem, self.settings_manager.get_solver_workers())
+
     def clear_inputs(self):
         """Clear all input fields"""
         self.input_grids.clear_all()
@@ -317,40 +498,43 @@ class ContainerAllocatorApp:
     def show_settings(self):
         """Show the settings dialog"""
         self.settings_manager.show_settings_dialog(self.root)
+        self.solve_cache.cache_dir = self.settings_manager.get_solve_cache_folder()
+        if self._solve_thread is None and self.solver is not None:
+            self._sync_solver()
+    
+    def _create_solver(self):
+        """Start a solver worker with the current solver settings"""
+        # Imports PuLP unless the prewarm already did
+        from solver_worker import SolverWorker
+        solver = SolverWorker(backend="auto",
+                              workers=self.settings_manager.get_solver_workers(),
+                              cache=self.solve_cache,
+                              objectives=self.settings_manager.get_objectives(),
+                              reserve_sizes=self.settings_manager.get_reserve_sizes())
+        solver.start()
+        return solver
+    
+    def _sync_solver(self):
+        """Start the solver, or restart it if the worker count or objective settings changed"""
+        if self.solver is None:
+            self.solver = self._create_solver()
+        elif (self.settings_manager.get_solver_workers() != self.solver.workers
+                or self.settings_manager.get_objectives() != self.solver.objectives
+                or self.settings_manager.get_reserve_sizes() != self.solver.reserve_sizes):
+            self.solver.close()
+            self.solver = self._create_solver()
     
     def setup_config_folder(self):
         """Setup configuration folder"""
         self.settings_manager.setup_config_folder(self.root)
+        self.solve_cache.cache_dir = self.settings_manager.get_solve_cache_folder()
 
     # Configuration management methods
     def save_configuration(self):
         """Save current configuration to JSON file"""
         try:
-            # Get current input values
-            req_vars, cont_vars = self.input_grids.get_variables()
-            
-            # Build configuration data
-            config_data = {
-                "metadata": {
-                    "version": "1.0",
-                    "description": "Container Allocator Configuration"
-                },
-                "configuration": {
-                    "materials": self.materials.copy(),
-                    "sizes": self.sizes.copy(),
-                    "locations": self.locations.copy()
-                },
-                "requirements": {
-                    f"{loc}|{mat}": req_vars[(loc, mat)].get()
-                    for loc in self.locations
-                    for mat in self.materials
-                },
-                "availability": {
-                    f"{mat}|{size}": cont_vars[(mat, size)].get()
-                    for mat in self.materials
-                    for size in self.sizes
-                }
-            }
+            # Build configuration data from the current input values
+            config_data = build_config_data(self.input_grids.get_problem())
             
             # Check if config folder is set up
             config_folder = self.settings_manager.get_config_folder()
@@ -363,8 +547,9 @@ class ContainerAllocatorApp:
             if not filename:
                 return
             if filename:
-                with open(filename, 'w', encoding='utf-8') as f:
-                    json.dump(config_data, f, indent=2, ensure_ascii=False)
+                write_config_file(filename, config_data, self.settings_manager.get_compress_configs())
+                # Keep the Load dialog's index current without a rescan
+                get_catalog(config_folder).update_file(filename)
                 
                 self.set_status(f"Configuration saved: {os.path.basename(filename)}")
                 messagebox.showinfo("Success", f"Configuration saved successfully!\n\nFile: {os.path.basename(filename)}")
@@ -387,8 +572,7 @@ class ContainerAllocatorApp:
             if not filename:
                 return
                 
-            with open(filename, 'r', encoding='utf-8') as f:
-                config_data = json.load(f)
+            config_data = read_config_data(filename)
             
             # Validate configuration structure
             if not self._validate_config_structure(config_data):
@@ -403,34 +587,16 @@ class ContainerAllocatorApp:
                 return
             
             # Load configuration
-            config = config_data["configuration"]
-            self.materials = config["materials"]
-            self.sizes = config["sizes"]  
-            self.locations = config["locations"]
+            problem = parse_config_data(config_data)
+            self.materials = list(problem.materials)
+            self.sizes = list(problem.sizes)
+            self.locations = list(problem.locations)
             
             # Rebuild grids with new configuration
             self.rebuild_grids()
             
             # Load saved data
-            req_vars, cont_vars = self.input_grids.get_variables()
-            
-            # Load requirements
-            for key, value in config_data.get("requirements", {}).items():
-                if "|" in key:
-                    loc, mat = key.split("|", 1)
-                    if (loc, mat) in req_vars:
-                        req_vars[(loc, mat)].set(value)
-            
-            # Load availability
-            for key, value in config_data.get("availability", {}).items():
-                if "|" in key:
-                    mat, size_str = key.split("|", 1)
-                    try:
-                        size = int(size_str)
-                        if (mat, size) in cont_vars:
-                            cont_vars[(mat, size)].set(value)
-                    except ValueError:
-                        continue
+            self.input_grids.set_problem(problem)
             
             # Clear output and update status
             self.output_display.clear()
@@ -440,8 +606,8 @@ class ContainerAllocatorApp:
                               f"Locations: {len(self.locations)}\n"
                               f"Container Sizes: {len(self.sizes)}")
                               
-        except json.JSONDecodeError:
-            messagebox.showerror("File Error", "The selected file is not a valid JSON file.")
+        except ValueError as e:
+            messagebox.showerror("File Error", f"The selected file is not a valid configuration:\n{e}")
         except FileNotFoundError:
             messagebox.showerror("File Error", "The selected file could not be found.")
         except Exception as e:
@@ -450,31 +616,4 @@ class ContainerAllocatorApp:
 
     def _validate_config_structure(self, config_data):
         """Validate that the config file has the expected structure"""
-        try:
-            # Check required top-level keys
-            if not isinstance(config_data, dict):
-                return False
-                
-            config = config_data.get("configuration", {})
-            if not isinstance(config, dict):
-                return False
-            
-            # Check required configuration keys
-            required_keys = ["materials", "sizes", "locations"]
-            for key in required_keys:
-                if key not in config:
-                    return False
-                if not isinstance(config[key], list):
-                    return False
-                if len(config[key]) == 0:
-                    return False
-            
-            # Validate sizes are integers
-            for size in config["sizes"]:
-                if not isinstance(size, int) or size <= 0:
-                    return False
-            
-            return True
-            
-        except Exception:
-            return False
+        return validate_config_structure(config_data)
@@ -0,0 +1,182 @@
+"""
+Infeasibility Diagnosis
+Explains why a material block has no allocation: which location demands no
+container mix can make, and the fewest extra containers that would fix it
+"""
+
+from pulp import LpInteger, LpMinimize, LpProblem, LpStatus, LpVariable, lpSum, value
+
+from cbc_runner import solve_with_cbc
+from presolve import presolve_material
+
+
+# CBC time limit for the extra-stock model; it is only a diagnosis
+DIAGNOSIS_TIME_LIMIT = 10
+
+
+def _reachable(limit, sizes, caps=None):
+    """
+    Amounts up to limit that container mixes can make exactly
+
+    Returns an int used as a bit set: bit n is set when n SCU can be made.
+    Without caps any number of each size may be used, otherwise at most
+    caps[k] of sizes[k].
+    """
+    mask = (1 << (limit + 1)) - 1
+    reach = 1
+    for k, size in enumerate(sizes):
+        if caps is None:
+            # Doubling shifts add 0..2^j-1 more containers of this size
+            shift = size
+            while shift <= limit:
+                reach |= (reach << shift) & mask
+                shift *= 2
+            continue
+        # Bounded: split the cap into 1, 2, 4, ... so every count up to it is covered
+        left, chunk = caps[k], 1
+        while left > 0:
+            take = min(chunk, left)
+            reach |= (reach << (size * take)) & mask
+            left -= take
+            chunk *= 2
+    return reach
+
+
+def _nearest(reach, amount):
+    """Closest amounts below and above amount in a reachable bit set (None if there is none)"""
+    below = (reach & ((1 << amount) - 1)).bit_length() - 1
+    above = (reach >> amount) & -(reach >> amount)
+    return [below if below > 0 else None,
+            amount + above.bit_length() - 1 if above else None]
+
+
+def diagnose_material(mat, requirements, stock, locations, sizes, cancel=None):
+    """
+    Explain why one material block is infeasible
+
+    Cheap checks run first: amounts that no mix of the container sizes can
+    make, whatever the stock, and locations that the stock cannot serve even
+    on their own. Only when presolve cannot show that the makeable demands
+    fit the stock is a small elastic MILP solved, which adds slack to the
+    stock rows and minimizes the extra containers needed.
+
+    Args:
+        mat: Material name
+        requirements: SCU amounts for this material, one per location
+        stock: Container counts for this material, one per size
+        locations: List of location names
+        sizes: List of container sizes
+        cancel: Optional CancelToken for the CBC run
+
+    Returns:
+        Dict with 'material', 'unreachable' (demands no container mix can
+        make, with the nearest makeable amounts), 'short' (demands the stock
+        cannot make even for that location alone), 'extra_stock' (fewest
+        extra containers per size that make the block feasible, None when
+        that could not be determined), 'competing' (locations that use the
+        extra containers), 'negative' (negative requirements and stock,
+        which alone make the block infeasible) and 'method' ("checks" or
+        "milp")
+    """
+    diagnosis = {
+        'material': mat,
+        'unreachable': [],
+        'short': [],
+        'extra_stock': [],
+        'competing': [],
+        'negative': [],
+        'method': "checks"
+    }
+    diagnosis['negative'] = (
+        [{'location': locations[i], 'value': amount}
+         for i, amount in enumerate(requirements) if amount < 0]
+        + [{'size': sizes[k], 'value': count} for k, count in enumerate(stock) if count < 0]
+    )
+    if diagnosis['negative']:
+        return diagnosis
+
+    active = [i for i, amount in enumerate(requirements) if amount > 0]
+    if not active:
+        return diagnosis
+
+    largest = max(requirements[i] for i in active)
+    any_mix = _reachable(largest + max(sizes), sizes)
+    in_stock = _reachable(largest, sizes, stock)
+
+    makeable = []
+    for i in active:
+        amount = requirements[i]
+        if not any_mix >> amount & 1:
+            diagnosis['unreachable'].append({
+                'location': locations[i],
+                'required': amount,
+                'nearest': _nearest(any_mix, amount)
+            })
+            continue
+        makeable.append(i)
+        if not in_stock >> amount & 1:
+            diagnosis['short'].append({'location': locations[i], 'required': amount})
+
+    if not makeable:
+        return diagnosis
+    if presolve_material([requirements[i] for i in makeable], stock, sizes)['status'] == "Optimal":
+        # The makeable demands fit the stock, the unreachable ones are the whole story
+        return diagnosis
+
+    # Elastic model over the makeable demands: stock rows get integer slack
+    n_size = len(sizes)
+    prob = LpProblem("Diagnosis", LpMinimize)
+    x = {(i, k): LpVariable(f"x_{i}_{k}", 0, None, LpInteger)
+         for i in makeable for k in range(n_size)}
+    extra = [LpVariable(f"e_{k}", 0, None, LpInteger) for k in range(n_size)]
+    prob += lpSum(extra)
+    for i in makeable:
+        prob += lpSum(x[i, k] * size for k, size in enumerate(sizes)) == requirements[i]
+    for k in range(n_size):
+        prob += lpSum(x[i, k] for i in makeable) <= stock[k] + extra[k]
+
+    diagnosis['method'] = "milp"
+    if LpStatus[solve_with_cbc(prob, cancel=cancel, time_limit=DIAGNOSIS_TIME_LIMIT)] != "Optimal":
+        diagnosis['extra_stock'] = None
+        return diagnosis
+
+    short_sizes = []
+    for k, size in enumerate(sizes):
+        count = int(round(value(extra[k])))
+        if count:
+            diagnosis['extra_stock'].append({'size': size, 'count': count})
+            short_sizes.append(k)
+    diagnosis['competing'] = [
+        locations[i] for i in makeable
+        if any(int(round(value(x[i, k]))) for k in short_sizes)
+    ]
+    return diagnosis
+
+
+def describe_diagnosis(diagnosis):
+    """Plain text lines explaining a diagnose_material result"""
+    mat = diagnosis['material']
+    lines = []
+    for item in diagnosis.get('negative', []):
+        if 'location' in item:
+            lines.append(f"{item['location']} has a negative {mat} requirement ({item['value']} SCU)")
+        else:
+            lines.append(f"{mat} stock of {item['size']}-SCU containers is negative ({item['value']})")
+    for demand in diagnosis['unreachable']:
+        below, above = demand['nearest']
+        nearest = " or ".join(f"{amount} SCU" for amount in (below, above) if amount is not None)
+        lines.append(f"{demand['location']} needs {demand['required']} SCU of {mat}, which no "
+                     f"combination of container sizes makes exactly (nearest: {nearest})")
+    for demand in diagnosis['short']:
+        lines.append(f"{demand['location']} needs {demand['required']} SCU of {mat}, which the "
+                     f"{mat} stock cannot make even for this location alone")
+
+    if diagnosis['extra_stock'] is None:
+        lines.append(f"Could not determine the extra {mat} stock needed in time")
+    elif diagnosis['extra_stock']:
+        extra = ", ".join(f"{item['count']}× {item['size']}-SCU" for item in diagnosis['extra_stock'])
+        competing = ""
+        if diagnosis['competing']:
+            competing = f" (for {', '.join(diagnosis['competing'])})"
+        lines.append(f"Add at least {extra} {mat} containers{competing}")
+    return lines
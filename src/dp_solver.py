@@ -0,0 +1,167 @@
+"""
+Exact dynamic-programming engine for single-material allocation blocks
+
+Within one material the allocation is a bounded coin-change problem per
+location with the per-size stock shared between locations. Locations are
+processed one at a time and every reachable "containers used so far" vector
+is kept with the cheapest way of reaching it, which proves optimality (or
+infeasibility) without starting CBC.
+"""
+
+from objectives import DEFAULT_OBJECTIVES, mix_cost_function
+
+
+# Rough number of state/option pairs the engine will evaluate before the
+# caller should fall back to the MILP solver instead
+DEFAULT_MAX_WORK = 20000
+
+
+class StateSpaceExceeded(Exception):
+    """Raised when a block is too large for the DP engine"""
+
+
+def _count_mixes(total, sizes, caps):
+    """
+    Count container mixes for every amount up to total
+
+    Returns a list where entry n is the number of ways to make exactly n SCU
+    from the given sizes without exceeding the per-size caps.
+    """
+    ways = [1] + [0] * total
+    for size, cap in zip(sizes, caps):
+        # Bounded coin counting with a sliding window over each residue class
+        new_ways = [0] * (total + 1)
+        for residue in range(min(size, total + 1)):
+            window = 0
+            positions = range(residue, total + 1, size)
+            for k, n in enumerate(positions):
+                window += ways[n]
+                if k > cap:
+                    window -= ways[n - (cap + 1) * size]
+                new_ways[n] = window
+        ways = new_ways
+    return ways
+
+
+def _location_mixes(amount, sizes, caps, cost=sum):
+    """All container mixes that add up to exactly amount SCU, cheapest first"""
+    # reachable[i][n] > 0 when n SCU can still be made from sizes[i:]
+    reachable = [_count_mixes(amount, sizes[i:], caps[i:]) for i in range(len(sizes))]
+    reachable.append([1] + [0] * amount)
+
+    mixes = []
+    counts = [0] * len(sizes)
+
+    def fill(index, remaining):
+        if not reachable[index][remaining]:
+            return
+        if index == len(sizes):
+            mixes.append(tuple(counts))
+            return
+        size = sizes[index]
+        for count in range(min(caps[index], remaining // size), -1, -1):
+            counts[index] = count
+            fill(index + 1, remaining - count * size)
+        counts[index] = 0
+
+    fill(0, amount)
+    mixes.sort(key=cost)
+    return mixes
+
+
+def solve_material_dp(mat, requirements, stock, sizes, max_work=DEFAULT_MAX_WORK,
+                      objectives=DEFAULT_OBJECTIVES, reserve_sizes=(), ranks=None):
+    """
+    Solve one material block exactly with dynamic programming
+
+    Args:
+        mat: Material name
+        requirements: SCU amounts for this material, one per location
+        stock: Container counts for this material, one per size
+        sizes: List of container sizes
+        max_work: Budget of state/option evaluations before giving up
+        objectives: Normalized objective stack, see objectives.OBJECTIVES
+        reserve_sizes: Sizes the "reserve" objective keeps in stock
+        ranks: Optional "larger" objective weight per size
+
+    Returns:
+        Block result dict in the same shape as solver.solve_material
+
+    Raises:
+        StateSpaceExceeded: If the estimated work is above max_work
+    """
+    # No mix makes a negative amount and no allocation fits negative stock;
+    # the state space below assumes neither
+    if any(amount < 0 for amount in requirements) or any(count < 0 for count in stock):
+        return {
+            'material': mat,
+            'status': "Infeasible",
+            'allocation': []
+        }
+
+    total = sum(requirements)
+    # Never keep track of more containers than could possibly be used
+    caps = [min(count, total // size) for count, size in zip(stock, sizes)]
+
+    active = [i for i, amount in enumerate(requirements) if amount > 0]
+    zero_mix = (0,) * len(sizes)
+
+    # Estimate the work up front from the number of reachable stock vectors
+    ways = _count_mixes(total, sizes, caps)
+    work = 0
+    prefix = 0
+    for i in active:
+        work += ways[prefix] * ways[requirements[i]]
+        prefix += requirements[i]
+        if work > max_work:
+            raise StateSpaceExceeded(f"{mat}: estimated work above {max_work}")
+
+    # Lexicographic stacks pack their objective values into one integer cost
+    mix_cost = mix_cost_function(objectives, sizes, reserve_sizes, sum(caps), len(active),
+                                 ranks)
+
+    # layer maps used-containers vector -> (cost, previous vector, mix)
+    layers = []
+    layer = {zero_mix: (0, None, None)}
+    for i in active:
+        mixes = [(mix, mix_cost(mix))
+                 for mix in _location_mixes(requirements[i], sizes, caps, mix_cost)]
+        next_layer = {}
+        for used, (cost, _, _) in layer.items():
+            # Stock left over for this location
+            left = [cap - u for cap, u in zip(caps, used)]
+            for mix, count in mixes:
+                if any(m > l for m, l in zip(mix, left)):
+                    continue
+                new_used = tuple(u + m for u, m in zip(used, mix))
+                new_cost = cost + count
+                best = next_layer.get(new_used)
+                if best is None or new_cost < best[0]:
+                    next_layer[new_used] = (new_cost, used, mix)
+        layers.append(next_layer)
+        layer = next_layer
+        if not layer:
+            break
+
+    if not layer:
+        return {
+            'material': mat,
+            'status': "Infeasible",
+            'allocation': []
+        }
+
+    # Cheapest final state, first one wins ties so results are deterministic
+    used = min(layer, key=lambda key: layer[key][0])
+
+    n_size = len(sizes)
+    allocation = [0] * (len(requirements) * n_size)
+    for i, step in zip(reversed(active), reversed(layers)):
+        _, previous, mix = step[used]
+        allocation[i * n_size:(i + 1) * n_size] = mix
+        used = previous
+
+    return {
+        'material': mat,
+        'status': "Optimal",
+        'allocation': allocation
+    }
@@ -0,0 +1,82 @@
+"""
+In-process HiGHS backend
+Solves material blocks with scipy.optimize.milp, without starting a CBC process
+
+SciPy is optional (the packaged executable does not include it); when it
+cannot be imported the backend is simply not registered.
+"""
+
+import time
+
+try:
+    from scipy.optimize import Bounds, LinearConstraint, milp
+    from scipy.sparse import coo_matrix
+except ImportError:
+    milp = None
+
+
+# scipy.optimize.milp status code to PuLP status name
+HIGHS_STATUS = {
+    0: "Optimal",
+    1: "Not Solved",
+    2: "Infeasible",
+    3: "Unbounded"
+}
+
+
+def highs_available():
+    """Whether SciPy's MILP interface to HiGHS can be used"""
+    return milp is not None
+
+
+def solve_material_highs(mat, requirements, stock, locations, sizes, time_limit=None,
+                         cancel=None):
+    """
+    Solve a single material block with HiGHS in this process
+
+    The model is the same as the CBC one: one integer variable per location
+    and size, SCU equalities per location and stock limits per size. HiGHS
+    runs in-process, so the cancel token is only checked before the solve.
+    """
+    if cancel is not None:
+        cancel.check()
+
+    start = time.perf_counter()
+    n_loc, n_size = len(requirements), len(sizes)
+    n_var = n_loc * n_size
+
+    # Rows 0..n_loc-1 are the SCU equalities, the next n_size rows the stock limits
+    rows, columns, entries = [], [], []
+    for i in range(n_loc):
+        for k, size in enumerate(sizes):
+            rows += [i, n_loc + k]
+            columns += [i * n_size + k] * 2
+            entries += [size, 1]
+    matrix = coo_matrix((entries, (rows, columns)), shape=(n_loc + n_size, n_var))
+    lower = list(requirements) + [0] * n_size
+    upper = list(requirements) + list(stock)
+
+    options = {'disp': False}
+    if time_limit:
+        options['time_limit'] = time_limit
+    built = time.perf_counter()
+
+    result = milp([1] * n_var, integrality=[1] * n_var, bounds=Bounds(0, float("inf")),
+                  constraints=LinearConstraint(matrix, lower, upper), options=options)
+    solved = time.perf_counter()
+
+    status = HIGHS_STATUS.get(result.status, "Undefined")
+    allocation = []
+    if status == "Optimal":
+        allocation = [int(round(v)) for v in result.x]
+
+    return {
+        'material': mat,
+        'status': status,
+        'allocation': allocation,
+        'timings': {
+            'model': built - start,
+            'highs': solved - built,
+            'extract': time.perf_counter() - solved
+        }
+    }
@@ -1,11 +1,27 @@
+import argparse
+import logging
+import multiprocessing
 import tkinter as tk
 from container_app import ContainerAllocatorApp
 
 def main():
     """Main application entry point"""
+    # Needed for the solver's process pool inside the frozen executable
+    multiprocessing.freeze_support()
+
+    parser = argparse.ArgumentParser(description="Container Allocator")
+    parser.add_argument("--debug", action="store_true", help="log timings and debug output")
+    parser.add_argument("--trace", help="append calculate timings to this JSON lines file")
+    parser.add_argument("--no-prewarm", action="store_true",
+                        help="load the solver on the first Calculate instead of in the "
+                             "background after startup")
+    args = parser.parse_args()
+    if args.debug:
+        logging.basicConfig(level=logging.DEBUG)
+
     root = tk.Tk()
-    app = ContainerAllocatorApp(root)
+    app = ContainerAllocatorApp(root, trace_file=args.trace, prewarm=not args.no_prewarm)
     root.mainloop()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
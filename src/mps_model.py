@@ -0,0 +1,131 @@
+"""
+Direct MPS Model
+Writes material blocks straight to an MPS file for CBC, without PuLP expression objects
+"""
+
+import os
+import tempfile
+import time
+import uuid
+
+from cbc_runner import cbc_arguments, run_cbc
+
+
+# Blocks with at least this many location × size variables skip PuLP
+DIRECT_MODEL_THRESHOLD = 64
+
+# CBC solution status (first word of the solution file) to PuLP status name
+CBC_STATUS = {
+    "Optimal": "Optimal",
+    "Infeasible": "Infeasible",
+    "Integer": "Infeasible",
+    "Unbounded": "Unbounded",
+    "Stopped": "Not Solved"
+}
+
+
+def write_material_mps(path, requirements, stock, sizes):
+    """
+    Write the model of one material block as a fixed-format MPS file
+
+    The model is the one PuLP writes for this block (same rows, columns and
+    bounds, so CBC behaves the same) but names are index-based: x<location
+    index * sizes + size index> for variables, R<location> for the SCU
+    equalities and S<size> for the stock limits. No user-supplied names
+    reach the file.
+    """
+    n_size = len(sizes)
+    lines = ["NAME          BLOCK", "ROWS", " N  OBJ"]
+    lines += [f" E  R{i}" for i in range(len(requirements))]
+    lines += [f" L  S{k}" for k in range(n_size)]
+
+    lines.append("COLUMNS")
+    lines.append("    MARKER                 'MARKER'                 'INTORG'")
+    for i in range(len(requirements)):
+        row = f"R{i:<7}"
+        for k, size in enumerate(sizes):
+            name = f"x{i * n_size + k:<7}"
+            lines.append(f"    {name}  OBJ       1")
+            lines.append(f"    {name}  {row}  {size}")
+            lines.append(f"    {name}  S{k:<7}  1")
+    lines.append("    MARKER                 'MARKER'                 'INTEND'")
+
+    lines.append("RHS")
+    lines += [f"    RHS       R{i:<7}  {amount}" for i, amount in enumerate(requirements)]
+    lines += [f"    RHS       S{k:<7}  {count}" for k, count in enumerate(stock)]
+
+    lines.append("BOUNDS")
+    lines += [f" LO BND       x{index:<7}  0" for index in range(len(requirements) * n_size)]
+    lines.append("ENDATA")
+
+    with open(path, 'w') as f:
+        f.write("\n".join(lines) + "\n")
+
+
+def write_mip_start(path, warm_start):
+    """Write a previous allocation as a CBC MIP start"""
+    with open(path, 'w') as f:
+        f.write("Stopped on time - objective value 0\n")
+        for index, count in enumerate(warm_start):
+            f.write(f"{index:>7} x{index} {count:>15} {0:>23}\n")
+
+
+def read_cbc_solution(path, n_variables):
+    """
+    Read a CBC solution file
+
+    Returns:
+        (status, values) with the PuLP status name and a flat list of
+        n_variables container counts
+    """
+    values = [0] * n_variables
+    with open(path, 'r') as f:
+        first_line = f.readline().split()
+        status = CBC_STATUS.get(first_line[0] if first_line else "", "Undefined")
+        for line in f:
+            parts = line.split()
+            if parts and parts[0] == "**":
+                # Marks rows or columns that are infeasible in the reported point
+                parts = parts[1:]
+            if len(parts) < 3 or not parts[1].startswith("x"):
+                continue
+            values[int(parts[1][1:])] = int(round(float(parts[2])))
+    return status, values
+
+
+def solve_material_direct(mat, requirements, stock, locations, sizes, threads=None,
+                          warm_start=None, cancel=None, time_limit=None):
+    """Solve a single material block through a directly written MPS file"""
+    prefix = os.path.join(tempfile.gettempdir(), uuid.uuid4().hex)
+    mps_path, sol_path, mst_path = (f"{prefix}-block.{ext}" for ext in ("mps", "sol", "mst"))
+
+    try:
+        start = time.perf_counter()
+        write_material_mps(mps_path, requirements, stock, sizes)
+        if warm_start:
+            write_mip_start(mst_path, warm_start)
+        built = time.perf_counter()
+
+        run_cbc(cbc_arguments(mps_path, sol_path, threads, mst_path if warm_start else None,
+                              time_limit),
+                sol_path, cancel)
+        solved = time.perf_counter()
+
+        status, values = read_cbc_solution(sol_path, len(locations) * len(sizes))
+        return {
+            'material': mat,
+            'status': status,
+            'allocation': values if status == "Optimal" else [],
+            'timings': {
+                'model': built - start,
+                'cbc': solved - built,
+                'extract': time.perf_counter() - solved
+            }
+        }
+
+    finally:
+        for path in (mps_path, sol_path, mst_path):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
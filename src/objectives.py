@@ -0,0 +1,127 @@
+"""
+Objective Stacks
+Secondary goals that break ties between allocations with the fewest containers,
+optimized lexicographically in the order given
+"""
+
+
+# Objective names and what they minimize
+OBJECTIVES = {
+    'containers': "Fewest containers",
+    'reserve': "Keep the reserve sizes in stock",
+    'stops': "Fewest location/size lines",
+    'larger': "Prefer larger containers"
+}
+
+DEFAULT_OBJECTIVES = ("containers",)
+
+
+def normalize_objectives(objectives):
+    """
+    Validate an objective stack
+
+    Duplicates are dropped and "containers" is added last if it is missing,
+    so a stack never trades containers for nothing.
+
+    Raises:
+        ValueError: If the stack names an unknown objective
+    """
+    stack = tuple(dict.fromkeys(objectives or DEFAULT_OBJECTIVES))
+    unknown = [name for name in stack if name not in OBJECTIVES]
+    if unknown:
+        raise ValueError(f"Unknown objective '{unknown[0]}', expected one of "
+                         f"{', '.join(OBJECTIVES)}")
+    if "containers" not in stack:
+        stack += ("containers",)
+    return stack
+
+
+def is_lexicographic(objectives):
+    """Whether a normalized stack does more than minimize containers"""
+    return tuple(objectives) != DEFAULT_OBJECTIVES
+
+
+def larger_ranks(sizes):
+    """Weight of each size for the "larger" objective: how many sizes are larger"""
+    return [sum(other > size for other in sizes) for size in sizes]
+
+
+def mix_cost_function(objectives, sizes, reserve_sizes, max_containers, n_locations,
+                      ranks=None):
+    """
+    Cost of one location's container mix for the DP engine
+
+    The objective values are packed into one integer, most important first,
+    with a base larger than any block total of the less important ones. Sums
+    and comparisons of packed costs are then exactly lexicographic.
+
+    Args:
+        objectives: Normalized objective stack
+        sizes: Container sizes of the block
+        reserve_sizes: Sizes the "reserve" objective keeps in stock
+        max_containers: Most containers the block can use in total
+        n_locations: Number of locations in the block
+        ranks: Optional "larger" weight per size; defaults to larger_ranks(sizes)
+
+    Returns:
+        Function mapping a mix tuple to its packed cost
+    """
+    if not is_lexicographic(objectives):
+        return sum
+
+    ranks = ranks or larger_ranks(sizes)
+    reserved = [size in reserve_sizes for size in sizes]
+    terms = {
+        'containers': sum,
+        'reserve': lambda mix: sum(count for count, keep in zip(mix, reserved) if keep),
+        'stops': lambda mix: sum(1 for count in mix if count),
+        'larger': lambda mix: sum(count * rank for count, rank in zip(mix, ranks))
+    }
+    functions = [terms[name] for name in objectives]
+    base = max(max_containers * max(max(ranks, default=0), 1), n_locations * len(sizes)) + 1
+
+    def cost(mix):
+        packed = 0
+        for function in functions:
+            packed = packed * base + function(mix)
+        return packed
+
+    return cost
+
+
+def objective_expressions(prob, x, requirements, sizes, objectives, reserve_sizes, ranks=None):
+    """
+    PuLP expressions of an objective stack for a block model
+
+    Adds the binary line indicators and their links to prob when the stack
+    contains "stops". x is the location-major list of block variables.
+
+    Returns:
+        List of expressions in stack order
+    """
+    # PuLP is imported here so the settings can be read without it at startup
+    from pulp import LpBinary, LpVariable, lpSum
+
+    n_size = len(sizes)
+    ranks = ranks or larger_ranks(sizes)
+    expressions = []
+    for name in objectives:
+        if name == 'containers':
+            expressions.append(lpSum(x))
+        elif name == 'reserve':
+            expressions.append(lpSum(x[index] for index in range(len(x))
+                                     if sizes[index % n_size] in reserve_sizes))
+        elif name == 'larger':
+            expressions.append(lpSum(x[index] * ranks[index % n_size] for index in range(len(x))))
+        elif name == 'stops':
+            lines = []
+            for i, amount in enumerate(requirements):
+                for k, size in enumerate(sizes):
+                    # Sizes larger than the amount cannot be used there at all
+                    if amount >= size:
+                        line = LpVariable(f"y_{i}_{k}", cat=LpBinary)
+                        # A line can carry at most amount // size containers
+                        prob += x[i * n_size + k] <= (amount // size) * line
+                        lines.append(line)
+            expressions.append(lpSum(lines))
+    return expressions
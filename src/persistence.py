@@ -0,0 +1,167 @@
+"""
+Persistence
+Atomic file writes and a background writer that batches repeated writes, so
+the Tk thread never waits for the disk and a crash never leaves a truncated
+file behind
+"""
+
+import atexit
+import os
+import threading
+import time
+from pathlib import Path
+
+
+# Writes submitted within this many seconds of each other are batched
+WRITE_DELAY = 0.5
+
+
+def atomic_write(path, data, durable=True):
+    """
+    Replace a file in one step
+
+    The data goes to a temporary file in the same folder, which is then
+    renamed over the target, so readers see the old or the new content and
+    never a partial file.
+
+    Args:
+        path: Target file
+        data: Bytes to write
+        durable: fsync the file, and on POSIX its folder, so the new content
+            survives a power loss; caches can skip this
+
+    Raises:
+        OSError: If the file cannot be written; the target is left unchanged
+    """
+    path = Path(path)
+    temp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+    if durable and os.name == 'posix':
+        # Make the rename itself durable
+        try:
+            folder = os.open(path.parent, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(folder)
+        except OSError:
+            pass
+        finally:
+            os.close(folder)
+
+
+def file_state(path):
+    """(mtime_ns, size) of a file, or None if it does not exist; used to notice outside edits"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class BackgroundWriter:
+    """
+    Daemon thread running write tasks after a short delay
+
+    Tasks are keyed, typically by file. A task submitted while another with
+    the same key is still waiting replaces it without moving its due time,
+    so a burst of changes becomes one write no later than the delay after
+    the first. Pending tasks are flushed at interpreter exit.
+    """
+
+    def __init__(self, delay=WRITE_DELAY):
+        """
+        Args:
+            delay: Seconds a task waits for more changes before it runs
+        """
+        self.delay = delay
+        # Key -> (due time, task)
+        self._pending = {}
+        # Keys of the tasks being run
+        self._running = set()
+        self._cond = threading.Condition()
+        self._thread = None
+        atexit.register(self.flush)
+
+    def submit(self, key, task):
+        """
+        Schedule task() to run on the writer thread
+
+        Args:
+            key: Tasks with the same key are batched
+            task: Callable doing the write; exceptions are printed
+        """
+        with self._cond:
+            due = self._pending[key][0] if key in self._pending else time.monotonic() + self.delay
+            self._pending[key] = (due, task)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="background-writer",
+                                                daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+
+    def pending(self, key):
+        """Whether a task with this key is waiting or running"""
+        with self._cond:
+            return key in self._pending or key in self._running
+
+    def flush(self, timeout=None):
+        """
+        Run every pending task now and wait for them
+
+        Returns:
+            False if the timeout expired first
+        """
+        with self._cond:
+            self._pending = {key: (0, task) for key, (_, task) in self._pending.items()}
+            self._cond.notify_all()
+            return self._cond.wait_for(lambda: not self._pending and not self._running, timeout)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while True:
+                    if self._pending:
+                        key = min(self._pending, key=lambda name: self._pending[name][0])
+                        wait = self._pending[key][0] - time.monotonic()
+                        if wait <= 0:
+                            break
+                        self._cond.wait(wait)
+                    else:
+                        self._cond.wait()
+                _, task = self._pending.pop(key)
+                self._running.add(key)
+            try:
+                task()
+            except Exception as e:
+                print(f"Error writing {key}: {e}")
+            finally:
+                with self._cond:
+                    self._running.discard(key)
+                    self._cond.notify_all()
+
+
+# Writer shared by the whole process
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def get_writer():
+    """Shared BackgroundWriter, started on first use"""
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = BackgroundWriter()
+        return _writer
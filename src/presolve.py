@@ -0,0 +1,157 @@
+"""
+Block Presolve
+Drops empty rows and unusable sizes, and proves trivial material blocks optimal
+or infeasible before any MILP solver is started
+"""
+
+import math
+from functools import lru_cache
+
+
+# Largest SCU amount the fewest-containers table is built for; blocks with
+# bigger requirements only get the aggregate LP bound
+MAX_TABLE_AMOUNT = 4096
+
+
+@lru_cache(maxsize=32)
+def _fewest_containers(limit, sizes):
+    """
+    Fewest containers making every amount up to limit, ignoring stock
+
+    Args:
+        limit: Largest amount
+        sizes: Tuple of (size index, size) pairs that may be used
+
+    Returns:
+        (count, last) lists; count[n] is None when n cannot be made exactly
+        and last[n] is the size index of one container of an optimal mix
+    """
+    count = [0] + [None] * limit
+    last = [None] * (limit + 1)
+    for n in range(1, limit + 1):
+        for k, size in sizes:
+            if size <= n and count[n - size] is not None:
+                if count[n] is None or count[n - size] + 1 < count[n]:
+                    count[n] = count[n - size] + 1
+                    last[n] = k
+    return count, last
+
+
+def _table_mix(amount, table, sizes):
+    """Read one fewest-containers mix for amount out of the table"""
+    _, last = table
+    mix = [0] * len(sizes)
+    while amount:
+        k = last[amount]
+        mix[k] += 1
+        amount -= sizes[k]
+    return mix
+
+
+def _largest_first(amount, usable, left, n_size):
+    """Largest-first mix within the stock left, or None if it does not come out exact"""
+    mix = [0] * n_size
+    for k, size in usable:
+        mix[k] = min(left[k], amount // size)
+        amount -= mix[k] * size
+    return mix if amount == 0 else None
+
+
+def presolve_material(requirements, stock, sizes):
+    """
+    Presolve one material block
+
+    Locations without a requirement and sizes that are out of stock or
+    larger than every requirement are dropped. A greedy allocation is
+    compared with a lower bound, the larger of the per-location fewest
+    containers (stock ignored) and the rounded-up LP relaxation (stock
+    filled largest size first); when they meet the greedy allocation is
+    optimal. Amounts that no container mix can make, more SCU than the
+    stock holds, or any negative amount or stock prove the block infeasible.
+
+    Args:
+        requirements: SCU amounts for this material, one per location
+        stock: Container counts for this material, one per size
+        sizes: List of container sizes
+
+    Returns:
+        Dict with 'status' ("Optimal", "Infeasible" or None when a solver is
+        still needed), 'allocation' (the optimal flat allocation when
+        decided so), 'locations' and 'sizes' (indices kept for the solver),
+        'greedy' (a feasible flat allocation or None), 'bound' and 'stats'
+    """
+    n_size = len(sizes)
+    active = [i for i, amount in enumerate(requirements) if amount > 0]
+    largest = max((requirements[i] for i in active), default=0)
+    kept = [k for k, size in enumerate(sizes) if stock[k] > 0 and size <= largest]
+    usable = sorted(((k, sizes[k]) for k in kept), key=lambda item: -item[1])
+
+    result = {
+        'status': None,
+        'allocation': None,
+        'locations': active,
+        'sizes': kept,
+        'greedy': None,
+        'bound': 0,
+        'stats': {
+            'rows_dropped': len(requirements) - len(active),
+            'columns_dropped': (len(requirements) - len(active)) * n_size
+                               + len(active) * (n_size - len(kept))
+        }
+    }
+
+    # No mix makes a negative amount and no allocation fits negative stock
+    if any(amount < 0 for amount in requirements) or any(count < 0 for count in stock):
+        result['status'] = "Infeasible"
+        return result
+
+    if not active:
+        result['status'] = "Optimal"
+        result['allocation'] = [0] * (len(requirements) * n_size)
+        return result
+
+    # LP relaxation: fill the total with the largest containers first
+    remaining = sum(requirements[i] for i in active)
+    lp_bound = 0.0
+    for k, size in usable:
+        take = min(stock[k], remaining / size)
+        lp_bound += take
+        remaining -= take * size
+    if remaining > 1e-9:
+        # Not enough capacity even before splitting by location
+        result['status'] = "Infeasible"
+        return result
+    bound = math.ceil(lp_bound - 1e-9)
+
+    table = None
+    if largest <= MAX_TABLE_AMOUNT:
+        table = _fewest_containers(1 << max(largest - 1, 0).bit_length(), tuple(usable))
+        counts = [table[0][requirements[i]] for i in active]
+        if None in counts:
+            # Some amount is not a sum of the sizes in stock
+            result['status'] = "Infeasible"
+            return result
+        bound = max(bound, sum(counts))
+    result['bound'] = bound
+
+    left = list(stock)
+    greedy = [0] * (len(requirements) * n_size)
+    for i in active:
+        mix = None
+        if table is not None:
+            mix = _table_mix(requirements[i], table, sizes)
+            if any(count > left[k] for k, count in enumerate(mix)):
+                mix = None
+        if mix is None:
+            mix = _largest_first(requirements[i], usable, left, n_size)
+            if mix is None:
+                return result
+        for k, count in enumerate(mix):
+            left[k] -= count
+        greedy[i * n_size:(i + 1) * n_size] = mix
+
+    result['greedy'] = greedy
+    if sum(greedy) == bound:
+        result['status'] = "Optimal"
+        result['allocation'] = greedy
+    return result
@@ -0,0 +1,213 @@
+"""
+Allocation Problem
+Compact, array-backed representation of an allocation instance
+"""
+
+from array import array
+
+
+class AllocationProblem:
+    """
+    Allocation instance stored as flat integer arrays
+
+    requirements is an L×M array in row-major order (one row per location)
+    and available is an M×S array (one row per material). Name/index maps
+    translate between location, material and size names and array indexes.
+    """
+
+    def __init__(self, locations, materials, sizes, requirements=None, available=None):
+        """
+        Args:
+            locations: List of location names
+            materials: List of material names
+            sizes: List of container sizes
+            requirements: Optional flat L×M sequence of SCU amounts
+            available: Optional flat M×S sequence of container counts
+        """
+        self.locations = list(locations)
+        self.materials = list(materials)
+        self.sizes = list(sizes)
+
+        self.location_index = {loc: i for i, loc in enumerate(self.locations)}
+        self.material_index = {mat: j for j, mat in enumerate(self.materials)}
+        self.size_index = {size: k for k, size in enumerate(self.sizes)}
+
+        n_loc, n_mat, n_size = self.shape
+        self.requirements = self._init_array(requirements, n_loc * n_mat)
+        self.available = self._init_array(available, n_mat * n_size)
+
+    @staticmethod
+    def _init_array(values, length):
+        if values is None:
+            return array('q', bytes(8 * length))
+        values = array('q', values)
+        if len(values) != length:
+            raise ValueError(f"Expected {length} values, got {len(values)}")
+        return values
+
+    @property
+    def shape(self):
+        """(locations, materials, sizes)"""
+        return len(self.locations), len(self.materials), len(self.sizes)
+
+    @classmethod
+    def from_dicts(cls, requirements, available, locations, materials, sizes):
+        """Build from {location: {material: amount}} and {material: {size: count}} dicts"""
+        return cls(
+            locations, materials, sizes,
+            [requirements[loc][mat] for loc in locations for mat in materials],
+            [available[mat][size] for mat in materials for size in sizes]
+        )
+
+    def to_dicts(self):
+        """Convert back to (requirements, available) nested dicts"""
+        n_mat, n_size = len(self.materials), len(self.sizes)
+        requirements = {
+            loc: dict(zip(self.materials, self.requirements[i * n_mat:(i + 1) * n_mat]))
+            for i, loc in enumerate(self.locations)
+        }
+        available = {
+            mat: dict(zip(self.sizes, self.available[j * n_size:(j + 1) * n_size]))
+            for j, mat in enumerate(self.materials)
+        }
+        return requirements, available
+
+    def requirement(self, loc, mat):
+        return self.requirements[self.location_index[loc] * len(self.materials)
+                                 + self.material_index[mat]]
+
+    def set_requirement(self, loc, mat, amount):
+        self.requirements[self.location_index[loc] * len(self.materials)
+                          + self.material_index[mat]] = amount
+
+    def stock(self, mat, size):
+        return self.available[self.material_index[mat] * len(self.sizes) + self.size_index[size]]
+
+    def set_stock(self, mat, size, count):
+        self.available[self.material_index[mat] * len(self.sizes) + self.size_index[size]] = count
+
+    def material_requirements(self, j):
+        """Requirements column of material index j, one entry per location"""
+        return self.requirements[j::len(self.materials)]
+
+    def material_stock(self, j):
+        """Stock row of material index j, one entry per size"""
+        n_size = len(self.sizes)
+        return self.available[j * n_size:(j + 1) * n_size]
+
+    def total_required(self, j):
+        """Total SCU required for material index j"""
+        return sum(self.material_requirements(j))
+
+    def total_capacity(self, j):
+        """Total SCU that the stock of material index j can carry"""
+        return sum(count * size for count, size in zip(self.material_stock(j), self.sizes))
+
+
+class Allocation:
+    """
+    Solved allocation stored as a dense L×M×S array of container counts
+
+    counts is flat in location, material, size order. Reductions used by the
+    reports are computed with one pass over the array instead of looking up
+    every (location, material, size) cell separately.
+    """
+
+    def __init__(self, locations, materials, sizes, counts=None):
+        """
+        Args:
+            locations: List of location names
+            materials: List of material names
+            sizes: List of container sizes
+            counts: Optional flat L×M×S sequence of container counts
+        """
+        self.locations = list(locations)
+        self.materials = list(materials)
+        self.sizes = list(sizes)
+        n_loc, n_mat, n_size = self.shape
+        self.counts = AllocationProblem._init_array(counts, n_loc * n_mat * n_size)
+
+    @property
+    def shape(self):
+        """(locations, materials, sizes)"""
+        return len(self.locations), len(self.materials), len(self.sizes)
+
+    def __eq__(self, other):
+        if not isinstance(other, Allocation):
+            return NotImplemented
+        return (self.locations == other.locations and self.materials == other.materials
+                and self.sizes == other.sizes and self.counts == other.counts)
+
+    @classmethod
+    def from_blocks(cls, locations, materials, sizes, blocks):
+        """
+        Assemble from per-material block allocations
+
+        Args:
+            blocks: One flat location-major L×S count list per material,
+                in material order
+        """
+        allocation = cls(locations, materials, sizes)
+        n_mat, n_size = len(allocation.materials), len(allocation.sizes)
+        counts = allocation.counts
+        for j, block in enumerate(blocks):
+            for i in range(len(allocation.locations)):
+                start = (i * n_mat + j) * n_size
+                counts[start:start + n_size] = array('q', block[i * n_size:(i + 1) * n_size])
+        return allocation
+
+    def reordered(self, locations, materials, sizes):
+        """
+        Same allocation with its locations, materials and sizes in another order
+
+        Args:
+            locations, materials, sizes: The names of this allocation, permuted
+
+        Raises:
+            KeyError: If a name is not part of this allocation
+        """
+        if (list(locations), list(materials), list(sizes)) == (self.locations, self.materials,
+                                                               self.sizes):
+            return Allocation(locations, materials, sizes, self.counts)
+        location_index = {loc: i for i, loc in enumerate(self.locations)}
+        material_index = {mat: j for j, mat in enumerate(self.materials)}
+        size_index = {size: k for k, size in enumerate(self.sizes)}
+        size_order = [size_index[size] for size in sizes]
+        counts = array('q')
+        for loc in locations:
+            for mat in materials:
+                row = self.row(location_index[loc], material_index[mat])
+                counts.extend(row[k] for k in size_order)
+        return Allocation(locations, materials, sizes, counts)
+
+    def count(self, i, j, k):
+        """Containers of size index k for material j at location i"""
+        return self.counts[(i * len(self.materials) + j) * len(self.sizes) + k]
+
+    def row(self, i, j):
+        """Counts per size for location i and material j"""
+        n_size = len(self.sizes)
+        start = (i * len(self.materials) + j) * n_size
+        return self.counts[start:start + n_size]
+
+    def total(self):
+        """Total number of containers allocated"""
+        return sum(self.counts)
+
+    def used_stock(self):
+        """Flat M×S array of containers used, summed over locations"""
+        n_loc, n_mat, n_size = self.shape
+        used = array('q', bytes(8 * n_mat * n_size))
+        width = n_mat * n_size
+        for i in range(n_loc):
+            used = array('q', map(int.__add__, used, self.counts[i * width:(i + 1) * width]))
+        return used
+
+    def nonzero(self):
+        """Yield (location, material, size, count) for every non-empty cell"""
+        n_loc, n_mat, n_size = self.shape
+        for index, count in enumerate(self.counts):
+            if count:
+                cell, k = divmod(index, n_size)
+                i, j = divmod(cell, n_mat)
+                yield self.locations[i], self.materials[j], self.sizes[k], count
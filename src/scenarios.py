@@ -0,0 +1,182 @@
+"""
+What-If Scenarios
+Solves variants of a problem with changed stock or requirements and tabulates
+the container totals, re-solving only the material blocks a scenario touches
+"""
+
+import itertools
+
+from cbc_runner import CancelToken, SolveCancelled
+from problem import AllocationProblem
+
+
+def stock_parameter(mat, size):
+    """Scenario key for the stock of one material and container size"""
+    return ('stock', mat, size)
+
+
+def requirement_parameter(loc, mat):
+    """Scenario key for the SCU requirement of one location and material"""
+    return ('requirement', loc, mat)
+
+
+def describe_parameter(key):
+    """Column label for a scenario key, e.g. 'Titanium 4-SCU stock'"""
+    if key[0] == 'stock':
+        return f"{key[1]} {key[2]}-SCU stock"
+    return f"{key[1]} {key[2]} SCU"
+
+
+def base_value(problem, key):
+    """Value of a scenario key in the problem"""
+    if key[0] == 'stock':
+        return problem.stock(key[1], key[2])
+    return problem.requirement(key[1], key[2])
+
+
+def offset_values(problem, key, offsets):
+    """Absolute values for offsets from the problem's value, never below zero"""
+    return [max(0, base_value(problem, key) + offset) for offset in offsets]
+
+
+def parameter_grid(parameters):
+    """
+    Every combination of parameter values
+
+    Args:
+        parameters: Dict of {scenario key: list of values}
+
+    Returns:
+        List of scenarios, each a {scenario key: value} dict
+    """
+    keys = list(parameters)
+    return [dict(zip(keys, values)) for values in itertools.product(*parameters.values())]
+
+
+def apply_scenario(problem, scenario):
+    """
+    Copy of problem with the scenario's values set
+
+    Raises:
+        ValueError: If a key names an unknown location, material or size
+    """
+    changed = AllocationProblem(problem.locations, problem.materials, problem.sizes,
+                                problem.requirements, problem.available)
+    for key, amount in scenario.items():
+        kind, first, second = key
+        try:
+            if kind == 'stock':
+                changed.set_stock(first, second, amount)
+            else:
+                changed.set_requirement(first, second, amount)
+        except KeyError:
+            raise ValueError(f"Unknown scenario parameter: {describe_parameter(key)}")
+    return changed
+
+
+def solve_scenarios(solver, problem, scenarios, progress=None, cancel=None):
+    """
+    Solve a base problem and a list of what-if scenarios
+
+    The base problem is solved once, block by block. A scenario only
+    re-solves the materials it changes, warm-started from the base block,
+    and blocks that come out identical in several scenarios (common in
+    parameter grids) are solved once. All scenario blocks go to the solver
+    together, so they run in parallel when the solver has workers.
+
+    Args:
+        solver: ContainerSolver whose options and worker pool are used
+        problem: Base AllocationProblem
+        scenarios: List of {scenario key: value} dicts
+        progress: Optional callback(done, total) over all blocks solved
+        cancel: Optional CancelToken that stops the sweep
+
+    Returns:
+        Dict with 'base' (a row for the unchanged problem), 'rows' (one per
+        scenario, in order) and 'parameters' (the keys used by any scenario).
+        A row has 'scenario' (its values), 'status' ("Optimal" or the first
+        non-optimal material status), 'total_containers' (None unless
+        optimal) and 'delta', the change from the base total. Cancelled
+        sweeps return {'cancelled': True}.
+    """
+    cancel = cancel or CancelToken()
+    locations, sizes = problem.locations, problem.sizes
+
+    def block_signatures(variant):
+        return [(mat, tuple(variant.material_requirements(j)), tuple(variant.material_stock(j)))
+                for j, mat in enumerate(variant.materials)]
+
+    base_signatures = block_signatures(problem)
+    scenario_signatures = [block_signatures(apply_scenario(problem, scenario))
+                           for scenario in scenarios]
+
+    # Distinct changed blocks over all scenarios, with the base block they replace
+    pending = {}
+    for signatures in scenario_signatures:
+        for j, signature in enumerate(signatures):
+            if signature != base_signatures[j]:
+                pending.setdefault(signature, j)
+
+    total = len(base_signatures) + len(pending)
+
+    def report(offset):
+        if progress:
+            return lambda done, _: progress(offset + done, total)
+        return None
+
+    try:
+        base = solver.solve_blocks(
+            [(mat, list(requirements), list(stock), locations, sizes, None)
+             for mat, requirements, stock in base_signatures],
+            report(0), cancel
+        )
+        changed = []
+        for (mat, requirements, stock), j in pending.items():
+            warm_start = base[j]['allocation'] if base[j]['status'] == "Optimal" else None
+            changed.append((mat, list(requirements), list(stock), locations, sizes, warm_start))
+        solved = dict(zip(pending, solver.solve_blocks(changed, report(len(base)), cancel)))
+    except SolveCancelled:
+        return {'cancelled': True}
+
+    def summarize(blocks, scenario):
+        statuses = [block['status'] for block in blocks if block['status'] != "Optimal"]
+        total_containers = None
+        if not statuses:
+            total_containers = sum(sum(block['allocation']) for block in blocks)
+        return {
+            'scenario': scenario,
+            'status': statuses[0] if statuses else "Optimal",
+            'total_containers': total_containers
+        }
+
+    base_row = summarize(base, {})
+    rows = [
+        summarize([solved.get(signature, base[j]) for j, signature in enumerate(signatures)],
+                  scenario)
+        for scenario, signatures in zip(scenarios, scenario_signatures)
+    ]
+
+    for row in [base_row] + rows:
+        row['delta'] = None
+        if row['total_containers'] is not None and base_row['total_containers'] is not None:
+            row['delta'] = row['total_containers'] - base_row['total_containers']
+
+    parameters = list(dict.fromkeys(key for scenario in scenarios for key in scenario))
+    return {'base': base_row, 'rows': rows, 'parameters': parameters}
+
+
+def scenario_table(sweep):
+    """Headers and rows of a solve_scenarios result, ready for tabulate"""
+    parameters = sweep['parameters']
+    headers = [describe_parameter(key) for key in parameters] + ["Containers", "Change", "Status"]
+    rows = []
+    for row in sweep['rows']:
+        containers = row['total_containers']
+        delta = row['delta']
+        rows.append(
+            [row['scenario'].get(key, "") for key in parameters]
+            + ["-" if containers is None else containers,
+               "-" if delta is None else f"{delta:+d}",
+               row['status']]
+        )
+    return headers, rows
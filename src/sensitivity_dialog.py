@@ -0,0 +1,248 @@
+"""
+Sensitivity Dialog
+What-if analysis window: varies one or two stock or requirement values and
+tabulates the container totals
+"""
+
+import queue
+import re
+import threading
+import tkinter as tk
+from tkinter import ttk, messagebox
+
+from tabulate import tabulate
+
+from cbc_runner import CancelToken
+from scenarios import (offset_values, parameter_grid, requirement_parameter, scenario_table,
+                       solve_scenarios, stock_parameter)
+from solver import ContainerSolver
+
+
+PARAMETER_KINDS = ["Stock", "Requirement"]
+
+
+class ParameterRow:
+    """Controls choosing one scenario parameter and the offsets to try"""
+
+    def __init__(self, parent, problem, offsets):
+        self.problem = problem
+        self.frame = ttk.Frame(parent)
+
+        self.kind_var = tk.StringVar(value=PARAMETER_KINDS[0])
+        self.material_var = tk.StringVar(value=problem.materials[0])
+        self.target_var = tk.StringVar()
+        self.offsets_var = tk.StringVar(value=offsets)
+
+        kind = ttk.Combobox(self.frame, textvariable=self.kind_var, values=PARAMETER_KINDS,
+                            state='readonly', width=12)
+        kind.pack(side=tk.LEFT, padx=(0, 5))
+        kind.bind("<<ComboboxSelected>>", lambda e: self._update_targets())
+        ttk.Combobox(self.frame, textvariable=self.material_var, values=problem.materials,
+                     state='readonly', width=16).pack(side=tk.LEFT, padx=(0, 5))
+        self.target = ttk.Combobox(self.frame, textvariable=self.target_var, state='readonly',
+                                   width=16)
+        self.target.pack(side=tk.LEFT, padx=(0, 10))
+        ttk.Label(self.frame, text="Offsets:").pack(side=tk.LEFT)
+        ttk.Entry(self.frame, textvariable=self.offsets_var, width=18).pack(side=tk.LEFT,
+                                                                          padx=(5, 0))
+        self._update_targets()
+
+    def _update_targets(self):
+        """Offer sizes for stock and locations for requirements"""
+        if self.kind_var.get() == "Stock":
+            values = [f"{size}-SCU" for size in self.problem.sizes]
+        else:
+            values = list(self.problem.locations)
+        self.target.configure(values=values)
+        self.target_var.set(values[0] if values else "")
+
+    def key(self):
+        """Scenario key of the chosen parameter"""
+        if self.kind_var.get() == "Stock":
+            return stock_parameter(self.material_var.get(),
+                                   int(self.target_var.get().split("-")[0]))
+        return requirement_parameter(self.target_var.get(), self.material_var.get())
+
+    def values(self):
+        """
+        Absolute values to try, from the offsets to the current value
+
+        Raises:
+            ValueError: If the offsets are not whole numbers
+        """
+        try:
+            offsets = [int(part) for part in re.split(r"[,\s]+", self.offsets_var.get().strip())
+                       if part]
+        except ValueError:
+            raise ValueError("Offsets must be whole numbers, e.g. -2 0 2")
+        if not offsets:
+            raise ValueError("Enter at least one offset, e.g. -2 0 2")
+        # Offsets that clamp to the same value would only repeat a scenario
+        return list(dict.fromkeys(offset_values(self.problem, self.key(), offsets)))
+
+
+class SensitivityDialog:
+    """Non-modal window running what-if sweeps on the current inputs"""
+
+    def __init__(self, parent, problem, workers=1):
+        """
+        Args:
+            parent: Parent window
+            problem: AllocationProblem with the current grid values
+            workers: Worker processes for the sweep
+        """
+        self.parent = parent
+        self.problem = problem
+        self.solver = ContainerSolver(workers=workers, backend="auto", incremental=False)
+        self._thread = None
+        self._cancel = None
+        self._closed = False
+        self._running = False
+        self._lock = threading.Lock()
+        self._queue = queue.Queue()
+
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title("What-if Analysis")
+        self.dialog.geometry("760x520")
+        self.dialog.transient(parent)
+        self.dialog.protocol("WM_DELETE_WINDOW", self.close)
+
+        # Center the dialog
+        self.dialog.geometry("+%d+%d" % (parent.winfo_rootx() + 50, parent.winfo_rooty() + 50))
+
+        self.create_widgets()
+
+    def create_widgets(self):
+        """Build the parameter rows, buttons and result table"""
+        main_frame = ttk.Frame(self.dialog)
+        main_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+
+        ttk.Label(main_frame, text="Vary stock or requirements and compare container totals",
+                  font=('TkDefaultFont', 10, 'bold')).pack(anchor=tk.W, pady=(0, 10))
+
+        self.first = ParameterRow(main_frame, self.problem, "-2 -1 0 1 2")
+        self.first.frame.pack(fill=tk.X, pady=(0, 5))
+
+        self.second_enabled = tk.BooleanVar(value=False)
+        ttk.Checkbutton(main_frame, text="Also vary", variable=self.second_enabled).pack(
+            anchor=tk.W)
+        self.second = ParameterRow(main_frame, self.problem, "0 2")
+        self.second.frame.pack(fill=tk.X, pady=(0, 10))
+
+        button_frame = ttk.Frame(main_frame)
+        button_frame.pack(fill=tk.X)
+        self.run_button = ttk.Button(button_frame, text="Run", command=self.run)
+        self.run_button.pack(side=tk.LEFT)
+        self.cancel_button = ttk.Button(button_frame, text="Cancel", command=self.cancel)
+        self.cancel_button.pack(side=tk.LEFT, padx=(10, 0))
+        self.cancel_button.state(['disabled'])
+        self.status_var = tk.StringVar(value="")
+        ttk.Label(button_frame, textvariable=self.status_var).pack(side=tk.LEFT, padx=(10, 0))
+
+        text_frame = ttk.Frame(main_frame)
+        text_frame.pack(fill=tk.BOTH, expand=True, pady=(10, 0))
+        self.output = tk.Text(text_frame, height=15, font=('Consolas', 10), wrap=tk.NONE)
+        scrollbar = ttk.Scrollbar(text_frame, orient=tk.VERTICAL, command=self.output.yview)
+        self.output.configure(yscrollcommand=scrollbar.set)
+        self.output.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+    def run(self):
+        """Start the sweep on a background thread"""
+        if self._thread is not None:
+            return
+        try:
+            parameters = {self.first.key(): self.first.values()}
+            if self.second_enabled.get():
+                if self.second.key() in parameters:
+                    raise ValueError("Choose two different parameters")
+                parameters[self.second.key()] = self.second.values()
+        except ValueError as e:
+            messagebox.showerror("What-if Analysis", str(e), parent=self.dialog)
+            return
+
+        scenarios = parameter_grid(parameters)
+        self._cancel = CancelToken()
+        self._running = True
+        self.run_button.state(['disabled'])
+        self.cancel_button.state(['!disabled'])
+        self.status_var.set(f"Solving {len(scenarios)} scenarios...")
+        self._thread = threading.Thread(target=self._sweep_worker, args=(scenarios,),
+                                        daemon=True)
+        self._thread.start()
+        self.dialog.after(50, self._poll)
+
+    def cancel(self):
+        """Cancel the running sweep"""
+        if self._cancel is not None:
+            self._cancel.cancel()
+            self.status_var.set("Cancelling...")
+
+    def close(self):
+        """Cancel any sweep and close the window"""
+        self.cancel()
+        with self._lock:
+            self._closed = True
+            running = self._running
+        if not running:
+            self.solver.close()
+        self.dialog.destroy()
+
+    def _sweep_worker(self, scenarios):
+        """Run the sweep off the Tk thread and queue the outcome"""
+        def report_progress(done, total):
+            self._queue.put(('progress', (done, total)))
+
+        try:
+            sweep = solve_scenarios(self.solver, self.problem, scenarios, report_progress,
+                                    self._cancel)
+            self._queue.put(('result', sweep))
+        except Exception as e:
+            self._queue.put(('error', e))
+        finally:
+            with self._lock:
+                self._running = False
+                closed = self._closed
+            if closed:
+                # The window went away while solving
+                self.solver.close()
+
+    def _poll(self):
+        """Handle messages from the sweep thread; reschedules itself until done"""
+        if not self.dialog.winfo_exists():
+            return
+        try:
+            while True:
+                kind, payload = self._queue.get_nowait()
+                if kind == 'progress':
+                    self.status_var.set(f"Solving... {payload[0]}/{payload[1]} blocks")
+                    continue
+
+                self._thread = None
+                self._cancel = None
+                self.run_button.state(['!disabled'])
+                self.cancel_button.state(['disabled'])
+                if kind == 'error':
+                    self.status_var.set("Error occurred")
+                    messagebox.showerror("What-if Analysis", str(payload), parent=self.dialog)
+                elif payload.get('cancelled'):
+                    self.status_var.set("Cancelled")
+                else:
+                    self._show_sweep(payload)
+                return
+        except queue.Empty:
+            self.dialog.after(50, self._poll)
+
+    def _show_sweep(self, sweep):
+        """Write the result table"""
+        base = sweep['base']
+        self.output.delete(1.0, tk.END)
+        if base['total_containers'] is None:
+            self.output.insert(tk.END, f"Current inputs: {base['status']}\n\n")
+        else:
+            self.output.insert(tk.END,
+                               f"Current inputs: {base['total_containers']} containers\n\n")
+        headers, rows = scenario_table(sweep)
+        self.output.insert(tk.END, tabulate(rows, headers=headers, tablefmt="fancy_grid",
+                                            numalign="center"))
+        self.status_var.set(f"{len(rows)} scenarios solved")
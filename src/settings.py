@@ -1,46 +1,126 @@
 import json
 import os
+import threading
 from pathlib import Path
-import tkinter as tk
-from tkinter import messagebox, filedialog
+
+from objectives import DEFAULT_OBJECTIVES, normalize_objectives
+from persistence import atomic_write, file_state, get_writer
 
 
 class SettingsManager:
     """Manages application settings including configuration folder location"""
     
-    def __init__(self):
+    def __init__(self, writer=None):
+        """
+        Args:
+            writer: BackgroundWriter saving the settings; defaults to the
+                shared one
+        """
         self.settings_file = Path.home() / ".container_allocator_settings.json"
+        self.writer = writer or get_writer()
+        # Guards the merge with the file against concurrent saves
+        self._lock = threading.Lock()
+        # Settings as last read from or written to the file, to tell our
+        # changes from those of another running instance
+        self._synced = {}
+        self._file_state = None
         self.settings = self.load_settings()
     
     def load_settings(self):
         """Load settings from file or create default settings"""
         default_settings = {
             "config_folder": None,
-            "last_config": None
+            "last_config": None,
+            "solver_workers": 1,
+            "solve_cache_size": 128,
+            "persist_solve_cache": False,
+            "compress_configs": False,
+            "write_timing_trace": False,
+            "objectives": list(DEFAULT_OBJECTIVES),
+            "reserve_sizes": []
         }
         
-        if self.settings_file.exists():
+        self._file_state = file_state(self.settings_file)
+        if self._file_state is not None:
             try:
-                with open(self.settings_file, 'r') as f:
-                    settings = json.load(f)
-                    # Merge with defaults to handle new settings
-                    default_settings.update(settings)
-                    return default_settings
+                settings = self._read_file()
+                # Merge with defaults to handle new settings
+                default_settings.update(settings)
             except Exception as e:
                 print(f"Error loading settings: {e}")
-                return default_settings
         
+        self._synced = dict(default_settings)
         return default_settings
     
+    def _read_file(self):
+        with open(self.settings_file, 'r') as f:
+            return json.load(f)
+    
     def save_settings(self):
-        """Save current settings to file"""
+        """
+        Save current settings to file
+        
+        The write happens on the background writer shortly after, together
+        with any other changes made meanwhile. Call flush() to wait for it.
+        """
+        self.writer.submit(self.settings_file, self._write_settings)
+        return True
+    
+    def flush(self):
+        """Wait until pending settings are written"""
+        return self.writer.flush()
+    
+    def _write_settings(self):
+        """Write the settings atomically, keeping changes another instance saved meanwhile"""
+        with self._lock:
+            settings = dict(self.settings)
+            if file_state(self.settings_file) != self._file_state:
+                self._merge_file(settings)
+            atomic_write(self.settings_file, json.dumps(settings, indent=2).encode('utf-8'))
+            self._file_state = file_state(self.settings_file)
+            self._synced = settings
+    
+    def _merge_file(self, settings):
+        """
+        Take the file's value for every setting this instance did not change
+        
+        Returns:
+            Names of the settings taken from the file
+        """
         try:
-            with open(self.settings_file, 'w') as f:
-                json.dump(self.settings, f, indent=2)
-            return True
+            on_disk = self._read_file()
         except Exception as e:
-            print(f"Error saving settings: {e}")
-            return False
+            print(f"Error loading settings: {e}")
+            return []
+        changed = []
+        for key, value in on_disk.items():
+            ours = self._synced.get(key)
+            if settings.get(key) == ours and value != ours:
+                settings[key] = value
+                self.settings[key] = value
+                changed.append(key)
+        return changed
+    
+    def reload_if_changed(self):
+        """
+        Pick up settings another running instance saved
+        
+        Settings changed here and not written yet take precedence.
+        
+        Returns:
+            Names of the settings that changed
+        """
+        if self.writer.pending(self.settings_file):
+            # The pending write merges the file itself
+            return []
+        with self._lock:
+            state = file_state(self.settings_file)
+            if state == self._file_state:
+                return []
+            changed = self._merge_file(dict(self.settings))
+            self._file_state = state
+            self._synced = dict(self.settings)
+            return changed
     
     def get_config_folder(self):
         """Get the configured folder for saving/loading configurations"""
@@ -51,6 +131,66 @@ class SettingsManager:
         self.settings["config_folder"] = str(folder_path) if folder_path else None
         return self.save_settings()
     
+    def get_solver_workers(self):
+        """Get the number of worker processes used by the solver"""
+        try:
+            return max(1, int(self.settings.get("solver_workers") or 1))
+        except (TypeError, ValueError):
+            return 1
+    
+    def set_solver_workers(self, workers):
+        """Set the number of worker processes used by the solver"""
+        self.settings["solver_workers"] = max(1, int(workers))
+        return self.save_settings()
+    
+    def get_objectives(self):
+        """Get the solver objective stack, falling back to the default if it is invalid"""
+        try:
+            return normalize_objectives(self.settings.get("objectives"))
+        except (TypeError, ValueError):
+            return DEFAULT_OBJECTIVES
+    
+    def set_objectives(self, objectives):
+        """Set the solver objective stack"""
+        self.settings["objectives"] = list(normalize_objectives(objectives))
+        return self.save_settings()
+    
+    def get_reserve_sizes(self):
+        """Get the container sizes the solver keeps in reserve"""
+        try:
+            return tuple(sorted({int(size) for size in self.settings.get("reserve_sizes") or []}))
+        except (TypeError, ValueError):
+            return ()
+    
+    def set_reserve_sizes(self, sizes):
+        """Set the container sizes the solver keeps in reserve"""
+        self.settings["reserve_sizes"] = sorted({int(size) for size in sizes})
+        return self.save_settings()
+    
+    def get_solve_cache_size(self):
+        """Get the number of solver results kept in memory"""
+        try:
+            return max(1, int(self.settings.get("solve_cache_size") or 128))
+        except (TypeError, ValueError):
+            return 128
+    
+    def get_compress_configs(self):
+        """Get whether saved configurations are gzip-compressed"""
+        return bool(self.settings.get("compress_configs"))
+    
+    def get_solve_cache_folder(self):
+        """Get the on-disk solve cache folder, or None if results are not persisted"""
+        config_folder = self.get_config_folder()
+        if not config_folder or not self.settings.get("persist_solve_cache"):
+            return None
+        return Path(config_folder) / ".solve_cache"
+    
+    def get_timing_trace_file(self):
+        """Get the JSON lines file calculate timings are appended to, or None if disabled"""
+        if not self.settings.get("write_timing_trace"):
+            return None
+        return self.settings_file.with_name(".container_allocator_trace.jsonl")
+    
     def get_last_config(self):
         """Get the last used configuration file"""
         return self.settings.get("last_config")
@@ -62,6 +202,10 @@ class SettingsManager:
     
     def setup_config_folder(self, parent_window):
         """Interactive setup of configuration folder"""
+        # Tk is only imported for the interactive parts so headless tools
+        # (command line, batch runner) can use the settings without it
+        from tkinter import messagebox, filedialog
+        
         result = messagebox.askyesno(
             "Configuration Folder Setup",
             "Would you like to set up a folder for storing your container configurations?\n\n"
@@ -104,129 +248,6 @@ class SettingsManager:
     
     def show_settings_dialog(self, parent_window):
         """Show settings configuration dialog"""
+        from settings_dialog import SettingsDialog
         dialog = SettingsDialog(parent_window, self)
         return dialog.result
-
-
-class SettingsDialog:
-    """Dialog for configuring application settings"""
-    
-    def __init__(self, parent, settings_manager):
-        self.parent = parent
-        self.settings_manager = settings_manager
-        self.result = None
-        
-        self.dialog = tk.Toplevel(parent)
-        self.dialog.title("Settings")
-        self.dialog.geometry("500x300")
-        self.dialog.resizable(False, False)
-        self.dialog.transient(parent)
-        self.dialog.grab_set()
-        
-        # Center the dialog
-        self.dialog.geometry("+%d+%d" % (
-            parent.winfo_rootx() + 50,
-            parent.winfo_rooty() + 50
-        ))
-        
-        self.create_widgets()
-        
-        # Wait for dialog to close
-        self.dialog.wait_window()
-    
-    def create_widgets(self):
-        """Create the settings dialog widgets"""
-        main_frame = tk.Frame(self.dialog, padx=20, pady=20)
-        main_frame.pack(fill=tk.BOTH, expand=True)
-        
-        # Title
-        title_label = tk.Label(main_frame, text="Container Allocator Settings", 
-                              font=("Arial", 14, "bold"))
-        title_label.pack(pady=(0, 20))
-        
-        # Configuration folder section
-        config_frame = tk.LabelFrame(main_frame, text="Configuration Folder", padx=10, pady=10)
-        config_frame.pack(fill=tk.X, pady=(0, 20))
-        
-        current_folder = self.settings_manager.get_config_folder()
-        if current_folder:
-            folder_text = f"Current: {current_folder}"
-        else:
-            folder_text = "No folder configured"
-        
-        self.folder_label = tk.Label(config_frame, text=folder_text, wraplength=400, justify=tk.LEFT)
-        self.folder_label.pack(anchor=tk.W, pady=(0, 10))
-        
-        button_frame = tk.Frame(config_frame)
-        button_frame.pack(fill=tk.X)
-        
-        tk.Button(button_frame, text="Change Folder", 
-                 command=self.change_folder).pack(side=tk.LEFT, padx=(0, 10))
-        
-        if current_folder:
-            tk.Button(button_frame, text="Clear Folder", 
-                     command=self.clear_folder).pack(side=tk.LEFT)
-        
-        # Info section
-        info_frame = tk.LabelFrame(main_frame, text="Information", padx=10, pady=10)
-        info_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 20))
-        
-        info_text = (
-            "• Configuration folder: Where your saved configurations are stored\n"
-            "• When set, Save/Load will use a simple dialog instead of file browser\n"
-            "• Settings are automatically saved between sessions"
-        )
-        
-        tk.Label(info_frame, text=info_text, justify=tk.LEFT, wraplength=400).pack(anchor=tk.W)
-        
-        # Buttons
-        button_frame = tk.Frame(main_frame)
-        button_frame.pack(fill=tk.X)
-        
-        tk.Button(button_frame, text="Close", command=self.close_dialog).pack(side=tk.RIGHT)
-    
-    def change_folder(self):
-        """Change the configuration folder"""
-        folder_path = filedialog.askdirectory(
-            title="Select Configuration Folder",
-            initialdir=self.settings_manager.get_config_folder(),
-            parent=self.dialog
-        )
-        
-        if folder_path:
-            try:
-                os.makedirs(folder_path, exist_ok=True)
-                self.settings_manager.set_config_folder(folder_path)
-                self.folder_label.config(text=f"Current: {folder_path}")
-                self.result = "changed"
-                
-                messagebox.showinfo(
-                    "Folder Updated",
-                    f"Configuration folder updated to:\n{folder_path}",
-                    parent=self.dialog
-                )
-                
-            except Exception as e:
-                messagebox.showerror(
-                    "Error",
-                    f"Could not set folder:\n{e}",
-                    parent=self.dialog
-                )
-    
-    def clear_folder(self):
-        """Clear the configuration folder setting"""
-        result = messagebox.askyesno(
-            "Clear Folder",
-            "Are you sure you want to clear the configuration folder?\n\n"
-            "Save/Load will use the file browser again.",
-            parent=self.dialog
-        )
-        
-        if result:
-            self.settings_manager.set_config_folder(None)
-            self.folder_label.config(text="No folder configured")
-            self.result = "cleared"
-    
-    def close_dialog(self):
-        """Close the settings dialog"""
-        self.dialog.destroy()
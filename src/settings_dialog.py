@@ -0,0 +1,240 @@
+import os
+import re
+import tkinter as tk
+from tkinter import messagebox, filedialog
+
+from objectives import OBJECTIVES
+
+
+class SettingsDialog:
+    """Dialog for configuring application settings"""
+    
+    def __init__(self, parent, settings_manager):
+        self.parent = parent
+        self.settings_manager = settings_manager
+        self.result = None
+        
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title("Settings")
+        self.dialog.geometry("500x670")
+        self.dialog.resizable(False, False)
+        self.dialog.transient(parent)
+        self.dialog.grab_set()
+        
+        # Center the dialog
+        self.dialog.geometry("+%d+%d" % (
+            parent.winfo_rootx() + 50,
+            parent.winfo_rooty() + 50
+        ))
+        
+        self.create_widgets()
+        
+        # Wait for dialog to close
+        self.dialog.wait_window()
+    
+    def create_widgets(self):
+        """Create the settings dialog widgets"""
+        main_frame = tk.Frame(self.dialog, padx=20, pady=20)
+        main_frame.pack(fill=tk.BOTH, expand=True)
+        
+        # Title
+        title_label = tk.Label(main_frame, text="Container Allocator Settings", 
+                              font=("Arial", 14, "bold"))
+        title_label.pack(pady=(0, 20))
+        
+        # Configuration folder section
+        config_frame = tk.LabelFrame(main_frame, text="Configuration Folder", padx=10, pady=10)
+        config_frame.pack(fill=tk.X, pady=(0, 20))
+        
+        current_folder = self.settings_manager.get_config_folder()
+        if current_folder:
+            folder_text = f"Current: {current_folder}"
+        else:
+            folder_text = "No folder configured"
+        
+        self.folder_label = tk.Label(config_frame, text=folder_text, wraplength=400, justify=tk.LEFT)
+        self.folder_label.pack(anchor=tk.W, pady=(0, 10))
+        
+        button_frame = tk.Frame(config_frame)
+        button_frame.pack(fill=tk.X)
+        
+        tk.Button(button_frame, text="Change Folder", 
+                 command=self.change_folder).pack(side=tk.LEFT, padx=(0, 10))
+        
+        if current_folder:
+            tk.Button(button_frame, text="Clear Folder", 
+                     command=self.clear_folder).pack(side=tk.LEFT)
+        
+        self.compress_var = tk.BooleanVar(value=self.settings_manager.get_compress_configs())
+        tk.Checkbutton(config_frame, text="Compress saved configurations",
+                       variable=self.compress_var,
+                       command=self.change_compress).pack(anchor=tk.W, pady=(10, 0))
+        
+        # Solver section
+        solver_frame = tk.LabelFrame(main_frame, text="Solver", padx=10, pady=10)
+        solver_frame.pack(fill=tk.X, pady=(0, 20))
+        
+        tk.Label(solver_frame, text="Worker processes:").pack(side=tk.LEFT)
+        self.workers_var = tk.IntVar(value=self.settings_manager.get_solver_workers())
+        workers_box = tk.Spinbox(solver_frame, from_=1, to=max(os.cpu_count() or 1, 1), width=5,
+                                 textvariable=self.workers_var, command=self.change_workers)
+        workers_box.pack(side=tk.LEFT, padx=(10, 0))
+        # The arrows run the command, a typed count is stored on leaving the box
+        workers_box.bind("<FocusOut>", lambda e: self.change_workers())
+        workers_box.bind("<Return>", lambda e: self.change_workers())
+        
+        self.persist_cache_var = tk.BooleanVar(
+            value=bool(self.settings_manager.settings.get("persist_solve_cache")))
+        tk.Checkbutton(solver_frame, text="Keep solved results in config folder",
+                       variable=self.persist_cache_var,
+                       command=self.change_persist_cache).pack(side=tk.LEFT, padx=(20, 0))
+        
+        # Plan preferences section: tie-breakers after the fewest containers
+        objectives_frame = tk.LabelFrame(main_frame, text="Plan Preferences", padx=10, pady=10)
+        objectives_frame.pack(fill=tk.X, pady=(0, 20))
+        
+        objectives = self.settings_manager.get_objectives()
+        self.objective_vars = {}
+        for name, label in OBJECTIVES.items():
+            if name == "containers":
+                continue
+            self.objective_vars[name] = tk.BooleanVar(value=name in objectives)
+            tk.Checkbutton(objectives_frame, text=label, variable=self.objective_vars[name],
+                           command=self.change_objectives).pack(anchor=tk.W)
+        
+        reserve_frame = tk.Frame(objectives_frame)
+        reserve_frame.pack(fill=tk.X, pady=(5, 0))
+        tk.Label(reserve_frame, text="Reserve sizes (SCU):").pack(side=tk.LEFT)
+        self.reserve_var = tk.StringVar(
+            value=" ".join(str(size) for size in self.settings_manager.get_reserve_sizes()))
+        reserve_entry = tk.Entry(reserve_frame, textvariable=self.reserve_var, width=15)
+        reserve_entry.pack(side=tk.LEFT, padx=(10, 0))
+        reserve_entry.bind("<FocusOut>", lambda e: self.change_reserve_sizes())
+        reserve_entry.bind("<Return>", lambda e: self.change_reserve_sizes())
+        
+        # Diagnostics section
+        diagnostics_frame = tk.LabelFrame(main_frame, text="Diagnostics", padx=10, pady=10)
+        diagnostics_frame.pack(fill=tk.X, pady=(0, 20))
+        
+        self.timing_trace_var = tk.BooleanVar(
+            value=bool(self.settings_manager.settings.get("write_timing_trace")))
+        tk.Checkbutton(diagnostics_frame, text="Write a timing trace of every calculation",
+                       variable=self.timing_trace_var,
+                       command=self.change_timing_trace).pack(side=tk.LEFT)
+        
+        # Info section
+        info_frame = tk.LabelFrame(main_frame, text="Information", padx=10, pady=10)
+        info_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 20))
+        
+        info_text = (
+            "• Configuration folder: Where your saved configurations are stored\n"
+            "• When set, Save/Load will use a simple dialog instead of file browser\n"
+            "• Worker processes: Solve materials in parallel on multi-core machines\n"
+            "• Solved results are cached so repeated manifests return instantly\n"
+            "• Plan preferences only choose between plans with the fewest containers\n"
+            "• Timing traces are written to .container_allocator_trace.jsonl in your home folder\n"
+            "• Settings are automatically saved between sessions"
+        )
+        
+        tk.Label(info_frame, text=info_text, justify=tk.LEFT, wraplength=400).pack(anchor=tk.W)
+        
+        # Buttons
+        button_frame = tk.Frame(main_frame)
+        button_frame.pack(fill=tk.X)
+        
+        tk.Button(button_frame, text="Close", command=self.close_dialog).pack(side=tk.RIGHT)
+    
+    def change_folder(self):
+        """Change the configuration folder"""
+        folder_path = filedialog.askdirectory(
+            title="Select Configuration Folder",
+            initialdir=self.settings_manager.get_config_folder(),
+            parent=self.dialog
+        )
+        
+        if folder_path:
+            try:
+                os.makedirs(folder_path, exist_ok=True)
+                self.settings_manager.set_config_folder(folder_path)
+                self.folder_label.config(text=f"Current: {folder_path}")
+                self.result = "changed"
+                
+                messagebox.showinfo(
+                    "Folder Updated",
+                    f"Configuration folder updated to:\n{folder_path}",
+                    parent=self.dialog
+                )
+                
+            except Exception as e:
+                messagebox.showerror(
+                    "Error",
+                    f"Could not set folder:\n{e}",
+                    parent=self.dialog
+                )
+    
+    def change_workers(self):
+        """Store the solver worker count"""
+        try:
+            workers = self.workers_var.get()
+        except (tk.TclError, ValueError):
+            return
+        if workers != self.settings_manager.get_solver_workers():
+            self.settings_manager.set_solver_workers(workers)
+            self.result = "changed"
+    
+    def change_objectives(self):
+        """Store the objective stack: fewest containers first, then the checked preferences"""
+        objectives = ["containers"] + [name for name, var in self.objective_vars.items()
+                                       if var.get()]
+        self.settings_manager.set_objectives(objectives)
+        self.result = "changed"
+    
+    def change_reserve_sizes(self):
+        """Store the reserve sizes typed into the entry"""
+        try:
+            sizes = [int(part) for part in re.split(r"[,\s]+", self.reserve_var.get().strip())
+                     if part]
+        except ValueError:
+            messagebox.showerror("Error", "Reserve sizes must be whole numbers, e.g. 24 32",
+                                 parent=self.dialog)
+            return
+        if list(self.settings_manager.get_reserve_sizes()) != sorted(set(sizes)):
+            self.settings_manager.set_reserve_sizes(sizes)
+            self.result = "changed"
+    
+    def change_persist_cache(self):
+        """Store whether solver results are persisted"""
+        self.settings_manager.settings["persist_solve_cache"] = self.persist_cache_var.get()
+        self.settings_manager.save_settings()
+        self.result = "changed"
+    
+    def change_compress(self):
+        """Store whether saved configurations are gzip-compressed"""
+        self.settings_manager.settings["compress_configs"] = self.compress_var.get()
+        self.settings_manager.save_settings()
+    
+    def change_timing_trace(self):
+        """Store whether calculate timings are written to the trace file"""
+        self.settings_manager.settings["write_timing_trace"] = self.timing_trace_var.get()
+        self.settings_manager.save_settings()
+        self.result = "changed"
+    
+    def clear_folder(self):
+        """Clear the configuration folder setting"""
+        result = messagebox.askyesno(
+            "Clear Folder",
+            "Are you sure you want to clear the configuration folder?\n\n"
+            "Save/Load will use the file browser again.",
+            parent=self.dialog
+        )
+        
+        if result:
+            self.settings_manager.set_config_folder(None)
+            self.folder_label.config(text="No folder configured")
+            self.result = "cleared"
+    
+    def close_dialog(self):
+        """Close the settings dialog"""
+        self.change_workers()
+        self.change_reserve_sizes()
+        self.dialog.destroy()
@@ -1,8 +1,13 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog
+import datetime
 import os
+import queue
+import threading
 from pathlib import Path
 
+from config_search import get_search_index
+
 
 class SimpleConfigDialogs:
     """Simplified configuration dialogs - text input for save, list for load"""
@@ -45,7 +50,7 @@ class SimpleConfigDialogs:
     
     @staticmethod
     def load_config_dialog(parent, settings_manager):
-        """Simple list dialog for loading configuration"""
+        """Filterable list dialog for loading configuration"""
         config_folder = settings_manager.get_config_folder()
         if not config_folder:
             return None
@@ -59,37 +64,39 @@ class SimpleConfigDialogs:
             )
             return None
         
-        # Get all .json files
-        json_files = list(config_folder_path.glob("*.json"))
-        if not json_files:
-            messagebox.showinfo(
-                "No Configurations",
-                "No saved configurations found in the folder.",
-                parent=parent
-            )
-            return None
-        
-        # Sort by modification time (newest first)
-        json_files.sort(key=lambda x: x.stat().st_mtime, reverse=True)
-        
-        # Create simple selection dialog
-        dialog = SimpleLoadDialog(parent, json_files, settings_manager)
+        # The catalog lists the folder without opening every file
+        dialog = SimpleLoadDialog(parent, get_search_index(config_folder_path), settings_manager)
         return dialog.result
 
 
 class SimpleLoadDialog:
-    """Simple dialog for selecting a configuration to load"""
+    """Dialog for selecting a configuration to load from the folder catalog"""
+    
+    # Rows inserted into the list per batch while scrolling
+    ROW_CHUNK = 200
     
-    def __init__(self, parent, json_files, settings_manager):
+    # Delay after the last keystroke before the list is filtered
+    FILTER_DELAY_MS = 150
+    
+    def __init__(self, parent, search_index, settings_manager):
         self.parent = parent
-        self.json_files = json_files
+        self.search_index = search_index
+        self.catalog = search_index.catalog
         self.settings_manager = settings_manager
         self.result = None
+        # Catalog entries newest first, and the ones matching the search
+        self._entries = []
+        self._shown = []
+        self._inserted = 0
+        self._loading_rows = False
+        self._filter_job = None
+        self._refresh_thread = None
+        self._queue = queue.Queue()
         
         self.dialog = tk.Toplevel(parent)
         self.dialog.title("Load Configuration")
-        self.dialog.geometry("400x300")
-        self.dialog.resizable(False, True)
+        self.dialog.geometry("640x420")
+        self.dialog.resizable(True, True)
         self.dialog.transient(parent)
         self.dialog.grab_set()
         
@@ -100,6 +107,9 @@ class SimpleLoadDialog:
         ))
         
         self.create_widgets()
+        # Show the stored index right away and bring it up to date in the background
+        self._show_entries(self.catalog.sorted_entries())
+        self.refresh()
         
         # Wait for dialog to close
         self.dialog.wait_window()
@@ -114,35 +124,41 @@ class SimpleLoadDialog:
                               font=("Arial", 12, "bold"))
         title_label.pack(anchor=tk.W, pady=(0, 10))
         
-        # List frame with scrollbar
-        list_frame = tk.Frame(main_frame)
-        list_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 20))
-        
-        scrollbar = tk.Scrollbar(list_frame)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        
-        self.config_listbox = tk.Listbox(list_frame, yscrollcommand=scrollbar.set, font=("Arial", 10))
-        self.config_listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.config(command=self.config_listbox.yview)
+        # Search by name, material, location or amount
+        filter_frame = tk.Frame(main_frame)
+        filter_frame.pack(fill=tk.X, pady=(0, 5))
+        tk.Label(filter_frame, text="Search:").pack(side=tk.LEFT)
+        self.filter_var = tk.StringVar()
+        filter_entry = ttk.Entry(filter_frame, textvariable=self.filter_var)
+        filter_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(5, 0))
+        filter_entry.focus()
+        self.filter_var.trace_add("write", lambda *args: self._schedule_filter())
         
-        # Populate list
-        for json_file in self.json_files:
-            # Display name without .json extension
-            display_name = json_file.stem
-            
-            # Add modification time
-            mtime = json_file.stat().st_mtime
-            import datetime
-            mod_time = datetime.datetime.fromtimestamp(mtime).strftime("%m/%d %H:%M")
-            
-            self.config_listbox.insert(tk.END, f"{display_name} ({mod_time})")
+        # List frame with scrollbar, filled in chunks as the user scrolls
+        list_frame = tk.Frame(main_frame)
+        list_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 5))
         
-        # Select first item by default
-        if self.json_files:
-            self.config_listbox.selection_set(0)
+        columns = ("name", "modified", "materials", "locations", "size")
+        self.config_list = ttk.Treeview(list_frame, columns=columns, show='headings',
+                                        selectmode='browse')
+        for column, heading, width in zip(columns,
+                                          ("Name", "Modified", "Materials", "Locations", "Size"),
+                                          (220, 110, 70, 70, 70)):
+            self.config_list.heading(column, text=heading)
+            self.config_list.column(column, width=width, anchor=tk.W if column == "name" else 'center')
+        self._scrollbar = ttk.Scrollbar(list_frame, orient=tk.VERTICAL,
+                                        command=self.config_list.yview)
+        self.config_list.configure(yscrollcommand=self._on_list_scroll)
+        self._scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.config_list.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         
         # Double-click to load
-        self.config_listbox.bind("<Double-Button-1>", lambda e: self.load_selected())
+        self.config_list.bind("<Double-Button-1>", lambda e: self.load_selected())
+        self.config_list.bind("<Return>", lambda e: self.load_selected())
+        
+        self.status_var = tk.StringVar(value="")
+        tk.Label(main_frame, textvariable=self.status_var, fg="gray").pack(anchor=tk.W,
+                                                                           pady=(0, 10))
         
         # Buttons
         button_frame = tk.Frame(main_frame)
@@ -153,17 +169,124 @@ class SimpleLoadDialog:
         tk.Button(button_frame, text="Cancel", command=self.cancel).pack(side=tk.RIGHT)
         tk.Button(button_frame, text="Delete", command=self.delete_selected, 
                  bg="#f44336", fg="white").pack(side=tk.LEFT)
+        tk.Button(button_frame, text="Refresh",
+                  command=lambda: self.refresh(force=True)).pack(side=tk.LEFT, padx=(10, 0))
+    
+    def refresh(self, force=False):
+        """Update the catalog and search index on a background thread"""
+        if self._refresh_thread is not None:
+            return
+        self.status_var.set("Scanning configuration folder...")
+        self._refresh_thread = threading.Thread(target=self._refresh_worker, args=(force,),
+                                                daemon=True)
+        self._refresh_thread.start()
+        self.dialog.after(50, self._poll_refresh)
+    
+    def _refresh_worker(self, force):
+        """Scan the folder off the Tk thread and queue the outcome"""
+        try:
+            changes = self.catalog.refresh(force)
+            self._queue.put(('result', any(changes.values()) | bool(self.search_index.update())))
+        except Exception as e:
+            self._queue.put(('error', e))
+    
+    def _poll_refresh(self):
+        """Show the refreshed catalog once the scan is done"""
+        if not self.dialog.winfo_exists():
+            return
+        try:
+            kind, payload = self._queue.get_nowait()
+        except queue.Empty:
+            self.dialog.after(50, self._poll_refresh)
+            return
+        self._refresh_thread = None
+        if kind == 'error':
+            messagebox.showerror("Error", f"Could not read configuration folder:\n{payload}",
+                                 parent=self.dialog)
+        if kind == 'error' or payload:
+            self._show_entries(self.catalog.sorted_entries())
+        else:
+            self._update_status()
+    
+    def _show_entries(self, entries):
+        """Replace the listed entries, keeping the search"""
+        self._entries = entries
+        self._apply_filter()
+    
+    def _schedule_filter(self):
+        """Search once typing pauses"""
+        if self._filter_job is not None:
+            self.dialog.after_cancel(self._filter_job)
+        self._filter_job = self.dialog.after(self.FILTER_DELAY_MS, self._apply_filter)
+    
+    def _apply_filter(self):
+        """Refill the list with the entries matching the search"""
+        self._filter_job = None
+        selection = self.config_list.selection()
+        text = self.filter_var.get()
+        if text.strip():
+            matches = self.search_index.search(text)
+            self._shown = [entry for entry in self._entries if entry['file'] in matches]
+        else:
+            self._shown = list(self._entries)
+        self.config_list.delete(*self.config_list.get_children())
+        self._inserted = 0
+        self._load_more_rows()
+        # Keep the selection if it is still listed, otherwise select the first row
+        if selection and self.config_list.exists(selection[0]):
+            self.config_list.selection_set(selection[0])
+        elif self._shown:
+            self.config_list.selection_set(self._shown[0]['file'])
+        self._update_status()
+    
+    def _load_more_rows(self):
+        """Insert the next chunk of rows"""
+        self._loading_rows = False
+        for entry in self._shown[self._inserted:self._inserted + self.ROW_CHUNK]:
+            modified = datetime.datetime.fromtimestamp(entry['mtime']).strftime("%m/%d %H:%M")
+            self.config_list.insert('', tk.END, iid=entry['file'], values=(
+                entry['name'], modified,
+                entry['materials'] if entry['valid'] else "-",
+                entry['locations'] if entry['valid'] else "-",
+                f"{entry['size'] / 1024:.1f} KB"
+            ))
+        self._inserted = min(len(self._shown), self._inserted + self.ROW_CHUNK)
+    
+    def _on_list_scroll(self, first, last):
+        """Forward to the scrollbar and load more rows near the end of the list"""
+        self._scrollbar.set(first, last)
+        if self._inserted < len(self._shown) and float(last) > 0.9 and not self._loading_rows:
+            self._loading_rows = True
+            self.dialog.after_idle(self._load_more_rows)
+    
+    def _update_status(self):
+        """Show how many configurations match"""
+        if self._refresh_thread is not None:
+            return
+        if not self._entries:
+            self.status_var.set("No saved configurations found in the folder.")
+        elif len(self._shown) == len(self._entries):
+            self.status_var.set(f"{len(self._entries)} configurations")
+        else:
+            self.status_var.set(f"{len(self._shown)} of {len(self._entries)} configurations match")
+    
+    def _selected_path(self):
+        """Path of the selected configuration, or None"""
+        selection = self.config_list.selection()
+        if not selection:
+            return None
+        return self.catalog.folder / selection[0]
     
     def load_selected(self):
         """Load the selected configuration"""
-        selection = self.config_listbox.curselection()
-        if not selection:
+        selected_file = self._selected_path()
+        if selected_file is None:
             messagebox.showerror("Error", "Please select a configuration to load.", parent=self.dialog)
             return
         
-        selected_file = self.json_files[selection[0]]
         if not selected_file.exists():
             messagebox.showerror("Error", "Selected configuration file does not exist.", parent=self.dialog)
+            self.refresh(force=True)
             return
         
         self.result = selected_file
@@ -172,13 +295,11 @@ class SimpleLoadDialog:
     
     def delete_selected(self):
         """Delete the selected configuration"""
-        selection = self.config_listbox.curselection()
-        if not selection:
+        selected_file = self._selected_path()
+        if selected_file is None:
             messagebox.showerror("Error", "Please select a configuration to delete.", parent=self.dialog)
             return
         
-        selected_file = self.json_files[selection[0]]
-        
         result = messagebox.askyesno(
             "Delete Configuration",
             f"Are you sure you want to delete '{selected_file.stem}'?\nThis cannot be undone.",
@@ -188,17 +309,11 @@ class SimpleLoadDialog:
         if result:
             try:
                 selected_file.unlink()
-                # Remove from list
-                index = selection[0]
-                self.config_listbox.delete(index)
-                self.json_files.pop(index)
+                self.catalog.remove_file(selected_file)
+                self._show_entries([entry for entry in self._entries
+                                    if entry['file'] != selected_file.name])
                 
                 messagebox.showinfo("Deleted", f"Configuration '{selected_file.stem}' deleted.", parent=self.dialog)
-                
-                # Close dialog if no more files
-                if not self.json_files:
-                    messagebox.showinfo("No Configurations", "No more configurations available.", parent=self.dialog)
-                    self.cancel()
                     
             except Exception as e:
                 messagebox.showerror("Error", f"Could not delete configuration:\n{e}", parent=self.dialog)
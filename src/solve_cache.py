@@ -0,0 +1,202 @@
+"""
+Solve Result Cache
+Memoizes solver results keyed on a canonical hash of the allocation instance
+"""
+
+import copy
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from pathlib import Path
+
+from persistence import atomic_write
+from problem import Allocation
+
+
+def instance_key(problem, settings=None):
+    """
+    Build a canonical hash key for an AllocationProblem
+
+    Names and sizes are sorted so the same manifest hashes identically no
+    matter in which order locations, materials or sizes were added.
+
+    Args:
+        problem: AllocationProblem instance
+        settings: Optional JSON-serializable solver settings that change the
+            result, such as a non-default objective stack
+    """
+    locations = sorted(problem.locations)
+    materials = sorted(problem.materials)
+    sizes = sorted(problem.sizes)
+
+    canonical = {
+        'locations': locations,
+        'materials': materials,
+        'sizes': sizes,
+        'requirements': [problem.requirement(loc, mat) for loc in locations for mat in materials],
+        'available': [problem.stock(mat, size) for mat in materials for size in sizes]
+    }
+    if settings is not None:
+        canonical['settings'] = settings
+    payload = json.dumps(canonical, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _copy_result(result):
+    """Copy a result so callers cannot modify the cached entry"""
+    copied = dict(result)
+    if 'allocation' in copied:
+        allocation = copied['allocation']
+        copied['allocation'] = Allocation(allocation.locations, allocation.materials,
+                                          allocation.sizes, allocation.counts)
+    for key in ('material_status', 'timings', 'presolve'):
+        if key in copied:
+            copied[key] = dict(copied[key])
+    if 'infeasible_materials' in copied:
+        copied['infeasible_materials'] = list(copied['infeasible_materials'])
+    if 'diagnosis' in copied:
+        copied['diagnosis'] = copy.deepcopy(copied['diagnosis'])
+    return copied
+
+
+def _to_json(result):
+    """Convert a result into a JSON-serializable dict"""
+    data = dict(result)
+    if 'allocation' in data:
+        allocation = data['allocation']
+        data['allocation'] = {
+            'locations': allocation.locations,
+            'materials': allocation.materials,
+            'sizes': allocation.sizes,
+            'counts': allocation.counts.tolist()
+        }
+    return data
+
+
+def _from_json(data):
+    """Rebuild a result from its JSON form"""
+    if 'allocation' in data:
+        allocation = data['allocation']
+        data['allocation'] = Allocation(allocation['locations'], allocation['materials'],
+                                        allocation['sizes'], allocation['counts'])
+    return data
+
+
+class SolveCache:
+    """LRU cache of solver results with an optional on-disk store"""
+
+    def __init__(self, maxsize=128, cache_dir=None):
+        """
+        Args:
+            maxsize: Maximum number of results kept in memory, and on disk
+            cache_dir: Optional folder where results are also persisted;
+                the least recently used files beyond maxsize are deleted
+        """
+        self.maxsize = max(1, int(maxsize))
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        """Return a cached result for key, or None on a miss"""
+        result = self._entries.get(key)
+        if result is not None:
+            self._entries.move_to_end(key)
+        else:
+            result = self._load(key)
+            if result is not None:
+                self._remember(key, result)
+
+        if result is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return _copy_result(result)
+
+    def put(self, key, result):
+        """Store a result; solver errors are never cached"""
+        if 'error' in result:
+            return
+        result = _copy_result(result)
+        self._remember(key, result)
+        self._store(key, result)
+
+    def clear(self):
+        """Drop all in-memory entries and reset the counters"""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        """Get hit/miss counters and the current cache size"""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self._entries),
+            'maxsize': self.maxsize
+        }
+
+    def _remember(self, key, result):
+        """Insert into the in-memory LRU, evicting the oldest entry if full"""
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def _path(self, key):
+        return self.cache_dir / f"{key}.json"
+
+    def _load(self, key):
+        """Read a persisted result, if there is one"""
+        if not self.cache_dir:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        try:
+            # The modification time orders the files for trimming
+            os.utime(path)
+        except OSError:
+            pass
+        # Entries written before results carried a dense allocation
+        if data.get('success') and 'allocation' not in data:
+            return None
+        return _from_json(data)
+
+    def _store(self, key, result):
+        """Persist a result; failures only cost a future cache miss"""
+        if not self.cache_dir:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # Another instance may share the folder, so never leave a partial
+            # file; a lost entry only costs a re-solve, so skip the fsync
+            atomic_write(self._path(key),
+                         json.dumps(_to_json(result), ensure_ascii=False).encode('utf-8'),
+                         durable=False)
+        except OSError as e:
+            print(f"Error saving solve cache entry: {e}")
+            return
+        self._trim()
+
+    def _trim(self):
+        """Delete the least recently used files beyond maxsize"""
+        files = []
+        for path in self.cache_dir.glob("*.json"):
+            try:
+                files.append((path.stat().st_mtime_ns, path))
+            except OSError:
+                # Deleted meanwhile by another instance
+                pass
+        files.sort()
+        for _, path in files[:max(0, len(files) - self.maxsize)]:
+            try:
+                path.unlink()
+            except OSError:
+                pass
@@ -1,68 +1,767 @@
+import logging
+import multiprocessing
+import signal
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
 from pulp import LpProblem, LpVariable, LpMinimize, lpSum, LpInteger, LpStatus, value
 
+from cbc_runner import CancelToken, SolveCancelled, solve_with_cbc
+from diagnosis import diagnose_material
+from dp_solver import DEFAULT_MAX_WORK, StateSpaceExceeded, solve_material_dp
+from highs_solver import highs_available, solve_material_highs
+from mps_model import DIRECT_MODEL_THRESHOLD, solve_material_direct
+from objectives import (DEFAULT_OBJECTIVES, is_lexicographic, larger_ranks, normalize_objectives,
+                        objective_expressions)
+from presolve import presolve_material
+from problem import Allocation, AllocationProblem
+from solve_cache import instance_key
+
+
+logger = logging.getLogger("container_allocator.solver")
+
+# Seconds a cancelled pool gets to stop before its processes are terminated
+POOL_STOP_GRACE = 0.5
+
+# Cancel token of the blocks solved in a pool worker process
+_pool_cancel = None
+
+
+def _init_pool_worker(cancel_event):
+    """Pool worker setup: cancel the running block when the pool is cancelled"""
+    global _pool_cancel
+    _pool_cancel = CancelToken()
+    # A forked worker inherits the handler of its parent
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+
+    def watch():
+        cancel_event.wait()
+        _pool_cancel.cancel()
+
+    threading.Thread(target=watch, daemon=True).start()
+
+
+def _solve_pool_block(*block_args):
+    """Pool task: solve_material with the worker's cancel token, so CBC can be killed"""
+    return solve_material(*block_args, cancel=_pool_cancel)
+
+
+def solve_material(mat, requirements, stock, locations, sizes, options=None, cancel=None):
+    """
+    Solve the allocation subproblem for a single material
+
+    No constraint couples two materials (SCU rows are per location/material,
+    availability rows are per material/size), so every material can be
+    solved as its own small model.
+
+    Args:
+        mat: Material name
+        requirements: SCU amounts for this material, one per location
+        stock: Container counts for this material, one per size
+        locations: List of location names
+        sizes: List of container sizes
+        options: Optional dict with 'backend' (a BACKEND_CHAINS name),
+            'max_work' for the DP engine, 'model' ("pulp", "direct" or
+            "auto") for how the CBC model is built, 'threads' and
+            'time_limit' for the MILP solvers, 'warm_start', a previous
+            allocation used as CBC's initial solution, and 'presolve'
+            (default True) to drop empty rows and settle trivial blocks
+            without a solver, 'objectives', a normalized objective stack
+            solved lexicographically, with 'reserve_sizes' for its "reserve"
+            objective
+        cancel: Optional CancelToken that can kill the running CBC process
+
+    Returns:
+        Dict with the material, its solver status, the backend that produced
+        it, 'allocation', a flat location-major list of len(locations) ×
+        len(sizes) container counts (empty unless optimal), 'timings', the
+        seconds spent per phase, and 'presolve', what presolve did
+    """
+    options = options or {}
+    lexicographic = is_lexicographic(options.get('objectives', DEFAULT_OBJECTIVES))
+    if lexicographic:
+        # Ties between equally good plans depend on the MIP start, so only the
+        # inputs may choose it; the "larger" weights follow the full size list
+        options = dict(options, warm_start=None,
+                       size_ranks=options.get('size_ranks') or larger_ranks(sizes))
+    if not options.get('presolve', True):
+        return _solve_with_backends(mat, requirements, stock, locations, sizes, options, cancel)
+
+    start = time.perf_counter()
+    presolved = presolve_material(requirements, stock, sizes)
+    presolve_time = time.perf_counter() - start
+
+    status = presolved['status']
+    if status == "Optimal" and presolved['locations'] and lexicographic:
+        # Presolve only proves the fewest containers, not a secondary objective
+        status = None
+
+    if status is not None:
+        return {
+            'material': mat,
+            'status': status,
+            'allocation': presolved['allocation'] or [],
+            'backend': "presolve",
+            'timings': {'presolve': presolve_time},
+            'presolve': dict(presolved['stats'], outcome=status)
+        }
+
+    # Solve only the locations and sizes presolve kept
+    rows, columns = presolved['locations'], presolved['sizes']
+    n_size = len(sizes)
+
+    def reduce(flat):
+        return [flat[i * n_size + k] for i in rows for k in columns]
+
+    warm_start = options.get('warm_start') or presolved['greedy']
+    reduced = dict(options, warm_start=reduce(warm_start) if warm_start else None)
+    if lexicographic:
+        reduced['size_ranks'] = [options['size_ranks'][k] for k in columns]
+    block = _solve_with_backends(
+        mat, [requirements[i] for i in rows], [stock[k] for k in columns],
+        [locations[i] for i in rows], [sizes[k] for k in columns], reduced, cancel
+    )
+
+    if block['allocation']:
+        allocation = [0] * (len(locations) * n_size)
+        values = iter(block['allocation'])
+        for i in rows:
+            for k in columns:
+                allocation[i * n_size + k] = next(values)
+        block['allocation'] = allocation
+    block['timings']['presolve'] = presolve_time
+    block['presolve'] = dict(presolved['stats'], outcome="Reduced")
+    return block
+
+
+def _solve_with_backends(mat, requirements, stock, locations, sizes, options, cancel):
+    """Try the backends of options['backend'] in order until one accepts the block"""
+    skipped = {}
+    lexicographic = is_lexicographic(options.get('objectives', DEFAULT_OBJECTIVES))
+
+    for name in backend_chain(options.get('backend', "pulp")):
+        if lexicographic and name not in LEXICOGRAPHIC_BACKENDS:
+            continue
+        start = time.perf_counter()
+        try:
+            block = BACKENDS[name](mat, requirements, stock, locations, sizes, options, cancel)
+        except StateSpaceExceeded:
+            # Too large for this backend, hand it to the next one
+            skipped[name] = time.perf_counter() - start
+            continue
+        block.setdefault('backend', name)
+        block.setdefault('timings', {name: time.perf_counter() - start})
+        block['timings'].update(skipped)
+        return block
+
+    raise RuntimeError(f"{mat}: no solver backend accepted the block")
+
+
+def _solve_dp(mat, requirements, stock, locations, sizes, options, cancel):
+    """Exact DP engine; raises StateSpaceExceeded for blocks over the work budget"""
+    return solve_material_dp(mat, requirements, stock, sizes,
+                             options.get('max_work', DEFAULT_MAX_WORK),
+                             options.get('objectives', DEFAULT_OBJECTIVES),
+                             options.get('reserve_sizes', ()), options.get('size_ranks'))
+
+
+def _solve_highs(mat, requirements, stock, locations, sizes, options, cancel):
+    """HiGHS through SciPy, in this process"""
+    return solve_material_highs(mat, requirements, stock, locations, sizes,
+                                options.get('time_limit'), cancel)
+
+
+def _solve_cbc(mat, requirements, stock, locations, sizes, options, cancel):
+    """CBC, with the model built by PuLP or written directly as MPS"""
+    model = options.get('model', "auto")
+    threads = options.get('threads')
+    objectives = options.get('objectives', DEFAULT_OBJECTIVES)
+    if is_lexicographic(objectives):
+        # Later objectives are added to the PuLP model that is already built,
+        # and parallel CBC may settle ties differently from run to run
+        model = "pulp"
+        threads = None
+    if model == "auto":
+        # PuLP's expression objects cost more than the solve on large blocks
+        direct = len(locations) * len(sizes) >= DIRECT_MODEL_THRESHOLD
+    else:
+        direct = model == "direct"
+
+    if direct:
+        block = solve_material_direct(mat, requirements, stock, locations, sizes,
+                                      threads, options.get('warm_start'), cancel,
+                                      options.get('time_limit'))
+    else:
+        block = solve_material_pulp(mat, requirements, stock, locations, sizes,
+                                    threads, options.get('warm_start'), cancel,
+                                    options.get('time_limit'), objectives,
+                                    options.get('reserve_sizes', ()), options.get('size_ranks'))
+    block['backend'] = "cbc" if direct else "pulp"
+    return block
+
+
+# Block solvers by backend name. Each is called with (mat, requirements,
+# stock, locations, sizes, options, cancel), returns a block result and may
+# raise StateSpaceExceeded to hand the block to the next backend in its chain
+BACKENDS = {
+    'dp': _solve_dp,
+    'pulp': _solve_cbc
+}
+if highs_available():
+    BACKENDS['highs'] = _solve_highs
+
+# Backends tried in order for each 'backend' option; unregistered ones are
+# skipped. "auto" lets the DP engine take the blocks that are small enough
+# and prefers an in-process MILP over starting CBC for the rest.
+BACKEND_CHAINS = {
+    'auto': ("dp", "highs", "pulp"),
+    'dp': ("dp", "pulp"),
+    'highs': ("highs", "pulp"),
+    'pulp': ("pulp",)
+}
+
+# Backends that can optimize objective stacks other than DEFAULT_OBJECTIVES;
+# the others are skipped for such stacks
+LEXICOGRAPHIC_BACKENDS = {"dp", "pulp"}
+
+
+def register_backend(name, solve, chain=None, lexicographic=False):
+    """
+    Register a block solver under a backend name
+
+    Register at import time of a module the solver imports, otherwise
+    worker processes will not know the backend.
+
+    Args:
+        name: Backend name
+        solve: Block solver, called like the entries of BACKENDS
+        chain: Backends tried in order when this one is selected; defaults to
+            this backend with CBC as the fallback
+        lexicographic: Whether solve honours options['objectives']
+    """
+    BACKENDS[name] = solve
+    BACKEND_CHAINS[name] = tuple(chain or (name, "pulp"))
+    if lexicographic:
+        LEXICOGRAPHIC_BACKENDS.add(name)
+
+
+def backend_chain(backend):
+    """Registered backends tried in order for a 'backend' option"""
+    if backend not in BACKEND_CHAINS:
+        raise ValueError(f"Unknown solver backend '{backend}'")
+    return [name for name in BACKEND_CHAINS[backend] if name in BACKENDS]
+
+
+def available_backends():
+    """Backend options usable in this installation"""
+    return [name for name, chain in BACKEND_CHAINS.items()
+            if name == "auto" or chain[0] in BACKENDS]
+
+
+def solve_material_pulp(mat, requirements, stock, locations, sizes, threads=None, warm_start=None,
+                        cancel=None, time_limit=None, objectives=DEFAULT_OBJECTIVES,
+                        reserve_sizes=(), ranks=None):
+    """
+    Solve a single material block with PuLP and CBC, optionally warm-started
+
+    Objective stacks are solved lexicographically on the same model: after
+    each level its optimum is added as a constraint, the objective switches
+    to the next level and CBC restarts from the previous solution. If a
+    later level stops without a proven optimum (time limit), the solution
+    of the last finished level is kept.
+    """
+    start = time.perf_counter()
+    prob, x = build_material_model(mat, requirements, stock, locations, sizes, warm_start)
+    levels = []
+    if is_lexicographic(objectives):
+        # Objectives without a variable in this block cannot break any tie
+        expressions = objective_expressions(prob, x, requirements, sizes, objectives,
+                                            reserve_sizes, ranks)
+        levels = [(name, expression) for name, expression in zip(objectives, expressions)
+                  if expression]
+        if levels:
+            prob.setObjective(levels[0][1])
+    built = time.perf_counter()
+
+    result = solve_with_cbc(prob, threads, bool(warm_start), cancel, time_limit)
+    status = LpStatus[result]
+
+    for level in range(1, len(levels)):
+        if status != "Optimal":
+            break
+        # Keep the previous level at its optimum and restart from its solution
+        previous = levels[level - 1][1]
+        prob += previous <= int(round(value(previous))), f"level_{level}"
+        prob.setObjective(levels[level][1])
+        solution = {var.name: var.varValue for var in prob.variables()}
+        for var in prob.variables():
+            var.setInitialValue(solution[var.name])
+        if LpStatus[solve_with_cbc(prob, threads, True, cancel, time_limit)] != "Optimal":
+            logger.info("%s: objective '%s' not solved, keeping the previous level", mat,
+                        levels[level][0])
+            prob.assignVarsVals(solution)
+            break
+    solved = time.perf_counter()
+
+    allocation = []
+    if status == "Optimal":
+        allocation = extract_allocation(x)
+
+    return {
+        'material': mat,
+        'status': status,
+        'allocation': allocation,
+        'timings': {
+            'model': built - start,
+            'cbc': solved - built,
+            'extract': time.perf_counter() - solved
+        }
+    }
+
+
+def build_material_model(mat, requirements, stock, locations, sizes, warm_start=None):
+    """
+    Build the PuLP model of a single material block
+
+    Names are index-based (x_<location>_<size>) like the direct MPS
+    writer's: PuLP rewrites characters such as spaces and dashes in names,
+    so user-supplied names could collide ("A B" and "A-B").
+
+    Returns:
+        (prob, x) where x is the location-major list of decision variables
+    """
+    prob = LpProblem("ContainerAllocation", LpMinimize)
+
+    # Decision variables: x[location, size] = number of containers, location-major
+    x = [
+        LpVariable(f"x_{i}_{k}", 0, None, LpInteger)
+        for i in range(len(locations))
+        for k in range(len(sizes))
+    ]
+    n_size = len(sizes)
+
+    # Objective: minimize containers used for this material
+    prob += lpSum(x)
+
+    # Constraints: meet requirements at each location
+    for i, amount in enumerate(requirements):
+        prob += lpSum(x[i * n_size + k] * size for k, size in enumerate(sizes)) == amount
+
+    # Constraints: don't exceed container availability
+    for k, count in enumerate(stock):
+        prob += lpSum(x[k::n_size]) <= count
+
+    if warm_start:
+        for var, start in zip(x, warm_start):
+            var.setInitialValue(start)
+
+    return prob, x
+
+
+def extract_allocation(x):
+    """Read solved variable values into a flat list of container counts"""
+    return [int(round(value(var))) for var in x]
+
+
+def summarize_presolve(blocks):
+    """
+    Count what presolve did over a list of solved blocks
+
+    Returns:
+        Dict with the number of 'blocks', how many presolve proved 'optimal'
+        or 'infeasible' without a solver, how many were 'reduced' and still
+        solved, and the 'rows_dropped' and 'columns_dropped' in total
+    """
+    summary = {'blocks': len(blocks), 'optimal': 0, 'infeasible': 0, 'reduced': 0,
+               'rows_dropped': 0, 'columns_dropped': 0}
+    for block in blocks:
+        stats = block.get('presolve')
+        if not stats:
+            continue
+        summary[stats['outcome'].lower()] += 1
+        summary['rows_dropped'] += stats['rows_dropped']
+        summary['columns_dropped'] += stats['columns_dropped']
+    return summary
+
 
 class ContainerSolver:
     """Handles the optimization logic for container allocation"""
-    
-    def __init__(self):
-        pass
-    
-    def solve(self, requirements, available, locations, materials, sizes):
+
+    def __init__(self, workers=1, threads=None, backend="pulp", max_work=DEFAULT_MAX_WORK,
+                 cache=None, incremental=True, time_limit=None, model="auto", presolve=True,
+                 diagnose=True, objectives=DEFAULT_OBJECTIVES, reserve_sizes=()):
         """
-        Solve the container allocation problem
-        
+        Args:
+            workers: Number of worker processes used to solve material
+                subproblems in parallel (1 solves them in series)
+            threads: Optional number of CBC threads per subproblem
+            backend: "pulp" to always use CBC, "dp" to try the exact
+                dynamic-programming engine first and fall back to CBC,
+                "highs" for SciPy's HiGHS when installed, or "auto" to pick
+                per block by size (see BACKEND_CHAINS)
+            max_work: DP work budget before falling back to CBC
+            cache: Optional SolveCache; hits are returned without solving
+            incremental: Keep the previous solve and only re-solve materials
+                whose requirements or stock changed since then
+            time_limit: Optional CBC time limit in seconds per subproblem;
+                blocks stopped on the limit count as not solved
+            model: How CBC models are built: "pulp" with PuLP objects,
+                "direct" by writing the MPS file directly, or "auto" to
+                write it directly for large blocks only
+            presolve: Drop empty rows and settle blocks that are provably
+                optimal or infeasible before starting a solver
+            diagnose: Explain infeasible materials in the result (see
+                diagnosis.diagnose_material)
+            objectives: Objective stack optimized lexicographically, see
+                objectives.OBJECTIVES; "containers" is added last if missing
+            reserve_sizes: Container sizes the "reserve" objective avoids using
+        """
+        backend_chain(backend)
+        self.workers = max(1, int(workers))
+        self.threads = threads
+        self.backend = backend
+        self.max_work = max_work
+        self.cache = cache
+        self.incremental = incremental
+        self.time_limit = time_limit
+        self.model = model
+        self.presolve = presolve
+        self.diagnose = diagnose
+        self.objectives = normalize_objectives(objectives)
+        self.reserve_sizes = tuple(sorted(reserve_sizes))
+        self._executor = None
+        # Set to cancel the blocks running in the pool
+        self._pool_cancel = None
+        self._cancel = CancelToken()
+        # Whether prepare_solve made the token for the next solve
+        self._prepared = False
+        # Structure and per-material blocks of the previous solve
+        self._previous = None
+
+    def close(self):
+        """Shut down the worker pool, if one was started"""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def cancel(self):
+        """Cancel the running solve; safe to call from another thread"""
+        self._cancel.cancel()
+
+    def prepare_solve(self):
+        """
+        Start the cancellation scope of the next solve_problem call
+
+        Call when a solve is handed to another thread, so a cancel() issued
+        before that thread gets to solve_problem is not lost.
+        """
+        self._cancel = CancelToken()
+        self._prepared = True
+
+    def _get_executor(self):
+        """Lazily start the process pool so it is reused across solves"""
+        if self._executor is None:
+            self._pool_cancel = multiprocessing.Event()
+            self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                 initializer=_init_pool_worker,
+                                                 initargs=(self._pool_cancel,))
+        return self._executor
+
+    def stop_pool(self):
+        """
+        Stop the process pool without waiting for its blocks
+
+        Running blocks are cancelled, which kills their CBC processes; pool
+        processes still busy after POOL_STOP_GRACE are terminated. Returns
+        once every pool process has exited; the next solve starts a new pool.
+        Safe to call from a signal handler.
+        """
+        executor, self._executor = self._executor, None
+        if executor is None:
+            return
+        self._pool_cancel.set()
+        processes = list((executor._processes or {}).values())
+        executor.shutdown(wait=False, cancel_futures=True)
+        deadline = time.monotonic() + POOL_STOP_GRACE
+        for process in processes:
+            process.join(max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                process.terminate()
+                process.join()
+
+    def solve(self, requirements, available, locations, materials, sizes, progress=None):
+        """
+        Solve the container allocation problem from nested dicts
+
         Args:
             requirements: Dict of {location: {material: amount}}
             available: Dict of {material: {size: count}}
             locations: List of location names
             materials: List of material names
             sizes: List of container sizes
-            
+            progress: Optional callback(done, total), see solve_problem
+
         Returns:
-            Dict with 'success' flag and solution data
+            Same as solve_problem
         """
-        try:
-            # Create the optimization problem
-            prob = LpProblem("ContainerAllocation", LpMinimize)
-
-            # Decision variables: x[location, material, size] = number of containers
-            x = {
-                (loc, mat, size): LpVariable(f"x_{loc}_{mat}_{size}", 0, None, LpInteger)
-                for loc in locations
-                for mat in materials
-                for size in sizes
+        problem = AllocationProblem.from_dicts(requirements, available, locations, materials, sizes)
+        return self.solve_problem(problem, progress)
+
+    def solve_problem(self, problem, progress=None):
+        """
+        Solve an AllocationProblem
+
+        The model is decomposed into one independent subproblem per material
+        and the block results are merged back into a single solution. With
+        more than one worker the subproblems are solved in a process pool;
+        results are merged in material order so the output matches a serial
+        solve exactly.
+
+        Args:
+            problem: AllocationProblem instance
+            progress: Optional callback(done, total) called as material
+                blocks finish; it runs on the solving thread
+
+        Returns:
+            Dict with 'success' flag and solution data. 'allocation' is an
+            Allocation holding the dense L×M×S container counts and
+            'material_status' holds the solver status of every material.
+            'timings' maps solver phases to seconds, summed over the
+            material blocks solved in this call, and 'presolve' counts the
+            blocks presolve settled (see summarize_presolve). Infeasible
+            results carry a 'diagnosis' per infeasible material. Results served from the
+            cache carry 'cached': True and cancelled solves return
+            'cancelled': True.
+        """
+        if not self._prepared:
+            self._cancel = CancelToken()
+        self._prepared = False
+        if self._cancel.cancelled:
+            return {
+                'success': False,
+                'cancelled': True,
+                'status': "Cancelled"
             }
 
-            # Objective: minimize total containers used
-            prob += lpSum(x.values())
+        key = None
+        if self.cache is not None:
+            start = time.perf_counter()
+            key = instance_key(problem, self._objective_settings())
+            cached = self.cache.get(key)
+            lookup_time = time.perf_counter() - start
+            if cached is not None:
+                # The key ignores name order, so the entry may come from a
+                # problem listing them differently
+                if 'allocation' in cached:
+                    cached['allocation'] = cached['allocation'].reordered(
+                        problem.locations, problem.materials, problem.sizes)
+                cached['cached'] = True
+                cached['timings'] = {'cache': lookup_time}
+                return cached
 
-            # Constraints: meet requirements at each location
-            for loc in locations:
-                for mat in materials:
-                    prob += lpSum(x[(loc, mat, s)] * s for s in sizes) == requirements[loc][mat]
+        result = self._solve(problem, progress)
+        if key is not None:
+            result['timings'] = dict({'cache': lookup_time}, **result.get('timings', {}))
 
-            # Constraints: don't exceed container availability
-            for mat in materials:
-                for size in sizes:
-                    prob += lpSum(x[(loc, mat, size)] for loc in locations) <= available[mat][size]
+        # A block stopped on the time limit is not a final answer
+        timed_out = self.time_limit and "Not Solved" in result.get('material_status', {}).values()
+        if key is not None and not result.get('cancelled') and not timed_out:
+            self.cache.put(key, result)
+        return result
 
-            # Solve the problem
-            result = prob.solve()
+    def reset(self):
+        """Forget the previous solve so the next one starts from scratch"""
+        self._previous = None
 
-            if LpStatus[result] == "Optimal":
-                return {
-                    'success': True,
-                    'variables': x,
-                    'total_containers': sum(int(value(var)) for var in x.values())
-                }
-            else:
-                return {
-                    'success': False,
-                    'status': LpStatus[result]
+    def _objective_settings(self):
+        """Objective stack and reserve as one comparable value, None for the default"""
+        if not is_lexicographic(self.objectives):
+            return None
+        return {'objectives': list(self.objectives), 'reserve_sizes': list(self.reserve_sizes)}
+
+    def _solve(self, problem, progress=None):
+        """Solve every changed material block and merge the results"""
+        locations, materials, sizes = problem.locations, problem.materials, problem.sizes
+        try:
+            # Previous blocks are only reusable if the grid shape is unchanged
+            previous_blocks = {}
+            if (self.incremental and self._previous is not None
+                    and self._previous['locations'] == tuple(locations)
+                    and self._previous['sizes'] == tuple(sizes)
+                    and self._previous['objectives'] == self._objective_settings()):
+                previous_blocks = self._previous['blocks']
+
+            blocks = {}
+            signatures = {}
+            pending = []
+            for j, mat in enumerate(materials):
+                mat_requirements = problem.material_requirements(j).tolist()
+                mat_stock = problem.material_stock(j).tolist()
+                signature = (tuple(mat_requirements), tuple(mat_stock))
+                signatures[mat] = signature
+
+                previous = previous_blocks.get(mat)
+                if previous is not None and previous[0] == signature:
+                    blocks[mat] = previous[1]
+                    continue
+
+                warm_start = None
+                if previous is not None and previous[1]['status'] == "Optimal":
+                    warm_start = previous[1]['allocation']
+                pending.append((mat, mat_requirements, mat_stock, locations, sizes, warm_start))
+
+            solved = self.solve_blocks(pending, progress, self._cancel)
+
+            timings = {}
+            for block in solved:
+                blocks[block['material']] = block
+                for phase, seconds in block.get('timings', {}).items():
+                    timings[phase] = timings.get(phase, 0.0) + seconds
+
+            if self.incremental:
+                self._previous = {
+                    'locations': tuple(locations),
+                    'sizes': tuple(sizes),
+                    'objectives': self._objective_settings(),
+                    'blocks': {mat: (signatures[mat], blocks[mat]) for mat in materials}
                 }
-                
+
+            start = time.perf_counter()
+            result = self._merge_blocks([blocks[mat] for mat in materials],
+                                        locations, materials, sizes)
+            timings['merge'] = time.perf_counter() - start
+
+            if self.diagnose and not result['success']:
+                start = time.perf_counter()
+                result['diagnosis'] = [
+                    diagnose_material(mat, problem.material_requirements(j).tolist(),
+                                      problem.material_stock(j).tolist(), locations, sizes,
+                                      self._cancel)
+                    for j, mat in enumerate(materials)
+                    if result['material_status'][mat] == "Infeasible"
+                ]
+                timings['diagnose'] = time.perf_counter() - start
+            result['resolved_materials'] = [block['material'] for block in solved]
+            result['timings'] = timings
+            if self.presolve:
+                result['presolve'] = summarize_presolve(solved)
+                logger.info("presolve settled %d of %d blocks (%d infeasible), dropped %d rows",
+                            result['presolve']['optimal'] + result['presolve']['infeasible'],
+                            result['presolve']['blocks'], result['presolve']['infeasible'],
+                            result['presolve']['rows_dropped'])
+            return result
+
+        except SolveCancelled:
+            return {
+                'success': False,
+                'cancelled': True,
+                'status': "Cancelled"
+            }
+
         except Exception as e:
             return {
                 'success': False,
                 'error': str(e)
-            }
\ No newline at end of file
+            }
+
+    def solve_blocks(self, blocks, progress=None, cancel=None):
+        """
+        Solve material blocks with this solver's options
+
+        Blocks are solved in the process pool when there is more than one
+        worker. Nothing is cached or remembered for incremental solves.
+
+        Args:
+            blocks: List of (mat, requirements, stock, locations, sizes,
+                warm_start) tuples, see solve_material
+            progress: Optional callback(done, total) called as blocks finish
+            cancel: CancelToken that stops the solve; defaults to a new one
+
+        Returns:
+            Block results in the order of blocks
+
+        Raises:
+            SolveCancelled: If the solve was cancelled
+        """
+        cancel = cancel or CancelToken()
+        options = {
+            'backend': self.backend,
+            'max_work': self.max_work,
+            'threads': self.threads,
+            'time_limit': self.time_limit,
+            'model': self.model,
+            'presolve': self.presolve,
+            'objectives': self.objectives,
+            'reserve_sizes': self.reserve_sizes
+        }
+        pending = [
+            (mat, requirements, stock, locations, sizes,
+             dict(options, warm_start=warm_start) if warm_start else options)
+            for mat, requirements, stock, locations, sizes, warm_start in blocks
+        ]
+
+        if self.workers > 1 and len(pending) > 1:
+            return self._solve_in_pool(pending, progress, cancel)
+
+        solved = []
+        for block_args in pending:
+            cancel.check()
+            solved.append(solve_material(*block_args, cancel=cancel))
+            if progress:
+                progress(len(solved), len(pending))
+        return solved
+
+    def _solve_in_pool(self, pending, progress, cancel):
+        """Solve blocks in the process pool, returning them in submission order"""
+        executor = self._get_executor()
+        futures = [executor.submit(_solve_pool_block, *block_args) for block_args in pending]
+
+        remaining = set(futures)
+        while remaining:
+            done, remaining = wait(remaining, timeout=0.1, return_when=FIRST_COMPLETED)
+            if cancel.cancelled:
+                self.stop_pool()
+                raise SolveCancelled()
+            if progress and done:
+                progress(len(futures) - len(remaining), len(futures))
+
+        return [future.result() for future in futures]
+
+    def _merge_blocks(self, blocks, locations, materials, sizes):
+        """Combine per-material block results into one solution dict"""
+        material_status = {block['material']: block['status'] for block in blocks}
+        infeasible = [mat for mat in materials if material_status[mat] != "Optimal"]
+
+        if infeasible:
+            return {
+                'success': False,
+                'status': material_status[infeasible[0]],
+                'material_status': material_status,
+                'infeasible_materials': infeasible
+            }
+
+        allocations = {block['material']: block['allocation'] for block in blocks}
+        allocation = Allocation.from_blocks(
+            locations, materials, sizes, [allocations[mat] for mat in materials]
+        )
+
+        return {
+            'success': True,
+            'allocation': allocation,
+            'total_containers': allocation.total(),
+            'material_status': material_status
+        }
+
+
+class DPSolver(ContainerSolver):
+    """
+    Container solver backed by the exact dynamic-programming engine
+
+    Material blocks whose state space is too large for the DP engine are
+    automatically handed to PuLP/CBC instead.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault('backend', "dp")
+        super().__init__(**kwargs)
@@ -0,0 +1,180 @@
+"""
+Solver Worker
+A long-lived solver process that receives problems over a pipe
+"""
+
+import atexit
+import multiprocessing
+import queue
+import signal
+import threading
+import time
+
+from solver import POOL_STOP_GRACE, ContainerSolver
+
+
+# Seconds a cancelled solve gets to stop before the worker process is killed
+CANCEL_GRACE = 0.5
+
+# Seconds a closing worker gets to stop its pool before it is terminated
+CLOSE_GRACE = CANCEL_GRACE + POOL_STOP_GRACE
+
+
+def _read_requests(connection, solver, commands):
+    """Worker side: queue commands for the main thread, acting on cancel at once"""
+    while True:
+        try:
+            message = connection.recv()
+        except EOFError:
+            # The application went away
+            message = ('close',)
+        if message[0] == 'cancel':
+            solver.cancel()
+            continue
+        if message[0] == 'solve':
+            # Cancels read from here on belong to this solve, even before it starts
+            solver.prepare_solve()
+        commands.put(message)
+        if message[0] == 'close':
+            return
+
+
+def _worker_main(requests, replies, options):
+    """Entry point of the worker process"""
+    solver = ContainerSolver(**options)
+
+    def stop(signum, frame):
+        # Kill the running CBC process and the pool before going down, or
+        # they outlive the worker
+        solver.cancel()
+        solver.stop_pool()
+        raise SystemExit(0)
+
+    signal.signal(signal.SIGTERM, stop)
+    commands = queue.Queue()
+    threading.Thread(target=_read_requests, args=(requests, solver, commands),
+                     daemon=True).start()
+
+    def report_progress(done, total):
+        replies.send(('progress', done, total))
+
+    try:
+        while True:
+            message = commands.get()
+            if message[0] == 'close':
+                break
+            if message[0] == 'reset':
+                solver.reset()
+            elif message[0] == 'solve':
+                replies.send(('result', solver.solve_problem(message[1], report_progress)))
+    finally:
+        solver.close()
+
+
+class SolverWorker(ContainerSolver):
+    """
+    ContainerSolver that solves in a long-lived worker process
+
+    The process is started once and then reused, so a solve costs one pipe
+    round trip instead of a process start and the imports. The worker keeps
+    the incremental state; the cache stays in this process. Because the
+    solve runs elsewhere, in-process backends (DP, HiGHS) do not hold the
+    GIL of the UI, and cancel() can stop them by restarting the worker.
+    """
+
+    def __init__(self, **kwargs):
+        """
+        Args:
+            kwargs: ContainerSolver arguments; all but 'cache' are passed to
+                the solver in the worker process
+        """
+        super().__init__(**kwargs)
+        self._options = {key: value for key, value in kwargs.items() if key != 'cache'}
+        self._process = None
+        self._requests = None
+        self._replies = None
+
+    def start(self):
+        """Start the worker process now rather than on the first solve"""
+        if self._process is not None and self._process.is_alive():
+            return
+        requests_reader, self._requests = multiprocessing.Pipe(duplex=False)
+        self._replies, replies_writer = multiprocessing.Pipe(duplex=False)
+        # Not a daemon: the worker may start its own process pool
+        self._process = multiprocessing.Process(
+            target=_worker_main, args=(requests_reader, replies_writer, self._options),
+            name="solver-worker"
+        )
+        self._process.start()
+        requests_reader.close()
+        replies_writer.close()
+        # Non-daemon children are joined at exit, so make sure this one stops
+        atexit.register(self.close)
+
+    def close(self):
+        """Stop the worker process and any pool it started"""
+        if self._process is not None:
+            try:
+                self._requests.send(('cancel',))
+                self._requests.send(('close',))
+            except OSError:
+                pass
+            self._stop_process(CLOSE_GRACE)
+            atexit.unregister(self.close)
+        super().close()
+
+    def reset(self):
+        """Forget the previous solve so the next one starts from scratch"""
+        super().reset()
+        if self._process is not None and self._process.is_alive():
+            self._requests.send(('reset',))
+
+    def _stop_process(self, timeout):
+        self._process.join(timeout)
+        if self._process.is_alive():
+            self._process.terminate()
+            self._process.join()
+        self._requests.close()
+        self._replies.close()
+        self._process = None
+
+    def _solve(self, problem, progress=None):
+        """Send the problem to the worker and wait for its result"""
+        self.start()
+        self._requests.send(('solve', problem))
+
+        cancelled_at = None
+        while True:
+            if self._replies.poll(0.05):
+                try:
+                    message = self._replies.recv()
+                except EOFError:
+                    message = None
+                if message is None:
+                    break
+                if message[0] == 'progress':
+                    if progress:
+                        progress(message[1], message[2])
+                    continue
+                return message[1]
+
+            if self._cancel.cancelled:
+                if cancelled_at is None:
+                    cancelled_at = time.perf_counter()
+                    self._requests.send(('cancel',))
+                elif time.perf_counter() - cancelled_at > CANCEL_GRACE:
+                    # An in-process backend does not see the cancel; restart instead
+                    self._stop_process(0)
+                    return {
+                        'success': False,
+                        'cancelled': True,
+                        'status': "Cancelled"
+                    }
+            elif not self._process.is_alive():
+                break
+
+        self._stop_process(0)
+        return {
+            'success': False,
+            'error': "The solver worker stopped unexpectedly"
+        }
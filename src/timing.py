@@ -0,0 +1,89 @@
+"""
+Timing Traces
+Named timing spans for the calculate path, reported to the status bar, logs and a trace file
+"""
+
+import datetime
+import json
+import logging
+import time
+from contextlib import contextmanager
+
+
+logger = logging.getLogger("container_allocator.timing")
+
+
+def format_duration(seconds):
+    """Format a duration for display, e.g. '850 µs', '12 ms' or '3.4 s'"""
+    if seconds < 0.001:
+        return f"{seconds * 1e6:.0f} µs"
+    if seconds < 1:
+        return f"{seconds * 1000:.0f} ms"
+    return f"{seconds:.1f} s"
+
+
+class Trace:
+    """Collects the timing spans of one operation"""
+
+    def __init__(self, operation, **details):
+        """
+        Args:
+            operation: Name of the traced operation, e.g. "calculate"
+            details: Extra JSON-serializable fields written to the trace file
+        """
+        self.operation = operation
+        self.details = details
+        self.started = datetime.datetime.now()
+        self.spans = []
+        self._start = time.perf_counter()
+        self.total = None
+
+    @contextmanager
+    def span(self, name):
+        """Time the body of a with block as the span name"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def add(self, name, seconds):
+        """Record a span measured elsewhere; repeated names are summed"""
+        for i, (span_name, total) in enumerate(self.spans):
+            if span_name == name:
+                self.spans[i] = (name, total + seconds)
+                return
+        self.spans.append((name, seconds))
+
+    def add_all(self, timings):
+        """Record a {name: seconds} dict, e.g. the 'timings' of a solver result"""
+        for name, seconds in (timings or {}).items():
+            self.add(name, seconds)
+
+    def finish(self):
+        """Stop the clock and log the breakdown; returns the total in seconds"""
+        self.total = time.perf_counter() - self._start
+        logger.info("%s took %s: %s", self.operation, format_duration(self.total), self.summary())
+        return self.total
+
+    def summary(self):
+        """One-line breakdown, e.g. 'read 2 ms · cbc 340 ms · render 30 ms'"""
+        return " · ".join(f"{name} {format_duration(seconds)}" for name, seconds in self.spans)
+
+    def to_dict(self):
+        data = {
+            'operation': self.operation,
+            'started': self.started.isoformat(timespec='milliseconds'),
+            'total_ms': round((self.total or 0) * 1000, 3),
+            'spans': [{'name': name, 'ms': round(seconds * 1000, 3)} for name, seconds in self.spans]
+        }
+        data.update(self.details)
+        return data
+
+    def write(self, path):
+        """Append the trace as one JSON line; failures are only reported"""
+        try:
+            with open(path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(self.to_dict(), ensure_ascii=False) + "\n")
+        except OSError as e:
+            print(f"Error writing timing trace: {e}")
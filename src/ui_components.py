@@ -5,8 +5,15 @@ Reusable UI component classes
 
 import tkinter as tk
 from tkinter import ttk
-from tabulate import tabulate
-from pulp import value
+
+from problem import AllocationProblem
+
+
+def _fancy_grid(rows, headers):
+    """Text table for the summary tab"""
+    # tabulate is imported on first render, it is not needed for the first frame
+    from tabulate import tabulate
+    return tabulate(rows, headers=headers, tablefmt="fancy_grid", numalign="center")
 
 
 class ManagementButtons(ttk.LabelFrame):
@@ -74,146 +81,413 @@ class ManagementButtons(ttk.LabelFrame):
                   command=self.app.add_size).pack(side=tk.LEFT)
 
 
+class VirtualGrid(ttk.Frame):
+    """
+    Scrollable grid of integer entry cells backed by a dict store
+
+    Only the cells inside the visible viewport have widgets. Scrolling
+    rebinds the pooled entries to other (row, column) keys instead of
+    creating new ones, and adding or removing a row or column only updates
+    the store before redrawing the viewport.
+    """
+    
+    def __init__(self, parent, corner_text, row_label=str, visible_rows=10, visible_columns=8):
+        """
+        Args:
+            parent: Parent widget
+            corner_text: Header shown above the row labels
+            row_label: Callable formatting a row key for its label
+            visible_rows: Maximum number of rows with widgets at a time
+            visible_columns: Maximum number of columns with widgets at a time
+        """
+        super().__init__(parent)
+        self.row_label = row_label
+        self.visible_rows = visible_rows
+        self.visible_columns = visible_columns
+        
+        self.rows = []
+        self.columns = []
+        self.values = {}
+        # Cell text that is not a valid integer, keyed like values
+        self.invalid = {}
+        self.first_row = 0
+        self.first_column = 0
+        
+        # Widget pool for the viewport
+        self._loading = False
+        self._column_labels = []
+        self._row_labels = []
+        self._cells = []
+        
+        self.corner = ttk.Label(self, text=corner_text, font=('TkDefaultFont', 9, 'bold'))
+        self.corner.grid(row=0, column=0, padx=5, pady=5, sticky="w")
+        self.message = ttk.Label(self, font=('TkDefaultFont', 10), foreground='gray', 
+                                 anchor='center', wraplength=350)
+        self.vbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self.yview)
+        self.vbar.grid(row=1, column=visible_columns + 1, rowspan=visible_rows, sticky="ns")
+        self.hbar = ttk.Scrollbar(self, orient=tk.HORIZONTAL, command=self.xview)
+        self.hbar.grid(row=visible_rows + 1, column=1, columnspan=visible_columns, sticky="ew")
+        self._bind_wheel(self)
+    
+    def set_keys(self, rows, columns):
+        """Set the row and column keys, keeping the values of cells that remain"""
+        removed_rows = set(self.rows).difference(rows)
+        removed_columns = set(self.columns).difference(columns)
+        
+        # Only drop the store entries of removed rows and columns
+        for row in removed_rows:
+            for column in self.columns:
+                self.values.pop((row, column), None)
+                self.invalid.pop((row, column), None)
+        for column in removed_columns:
+            for row in self.rows:
+                self.values.pop((row, column), None)
+                self.invalid.pop((row, column), None)
+        
+        self.rows = list(rows)
+        self.columns = list(columns)
+        self.refresh()
+    
+    def set_empty_message(self, text):
+        """Set the hint shown while the grid has no rows or no columns"""
+        self.message.configure(text=text)
+    
+    def get(self, row, column):
+        """
+        Get the value of a cell
+        
+        Raises:
+            ValueError: If the cell does not hold a valid integer
+        """
+        key = (row, column)
+        if key in self.invalid:
+            raise ValueError(f"'{self.invalid[key]}' is not a valid number "
+                             f"({self.row_label(row)}, {column})")
+        return self.values.get(key, 0)
+    
+    def set(self, row, column, value):
+        """Set the value of a cell without redrawing the viewport"""
+        self.values[(row, column)] = int(value)
+        self.invalid.pop((row, column), None)
+    
+    def set_values(self, values):
+        """
+        Replace every cell at once and redraw the viewport
+        
+        Args:
+            values: Dict of the non-zero cells, keyed by (row, column)
+        """
+        self.values = values
+        self.invalid.clear()
+        self.refresh()
+    
+    def clear(self):
+        """Reset every cell to zero"""
+        self.values.clear()
+        self.invalid.clear()
+        self.refresh()
+    
+    def refresh(self):
+        """Redraw the viewport from the store"""
+        if not self.rows or not self.columns:
+            for widget in self._column_labels + self._row_labels:
+                widget.grid_remove()
+            for cells in self._cells:
+                for entry, _ in cells:
+                    entry.grid_remove()
+            self.corner.grid_remove()
+            self.vbar.grid_remove()
+            self.hbar.grid_remove()
+            self.message.grid(row=0, column=0, columnspan=self.visible_columns + 2, 
+                              sticky="nsew", padx=20, pady=20)
+            return
+        
+        self.message.grid_remove()
+        self.corner.grid()
+        self.first_row = self._clamp(self.first_row, len(self.rows), self.visible_rows)
+        self.first_column = self._clamp(self.first_column, len(self.columns), self.visible_columns)
+        n_rows = min(len(self.rows), self.visible_rows)
+        n_columns = min(len(self.columns), self.visible_columns)
+        self._ensure_pool(n_rows, n_columns)
+        
+        self._loading = True
+        try:
+            for c, label in enumerate(self._column_labels):
+                if c < n_columns:
+                    label.configure(text=self.columns[self.first_column + c])
+                    label.grid()
+                else:
+                    label.grid_remove()
+            
+            for r, label in enumerate(self._row_labels):
+                if r < n_rows:
+                    label.configure(text=self.row_label(self.rows[self.first_row + r]))
+                    label.grid()
+                else:
+                    label.grid_remove()
+            
+            for r, cells in enumerate(self._cells):
+                for c, (entry, var) in enumerate(cells):
+                    if r < n_rows and c < n_columns:
+                        key = (self.rows[self.first_row + r], self.columns[self.first_column + c])
+                        var.set(self.invalid.get(key, self.values.get(key, 0)))
+                        entry.grid()
+                    else:
+                        entry.grid_remove()
+        finally:
+            self._loading = False
+        
+        self._update_scrollbar(self.vbar, self.first_row, n_rows, len(self.rows))
+        self._update_scrollbar(self.hbar, self.first_column, n_columns, len(self.columns))
+    
+    def yview(self, *args):
+        """Scrollbar command for the rows"""
+        self.first_row = self._scroll(args, self.first_row, len(self.rows), self.visible_rows)
+        self.refresh()
+    
+    def xview(self, *args):
+        """Scrollbar command for the columns"""
+        self.first_column = self._scroll(args, self.first_column, len(self.columns), 
+                                         self.visible_columns)
+        self.refresh()
+    
+    @staticmethod
+    def _clamp(first, total, visible):
+        return max(0, min(first, total - visible))
+    
+    @staticmethod
+    def _scroll(args, first, total, visible):
+        """Apply a Tk scroll command ('moveto' or 'scroll') to a first index"""
+        if args[0] == 'moveto':
+            first = int(round(float(args[1]) * total))
+        elif args[0] == 'scroll':
+            step = int(args[1])
+            first += step * visible if args[2] == 'pages' else step
+        return VirtualGrid._clamp(first, total, visible)
+    
+    @staticmethod
+    def _update_scrollbar(scrollbar, first, shown, total):
+        if shown < total:
+            scrollbar.set(first / total, (first + shown) / total)
+            scrollbar.grid()
+        else:
+            scrollbar.grid_remove()
+    
+    def _ensure_pool(self, n_rows, n_columns):
+        """Create viewport widgets up to n_rows × n_columns; they are never destroyed"""
+        while len(self._column_labels) < n_columns:
+            c = len(self._column_labels)
+            label = ttk.Label(self, font=('TkDefaultFont', 9, 'bold'))
+            label.grid(row=0, column=c + 1, padx=5, pady=5)
+            self._bind_wheel(label)
+            self._column_labels.append(label)
+        
+        while len(self._row_labels) < n_rows:
+            r = len(self._row_labels)
+            label = ttk.Label(self)
+            label.grid(row=r + 1, column=0, padx=5, pady=2, sticky="w")
+            self._bind_wheel(label)
+            self._row_labels.append(label)
+        
+        while len(self._cells) < n_rows:
+            self._cells.append([])
+        for r, cells in enumerate(self._cells):
+            while len(cells) < n_columns:
+                c = len(cells)
+                var = tk.StringVar(value="0")
+                var.trace_add('write', lambda *args, r=r, c=c: self._on_edit(r, c))
+                entry = ttk.Entry(self, width=8, textvariable=var, justify='center')
+                entry.grid(row=r + 1, column=c + 1, padx=5, pady=2)
+                self._bind_wheel(entry)
+                cells.append((entry, var))
+    
+    def _on_edit(self, r, c):
+        """Write an edited viewport cell back to the store"""
+        if self._loading:
+            return
+        key = (self.rows[self.first_row + r], self.columns[self.first_column + c])
+        text = self._cells[r][c][1].get()
+        try:
+            self.values[key] = int(text.strip())
+            self.invalid.pop(key, None)
+        except ValueError:
+            self.invalid[key] = text
+    
+    def _bind_wheel(self, widget):
+        widget.bind('<MouseWheel>', self._on_wheel)
+        widget.bind('<Shift-MouseWheel>', self._on_wheel)
+        # X11 reports the wheel as buttons 4 and 5
+        widget.bind('<Button-4>', self._on_wheel)
+        widget.bind('<Button-5>', self._on_wheel)
+        widget.bind('<Shift-Button-4>', self._on_wheel)
+        widget.bind('<Shift-Button-5>', self._on_wheel)
+    
+    def _on_wheel(self, event):
+        if event.num == 4 or getattr(event, 'delta', 0) > 0:
+            step = -1
+        else:
+            step = 1
+        if event.state & 0x0001:  # Shift scrolls the columns
+            self.xview('scroll', step, 'units')
+        else:
+            self.yview('scroll', step, 'units')
+        return "break"
+
+
 class InputGrids:
     """Input grids for requirements and container availability"""
     
     def __init__(self, parent, materials, sizes, locations):
         self.parent = parent
-        self.req_vars = {}
-        self.cont_vars = {}
-        self.req_frame = None
-        self.cont_frame = None
+        self.materials = []
+        self.sizes = []
+        self.locations = []
         
-        self.build_grids(materials, sizes, locations)
-    
-    def build_grids(self, materials, sizes, locations):
-        """Build or rebuild the input grids"""
-        # Clear existing frames
-        for widget in self.parent.winfo_children():
-            widget.destroy()
-
         # Location Requirements
         self.req_frame = ttk.LabelFrame(self.parent, text="Location Requirements (SCU needed)")
         self.req_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(0, 10))
-
-        # Check if we have materials and locations to display
-        if not materials or not locations:
-            # Show helpful message when no materials or locations are configured
-            message_frame = ttk.Frame(self.req_frame)
-            message_frame.pack(expand=True, fill=tk.BOTH, padx=20, pady=20)
-            
-            if not materials and not locations:
-                message = "Add materials and locations using the buttons above to get started."
-            elif not materials:
-                message = "Add materials using the '+' button above to configure requirements."
-            else:  # not locations
-                message = "Add locations using the '+' button above to configure requirements."
-            
-            ttk.Label(message_frame, text=message, 
-                     font=('TkDefaultFont', 10), 
-                     foreground='gray',
-                     anchor='center').pack(expand=True)
-            self.req_vars = {}
-        else:
-            # Requirements header
-            ttk.Label(self.req_frame, text="Location", 
-                     font=('TkDefaultFont', 9, 'bold')).grid(row=0, column=0, padx=5, pady=5, sticky="w")
-            for j, mat in enumerate(materials):
-                ttk.Label(self.req_frame, text=mat, 
-                         font=('TkDefaultFont', 9, 'bold')).grid(row=0, column=j+1, padx=5, pady=5)
-
-            # Requirements grid
-            new_req_vars = {}
-            for i, loc in enumerate(locations):
-                ttk.Label(self.req_frame, text=loc).grid(row=i+1, column=0, padx=5, pady=2, sticky="w")
-                for j, mat in enumerate(materials):
-                    # Preserve existing values if they exist
-                    old_value = self.req_vars.get((loc, mat), tk.IntVar(value=0)).get()
-                    var = tk.IntVar(value=old_value)
-                    entry = ttk.Entry(self.req_frame, width=8, textvariable=var, justify='center')
-                    entry.grid(row=i+1, column=j+1, padx=5, pady=2)
-                    new_req_vars[(loc, mat)] = var
-            
-            self.req_vars = new_req_vars
-
+        self.requirements = VirtualGrid(self.req_frame, "Location")
+        self.requirements.pack(fill=tk.BOTH, expand=True)
+        
         # Container Availability
         self.cont_frame = ttk.LabelFrame(self.parent, text="Container Availability")
         self.cont_frame.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True)
-
-        # Check if we have materials to display
-        if not materials:
-            # Show helpful message when no materials are configured
-            message_frame = ttk.Frame(self.cont_frame)
-            message_frame.pack(expand=True, fill=tk.BOTH, padx=20, pady=20)
-            
-            ttk.Label(message_frame, text="Add materials using the '+' button above to configure container availability.", 
-                     font=('TkDefaultFont', 10), 
-                     foreground='gray',
-                     anchor='center').pack(expand=True)
-            self.cont_vars = {}
+        self.availability = VirtualGrid(self.cont_frame, "Size", row_label=lambda size: f"{size}-SCU")
+        self.availability.pack(fill=tk.BOTH, expand=True)
+        self.availability.set_empty_message(
+            "Add materials using the '+' button above to configure container availability.")
+        
+        self.build_grids(materials, sizes, locations)
+    
+    def build_grids(self, materials, sizes, locations):
+        """
+        Update the grids to a new set of locations, materials and sizes
+        
+        Values of cells that still exist are kept. Only the rows and columns
+        that were added or removed change in the store; the widgets of the
+        visible viewport are reused.
+        """
+        self.materials = list(materials)
+        self.sizes = list(sizes)
+        self.locations = list(locations)
+        
+        # Helpful message when no materials or locations are configured
+        if not materials and not locations:
+            message = "Add materials and locations using the buttons above to get started."
+        elif not materials:
+            message = "Add materials using the '+' button above to configure requirements."
         else:
-            # Container header
-            ttk.Label(self.cont_frame, text="Size", 
-                     font=('TkDefaultFont', 9, 'bold')).grid(row=0, column=0, padx=5, pady=5, sticky="w")
-            for j, mat in enumerate(materials):
-                ttk.Label(self.cont_frame, text=mat, 
-                         font=('TkDefaultFont', 9, 'bold')).grid(row=0, column=j+1, padx=5, pady=5)
-
-            # Container grid
-            new_cont_vars = {}
-            for i, size in enumerate(sizes):
-                ttk.Label(self.cont_frame, text=f"{size}-SCU").grid(row=i+1, column=0, padx=5, pady=2, sticky="w")
-                for j, mat in enumerate(materials):
-                    # Preserve existing values if they exist
-                    old_value = self.cont_vars.get((mat, size), tk.IntVar(value=0)).get()
-                    var = tk.IntVar(value=old_value)
-                    entry = ttk.Entry(self.cont_frame, width=8, textvariable=var, justify='center')
-                    entry.grid(row=i+1, column=j+1, padx=5, pady=2)
-                    new_cont_vars[(mat, size)] = var
-            
-            self.cont_vars = new_cont_vars
+            message = "Add locations using the '+' button above to configure requirements."
+        self.requirements.set_empty_message(message)
+        
+        self.requirements.set_keys(self.locations, self.materials)
+        self.availability.set_keys(self.sizes, self.materials)
     
     def rebuild(self, materials, sizes, locations):
-        """Rebuild grids with new configuration"""
+        """Update grids to a new configuration"""
         self.build_grids(materials, sizes, locations)
     
-    def get_variables(self):
-        """Get the current variable dictionaries"""
-        return self.req_vars, self.cont_vars
+    def get_problem(self):
+        """
+        Read the grids into an AllocationProblem
+        
+        Raises:
+            ValueError: If a cell does not hold a valid integer
+        """
+        requirements, availability = self.requirements, self.availability
+        return AllocationProblem(
+            self.locations, self.materials, self.sizes,
+            [requirements.get(loc, mat) for loc in self.locations for mat in self.materials],
+            [availability.get(size, mat) for mat in self.materials for size in self.sizes]
+        )
+    
+    def set_problem(self, problem):
+        """Write the values of an AllocationProblem into the grids"""
+        n_mat, n_size = len(problem.materials), len(problem.sizes)
+        locations, materials, sizes = problem.locations, problem.materials, problem.sizes
+        # Missing cells read as zero, so only the non-zero ones are stored
+        self.requirements.set_values({
+            (locations[index // n_mat], materials[index % n_mat]): amount
+            for index, amount in enumerate(problem.requirements) if amount
+        })
+        self.availability.set_values({
+            (sizes[index % n_size], materials[index // n_size]): count
+            for index, count in enumerate(problem.available) if count
+        })
     
     def clear_all(self):
         """Clear all input fields"""
-        for var in self.req_vars.values():
-            var.set(0)
-        for var in self.cont_vars.values():
-            var.set(0)
+        self.requirements.clear()
+        self.availability.clear()
     
     def load_example_data(self, example_data, locations, materials, sizes):
         """Load example data into the grids"""
         # Load requirements
         for (loc, mat), val in example_data['requirements'].items():
-            if loc in locations and mat in materials and (loc, mat) in self.req_vars:
-                self.req_vars[(loc, mat)].set(val)
+            if loc in locations and mat in materials:
+                self.requirements.set(loc, mat, val)
         
         # Load availability
         for (mat, size), val in example_data['availability'].items():
-            if mat in materials and size in sizes and (mat, size) in self.cont_vars:
-                self.cont_vars[(mat, size)].set(val)
+            if mat in materials and size in sizes:
+                self.availability.set(size, mat, val)
+        
+        self.requirements.refresh()
+        self.availability.refresh()
 
 
 class OutputDisplay(ttk.LabelFrame):
-    """Output display area with scrollable text"""
+    """Output display with a lazily filled allocation table and a text summary"""
+    
+    # Allocation rows inserted into the table per batch
+    ROW_CHUNK = 200
     
     def __init__(self, parent):
         super().__init__(parent, text="Allocation Results")
         self.output = None
+        self.table = None
+        self.notebook = None
+        self._allocation = None
+        self._sizes = []
+        self._rows = None
+        self._row_total = 0
+        self._loading_rows = False
         self.build_ui()
     
     def build_ui(self):
         """Build the output display interface"""
-        # Text widget with scrollbars
-        text_frame = ttk.Frame(self)
-        text_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        controls = ttk.Frame(self)
+        controls.pack(fill=tk.X, padx=5, pady=(5, 0))
+        
+        self.row_count_var = tk.StringVar(value="")
+        ttk.Label(controls, textvariable=self.row_count_var, 
+                 foreground='gray').pack(side=tk.LEFT)
+        self.show_empty_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(controls, text="Show empty rows", variable=self.show_empty_var,
+                       command=self._reload_table).pack(side=tk.RIGHT)
+        
+        self.notebook = ttk.Notebook(self)
+        self.notebook.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        
+        # Allocation table, filled in chunks as the user scrolls
+        table_frame = ttk.Frame(self.notebook)
+        self.table = ttk.Treeview(table_frame, show='headings', height=15)
+        self._table_scrollbar = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, 
+                                              command=self.table.yview)
+        table_h_scrollbar = ttk.Scrollbar(table_frame, orient=tk.HORIZONTAL, 
+                                          command=self.table.xview)
+        self.table.configure(yscrollcommand=self._on_table_scroll, 
+                             xscrollcommand=table_h_scrollbar.set)
+        
+        self.table.grid(row=0, column=0, sticky="nsew")
+        self._table_scrollbar.grid(row=0, column=1, sticky="ns")
+        table_h_scrollbar.grid(row=1, column=0, sticky="ew")
+        table_frame.grid_rowconfigure(0, weight=1)
+        table_frame.grid_columnconfigure(0, weight=1)
+        self.notebook.add(table_frame, text="Allocation")
+        
+        # Text widget with scrollbars for the summaries and messages
+        text_frame = ttk.Frame(self.notebook)
 
         self.output = tk.Text(text_frame, height=15, font=('Consolas', 10), wrap=tk.NONE)
         v_scrollbar = ttk.Scrollbar(text_frame, orient=tk.VERTICAL, command=self.output.yview)
@@ -227,57 +501,113 @@ class OutputDisplay(ttk.LabelFrame):
         
         text_frame.grid_rowconfigure(0, weight=1)
         text_frame.grid_columnconfigure(0, weight=1)
+        self.notebook.add(text_frame, text="Summary")
     
     def clear(self):
         """Clear the output display"""
         self.output.delete(1.0, tk.END)
+        self.table.delete(*self.table.get_children())
+        self._allocation = None
+        self._rows = None
+        self.row_count_var.set("")
     
-    def show_solution(self, result, requirements, available, locations, materials, sizes):
+    def show_solution(self, result, problem):
         """Display the optimal solution"""
         self.clear()
-        x = result['variables']
+        allocation = result['allocation']
         
-        self.output.insert(tk.END, "✅ OPTIMAL ALLOCATION FOUND\n")
-        self.output.insert(tk.END, "=" * 60 + "\n\n")
-
         # Main allocation table
-        headers = ["Location", "Material"] + [f"{s}×SCU" for s in sizes] + ["Total SCU"]
-        rows = []
-
-        for loc in locations:
-            for mat in materials:
-                row = [loc, mat]
-                total_scu = 0
-                
-                for size in sizes:
-                    container_count = int(value(x[(loc, mat, size)]))
-                    # Show count with units for clarity
-                    if container_count > 0:
-                        row.append(f"{container_count}×")
-                    else:
-                        row.append("-")
-                    total_scu += container_count * size
-                
-                # Highlight total SCU
-                row.append(f"{total_scu} SCU")
-                rows.append(row)
-
-        table = tabulate(rows, headers=headers, tablefmt="fancy_grid", numalign="center", stralign="center")
-        self.output.insert(tk.END, table)
+        columns = ["location", "material"] + [f"size_{k}" for k in range(len(problem.sizes))] + ["total"]
+        headings = ["Location", "Material"] + [f"{s}×SCU" for s in problem.sizes] + ["Total SCU"]
+        self.table.configure(columns=columns)
+        for column, heading in zip(columns, headings):
+            self.table.heading(column, text=heading)
+            self.table.column(column, width=90, minwidth=60, anchor='center', stretch=False)
+        
+        self._allocation = allocation
+        self._sizes = problem.sizes
+        self._reload_table()
+        self.notebook.select(0)
+        
+        self.output.insert(tk.END, "✅ OPTIMAL ALLOCATION FOUND\n")
+        self.output.insert(tk.END, "=" * 60 + "\n")
         
         # Container summary table
-        self._show_container_summary(x, materials, sizes, locations)
+        used = allocation.used_stock()
+        self._show_container_summary(used, problem)
         
         self.output.insert(tk.END, f"\n📊 SUMMARY:\n")
         self.output.insert(tk.END, f"• Total containers allocated: {result['total_containers']}\n")
         self.output.insert(tk.END, f"• Optimization status: OPTIMAL\n\n")
 
         # Container utilization summary
-        self._show_utilization(x, available, materials, sizes, locations)
+        self._show_utilization(used, problem)
     
-    def show_no_solution(self, requirements, available, materials, locations, sizes):
-        """Display when no solution is found"""
+    def _iter_allocation_rows(self, show_empty):
+        """Yield allocation table rows; rows without containers are skipped unless show_empty"""
+        allocation, sizes = self._allocation, self._sizes
+        for i, loc in enumerate(allocation.locations):
+            for j, mat in enumerate(allocation.materials):
+                counts = allocation.row(i, j)
+                if not show_empty and not any(counts):
+                    continue
+                # Show count with units for clarity
+                yield ([loc, mat] + [f"{count}×" if count > 0 else "-" for count in counts]
+                       + [f"{sum(map(int.__mul__, counts, sizes))} SCU"])
+    
+    def _reload_table(self):
+        """Refill the allocation table from the start, e.g. after toggling empty rows"""
+        self.table.delete(*self.table.get_children())
+        if self._allocation is None:
+            return
+        
+        show_empty = self.show_empty_var.get()
+        counts, n_size = self._allocation.counts, len(self._sizes)
+        if show_empty:
+            self._row_total = len(counts) // n_size
+        else:
+            self._row_total = sum(1 for start in range(0, len(counts), n_size)
+                                  if any(counts[start:start + n_size]))
+        self._rows = self._iter_allocation_rows(show_empty)
+        self._load_more_rows()
+    
+    def _load_more_rows(self):
+        """Insert the next chunk of allocation rows"""
+        self._loading_rows = False
+        if self._rows is None:
+            return
+        
+        inserted = 0
+        for values in self._rows:
+            self.table.insert('', tk.END, values=values)
+            inserted += 1
+            if inserted == self.ROW_CHUNK:
+                break
+        else:
+            self._rows = None
+        
+        shown = len(self.table.get_children())
+        hidden = "" if self.show_empty_var.get() else " (empty rows hidden)"
+        self.row_count_var.set(f"Showing {shown} of {self._row_total} rows{hidden}")
+    
+    def _on_table_scroll(self, first, last):
+        """Forward to the scrollbar and load more rows near the end of the table"""
+        self._table_scrollbar.set(first, last)
+        if self._rows is not None and float(last) > 0.9 and not self._loading_rows:
+            self._loading_rows = True
+            self.after_idle(self._load_more_rows)
+    
+    def show_no_solution(self, problem, infeasible_materials=None, diagnosis=None):
+        """
+        Display when no solution is found
+
+        Args:
+            problem: AllocationProblem that was solved
+            infeasible_materials: Materials without a feasible allocation
+            diagnosis: Optional diagnose_material results to explain them
+        """
         self.clear()
+        self.notebook.select(1)
         self.output.insert(tk.END, "❌ NO FEASIBLE SOLUTION FOUND\n")
         self.output.insert(tk.END, "=" * 40 + "\n\n")
         self.output.insert(tk.END, "Possible reasons:\n")
@@ -285,26 +615,34 @@ class OutputDisplay(ttk.LabelFrame):
         self.output.insert(tk.END, "• Wrong material types available\n")
         self.output.insert(tk.END, "• Check your input values\n\n")
         
-        self._show_capacity_analysis(requirements, available, materials, locations, sizes)
+        if infeasible_materials:
+            self.output.insert(tk.END, f"Materials without a feasible allocation: "
+                                       f"{', '.join(infeasible_materials)}\n\n")
+        
+        if diagnosis:
+            # Only needed here; importing it at startup would pull in PuLP
+            from diagnosis import describe_diagnosis
+            self.output.insert(tk.END, "🔎 DIAGNOSIS:\n")
+            for material_diagnosis in diagnosis:
+                for line in describe_diagnosis(material_diagnosis):
+                    self.output.insert(tk.END, f"• {line}\n")
+            self.output.insert(tk.END, "\n")
+
+        self._show_capacity_analysis(problem, infeasible_materials or [])
     
-    def _show_container_summary(self, x, materials, sizes, locations):
+    def _show_container_summary(self, used, problem):
         """Show total container usage summary by material and size"""
+        sizes = problem.sizes
+        n_size = len(sizes)
         self.output.insert(tk.END, "\n📦 CONTAINER USAGE SUMMARY:\n")
         summary_headers = ["Material"] + [f"{s}×SCU" for s in sizes] + ["Total Containers"]
         summary_rows = []
 
-        for mat in materials:
-            row = [mat]
-            total_containers = 0
-            
-            for size in sizes:
-                # Sum up containers of this size across all locations
-                size_total = sum(int(value(x[(loc, mat, size)])) for loc in locations)
-                if size_total > 0:
-                    row.append(f"{size_total}×")
-                else:
-                    row.append("-")
-                total_containers += size_total
+        for j, mat in enumerate(problem.materials):
+            # Containers of each size summed across all locations
+            size_totals = used[j * n_size:(j + 1) * n_size]
+            row = [mat] + [f"{size_total}×" if size_total > 0 else "-" for size_total in size_totals]
+            total_containers = sum(size_totals)
             
             # Add total containers for this material
             if total_containers > 0:
@@ -313,19 +651,20 @@ class OutputDisplay(ttk.LabelFrame):
         
         # Only show the table if there are containers being used
         if summary_rows:
-            summary_table = tabulate(summary_rows, headers=summary_headers, tablefmt="fancy_grid", numalign="center")
+            summary_table = _fancy_grid(summary_rows, summary_headers)
             self.output.insert(tk.END, summary_table)
     
-    def _show_utilization(self, x, available, materials, sizes, locations):
+    def _show_utilization(self, used, problem):
         """Show container utilization details"""
         self.output.insert(tk.END, "\n📦 CONTAINER UTILIZATION:\n")
         util_headers = ["Material", "Size", "Available", "Used", "Remaining", "Usage %"]
         util_rows = []
 
-        for mat in materials:
-            for size in sizes:
-                available_count = available[mat][size]
-                used_count = sum(int(value(x[(loc, mat, size)])) for loc in locations)
+        n_size = len(problem.sizes)
+        for j, mat in enumerate(problem.materials):
+            for k, size in enumerate(problem.sizes):
+                available_count = problem.available[j * n_size + k]
+                used_count = used[j * n_size + k]
                 remaining = available_count - used_count
                 
                 # Only show rows where containers are available
@@ -349,25 +688,29 @@ class OutputDisplay(ttk.LabelFrame):
                         usage_display
                     ])
 
-        util_table = tabulate(util_rows, headers=util_headers, tablefmt="fancy_grid", numalign="center")
+        util_table = _fancy_grid(util_rows, util_headers)
         self.output.insert(tk.END, util_table)
     
-    def _show_capacity_analysis(self, requirements, available, materials, locations, sizes):
+    def _show_capacity_analysis(self, problem, infeasible_materials):
         """Show capacity analysis when no solution exists"""
         self.output.insert(tk.END, "📋 CAPACITY ANALYSIS:\n")
         
         analysis_headers = ["Material", "Required", "Available", "Difference", "Status"]
         analysis_rows = []
         
-        for mat in materials:
-            total_required = sum(requirements[loc][mat] for loc in locations)
-            total_available = sum(available[mat][size] * size for size in sizes)
+        for j, mat in enumerate(problem.materials):
+            total_required = problem.total_required(j)
+            total_available = problem.total_capacity(j)
             difference = total_available - total_required
             
             # Format the difference with + or - sign
             if difference >= 0:
                 diff_display = f"+{difference} SCU"
-                status = "✅ SUFFICIENT"
+                # Enough SCU in total but the container sizes cannot hit the exact amounts
+                if mat in infeasible_materials:
+                    status = "❌ NO EXACT FIT"
+                else:
+                    status = "✅ SUFFICIENT"
             else:
                 diff_display = f"{difference} SCU"
                 status = "❌ INSUFFICIENT"
@@ -380,5 +723,5 @@ class OutputDisplay(ttk.LabelFrame):
                 status
             ])
         
-        analysis_table = tabulate(analysis_rows, headers=analysis_headers, tablefmt="fancy_grid", numalign="center")
+        analysis_table = _fancy_grid(analysis_rows, analysis_headers)
         self.output.insert(tk.END, analysis_table)
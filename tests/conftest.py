@@ -0,0 +1,9 @@
+"""
+Test configuration
+The application modules use flat imports, so src is put on the path
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
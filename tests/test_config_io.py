@@ -0,0 +1,189 @@
+"""
+Configuration Files
+Saved configurations load back exactly, in both versions and compressed or
+not, and malformed files are reported as invalid
+"""
+
+import gzip
+import json
+import os
+import random
+import tempfile
+import unittest
+
+from config_io import (build_config_data, config_version, decode_config_bytes, dump_config_text,
+                       load_config_file, parse_config_data, read_config_data,
+                       validate_config_structure, write_config_file)
+from problem import AllocationProblem
+
+
+def v1_config(requirements=None, availability=None):
+    """Version 1 configuration of one location, one material and one size"""
+    return {
+        'version': "1.0",
+        'configuration': {'materials': ["Titanium"], 'sizes': [8], 'locations': ["NB Int"]},
+        'requirements': requirements or {},
+        'availability': availability or {}
+    }
+
+
+class TestVersion1Cells(unittest.TestCase):
+    def test_integer_cells_load(self):
+        problem = parse_config_data(v1_config({"NB Int|Titanium": 16}, {"Titanium|8": 3}))
+        self.assertEqual(list(problem.requirements), [16])
+        self.assertEqual(list(problem.available), [3])
+
+    def test_integer_string_cells_load(self):
+        problem = parse_config_data(v1_config({"NB Int|Titanium": "16"}, {"Titanium|8": "3"}))
+        self.assertEqual(list(problem.requirements), [16])
+        self.assertEqual(list(problem.available), [3])
+
+    def test_malformed_cells_are_rejected(self):
+        for value in [3.7, 3.0, True, False, None, [1], "1.5", "1e3", "", 2 ** 63, -2 ** 63 - 1]:
+            with self.subTest(value=value):
+                with self.assertRaises(ValueError):
+                    parse_config_data(v1_config({"NB Int|Titanium": value}))
+                with self.assertRaises(ValueError):
+                    parse_config_data(v1_config(availability={"Titanium|8": value}))
+
+    def test_largest_cells_load(self):
+        for value in [2 ** 63 - 1, -2 ** 63]:
+            with self.subTest(value=value):
+                problem = parse_config_data(v1_config({"NB Int|Titanium": value}))
+                self.assertEqual(list(problem.requirements), [value])
+
+    def test_sections_must_be_objects(self):
+        for section in ['requirements', 'availability']:
+            with self.subTest(section=section):
+                config = v1_config()
+                config[section] = [["NB Int|Titanium", 16]]
+                with self.assertRaises(ValueError):
+                    parse_config_data(config)
+
+
+def random_problem(seed, separator="|"):
+    """Sparse random problem with names that need escaping in JSON"""
+    rnd = random.Random(seed)
+    problem = AllocationProblem([f"Loc \"{i}\" ü" for i in range(rnd.randint(1, 6))],
+                                [f"Mat{separator}{j}" for j in range(rnd.randint(1, 4))],
+                                sorted(rnd.sample([1, 2, 4, 8, 16, 24, 32], rnd.randint(1, 4))))
+    for index in range(len(problem.requirements)):
+        problem.requirements[index] = rnd.choice([0, 0, rnd.randint(1, 500)])
+    for index in range(len(problem.available)):
+        problem.available[index] = rnd.choice([0, rnd.randint(1, 40)])
+    return problem
+
+
+def v1_data(problem):
+    """Version 1 form of a problem, every cell keyed by name"""
+    return {
+        'version': "1.0",
+        'configuration': {'materials': list(problem.materials), 'sizes': list(problem.sizes),
+                          'locations': list(problem.locations)},
+        'requirements': {f"{loc}|{mat}": problem.requirement(loc, mat)
+                         for loc in problem.locations for mat in problem.materials},
+        'availability': {f"{mat}|{size}": problem.stock(mat, size)
+                         for mat in problem.materials for size in problem.sizes}
+    }
+
+
+def same_problem(a, b):
+    return (a.locations, a.materials, a.sizes, list(a.requirements), list(a.available)) == \
+        (b.locations, b.materials, b.sizes, list(b.requirements), list(b.available))
+
+
+class TestRoundTrip(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def test_version_2_round_trip(self):
+        for seed in range(30):
+            problem = random_problem(seed)
+            data = json.loads(dump_config_text(build_config_data(problem)))
+            with self.subTest(seed=seed):
+                self.assertEqual(config_version(data), 2)
+                self.assertTrue(validate_config_structure(data))
+                self.assertTrue(same_problem(parse_config_data(data), problem))
+
+    def test_version_1_loads_like_version_2(self):
+        for seed in range(30):
+            # Version 1 keys are split at "|", so names cannot contain it
+            problem = random_problem(seed, separator=" ")
+            with self.subTest(seed=seed):
+                self.assertEqual(config_version(v1_data(problem)), 1)
+                self.assertTrue(same_problem(parse_config_data(v1_data(problem)), problem))
+
+    def test_only_non_zero_cells_are_written(self):
+        problem = AllocationProblem(["A", "B"], ["X", "Y"], [8, 16],
+                                    requirements=[0, 24, 0, 0], available=[0, 0, 3, 0])
+        data = build_config_data(problem)
+        self.assertEqual(data['requirements'], [[0, 1, 24]])
+        self.assertEqual(data['availability'], [[1, 0, 3]])
+
+    def test_files_round_trip_compressed_or_not(self):
+        problem = random_problem(7)
+        for compress in [False, True]:
+            path = os.path.join(self.folder.name, f"config_{compress}.json")
+            write_config_file(path, build_config_data(problem), compress)
+            with self.subTest(compress=compress):
+                with open(path, 'rb') as f:
+                    self.assertEqual(f.read(2) == b"\x1f\x8b", compress)
+                self.assertTrue(same_problem(load_config_file(path), problem))
+                # Nothing but the file itself is left in the folder
+                self.assertEqual(os.listdir(self.folder.name), [os.path.basename(path)])
+            os.remove(path)
+
+    def test_compressed_files_are_byte_identical(self):
+        data = build_config_data(random_problem(3))
+        paths = [os.path.join(self.folder.name, name) for name in ("a.json", "b.json")]
+        for path in paths:
+            write_config_file(path, data, compress=True)
+        with open(paths[0], 'rb') as a, open(paths[1], 'rb') as b:
+            self.assertEqual(a.read(), b.read())
+
+
+class TestMalformedFiles(unittest.TestCase):
+    def v2_data(self):
+        problem = AllocationProblem(["A"], ["X"], [8], requirements=[16], available=[2])
+        return build_config_data(problem)
+
+    def test_malformed_version_2_cells_are_rejected(self):
+        for cell in [[1, 0, 16], [0, 1, 16], [-1, 0, 16], [0, 0, 16.5], [0, 0, "16"],
+                     [0, 0, None], [0, 0], [0, 0, 16, 1], [0, 0, 2 ** 63], "cell", None]:
+            with self.subTest(cell=cell):
+                data = self.v2_data()
+                data['requirements'] = [cell]
+                with self.assertRaises(ValueError):
+                    parse_config_data(data)
+
+    def test_invalid_structures(self):
+        for config in [None, [], {}, {'configuration': []},
+                       {'configuration': {'materials': ["X"], 'sizes': [8]}},
+                       {'configuration': {'materials': [], 'sizes': [8], 'locations': ["A"]}},
+                       {'configuration': {'materials': ["X"], 'sizes': [0], 'locations': ["A"]}},
+                       {'configuration': {'materials': ["X"], 'sizes': ["8"], 'locations': ["A"]}}]:
+            with self.subTest(config=config):
+                self.assertFalse(validate_config_structure(config))
+
+    def test_unreadable_content_raises_value_error(self):
+        for content in [b"", b"{not json", b"\x1f\x8b\x08 truncated",
+                        gzip.compress(b"{not json")]:
+            with self.subTest(content=content):
+                with self.assertRaises(ValueError):
+                    decode_config_bytes(content)
+
+    def test_invalid_file_raises_value_error(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "invalid.json")
+            with open(path, 'w') as f:
+                json.dump({'configuration': {'materials': ["X"]}}, f)
+            self.assertEqual(read_config_data(path), {'configuration': {'materials': ["X"]}})
+            with self.assertRaises(ValueError):
+                load_config_file(path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+"""
+Configuration Search
+Queries are split into names, amount conditions and free words, and the
+index of a folder answers them without opening the files
+"""
+
+import os
+import tempfile
+import unittest
+
+from config_io import build_config_data, write_config_file
+from config_search import parse_query, search_configs
+from problem import AllocationProblem
+
+
+MATERIALS = ["titanium", "quantanium", "laranite"]
+LOCATIONS = ["nb int", "nb int east", "hur-l1"]
+
+
+def names(entries):
+    return sorted(entry['file'] for entry in entries)
+
+
+class TestParseQuery(unittest.TestCase):
+    def test_names_are_matched_as_phrases_longest_first(self):
+        query = parse_query("deliver Titanium to NB Int East", MATERIALS, LOCATIONS)
+        self.assertEqual(query['materials'], ["titanium"])
+        self.assertEqual(query['locations'], ["nb int east"])
+        self.assertEqual(query['words'], [])
+
+    def test_punctuated_names_match_their_words(self):
+        query = parse_query("Laranite for HUR-L1", MATERIALS, LOCATIONS)
+        self.assertEqual(query['materials'], ["laranite"])
+        self.assertEqual(query['locations'], ["hur-l1"])
+
+    def test_comparisons(self):
+        cases = {
+            "> 200": [(">", 200)],
+            ">=200 SCU": [(">=", 200)],
+            "more than 200 scu": [(">", 200)],
+            "at least 10 and at most 50": [(">=", 10), ("<=", 50)],
+            "under 5": [("<", 5)],
+            "exactly 64": [("=", 64)],
+        }
+        for text, conditions in cases.items():
+            with self.subTest(text=text):
+                query = parse_query(text, MATERIALS, LOCATIONS)
+                self.assertEqual(query['conditions'], conditions)
+                self.assertEqual(query['words'], [])
+
+    def test_remaining_words_without_stopwords(self):
+        query = parse_query("configs for the weekly run 2", MATERIALS, LOCATIONS)
+        self.assertEqual(query['words'], ["weekly", "run", "2"])
+        self.assertEqual(query['conditions'], [])
+
+    def test_part_of_a_name_is_a_word(self):
+        query = parse_query("titan", MATERIALS, LOCATIONS)
+        self.assertEqual(query['materials'], [])
+        self.assertEqual(query['words'], ["titan"])
+
+
+class TestSearchConfigs(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.save("weekly run", {("NB Int", "Titanium"): 120, ("HUR-L1", "Laranite"): 40})
+        self.save("big titanium", {("NB Int East", "Titanium"): 300})
+        self.save("quanta", {("HUR-L1", "Quantanium"): 16})
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def save(self, name, requirements):
+        problem = AllocationProblem(["NB Int", "NB Int East", "HUR-L1"],
+                                    ["Titanium", "Quantanium", "Laranite"], [8, 16])
+        for (loc, mat), amount in requirements.items():
+            problem.set_requirement(loc, mat, amount)
+        write_config_file(os.path.join(self.folder.name, f"{name}.json"),
+                          build_config_data(problem), compress=name == "quanta")
+
+    def search(self, text):
+        return names(search_configs(self.folder.name, text))
+
+    def test_empty_query_lists_every_file(self):
+        self.assertEqual(self.search(""), ["big titanium.json", "quanta.json", "weekly run.json"])
+
+    def test_material_and_location(self):
+        self.assertEqual(self.search("titanium"), ["big titanium.json", "weekly run.json"])
+        self.assertEqual(self.search("deliver titanium to nb int"), ["weekly run.json"])
+        self.assertEqual(self.search("laranite to nb int"), [])
+
+    def test_amount_conditions(self):
+        self.assertEqual(self.search("titanium more than 200 scu"), ["big titanium.json"])
+        self.assertEqual(self.search("< 100"), ["quanta.json"])
+        self.assertEqual(self.search("exactly 160"), ["weekly run.json"])
+
+    def test_file_name_words(self):
+        self.assertEqual(self.search("weekly"), ["weekly run.json"])
+        self.assertEqual(self.search("big"), ["big titanium.json"])
+
+    def test_changed_files_are_indexed_again(self):
+        self.assertEqual(self.search("< 100"), ["quanta.json"])
+        self.save("quanta", {("NB Int", "Laranite"): 500})
+        self.assertEqual(self.search("< 100"), [])
+        self.assertEqual(self.search("laranite to nb int over 400"), ["quanta.json"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+"""
+Infeasibility Diagnosis
+The reachability bit sets match brute force, and the extra stock the
+elastic MILP reports is the fewest containers that make the block feasible
+"""
+
+import itertools
+import random
+import unittest
+
+from diagnosis import _nearest, _reachable, diagnose_material
+from dp_solver import solve_material_dp
+
+
+def brute_force_reachable(limit, sizes, caps=None):
+    """Set of amounts up to limit that container mixes can make"""
+    ranges = [range((limit // size if caps is None else min(caps[k], limit // size)) + 1)
+              for k, size in enumerate(sizes)]
+    amounts = set()
+    for mix in itertools.product(*ranges):
+        amount = sum(count * size for count, size in zip(mix, sizes))
+        if amount <= limit:
+            amounts.add(amount)
+    return amounts
+
+
+def amounts(reach, limit):
+    return {n for n in range(limit + 1) if reach >> n & 1}
+
+
+def diagnose(requirements, stock, sizes):
+    locations = [f"L{i}" for i in range(len(requirements))]
+    return diagnose_material("M", requirements, stock, locations, sizes)
+
+
+class TestReachability(unittest.TestCase):
+    def test_unbounded_matches_brute_force(self):
+        for sizes in [[1], [2], [3, 5], [4, 6, 9], [8, 16, 24, 32]]:
+            with self.subTest(sizes=sizes):
+                self.assertEqual(amounts(_reachable(60, sizes), 60),
+                                 brute_force_reachable(60, sizes))
+
+    def test_capped_matches_brute_force(self):
+        rnd = random.Random(0)
+        for _ in range(40):
+            sizes = sorted(rnd.sample([1, 2, 3, 4, 5, 8, 13], rnd.randint(1, 3)))
+            caps = [rnd.randint(0, 7) for _ in sizes]
+            with self.subTest(sizes=sizes, caps=caps):
+                self.assertEqual(amounts(_reachable(50, sizes, caps), 50),
+                                 brute_force_reachable(50, sizes, caps))
+
+    def test_nearest_amounts(self):
+        reach = _reachable(40, [8, 12])
+        self.assertEqual(_nearest(reach, 10), [8, 12])
+        self.assertEqual(_nearest(reach, 4), [None, 8])
+        self.assertEqual(_nearest(_reachable(10, [8]), 9), [8, None])
+
+
+class TestDiagnoseMaterial(unittest.TestCase):
+    def test_unreachable_demand_with_nearest_amounts(self):
+        diagnosis = diagnose([10, 16], [5, 5], [8, 12])
+        self.assertEqual(diagnosis['unreachable'],
+                         [{'location': "L0", 'required': 10, 'nearest': [8, 12]}])
+        # The reachable demand fits the stock, so the checks are enough
+        self.assertEqual(diagnosis['method'], "checks")
+        self.assertEqual(diagnosis['extra_stock'], [])
+
+    def test_location_the_stock_cannot_serve_alone(self):
+        # One 8 and one 16 make at most 24
+        diagnosis = diagnose([40], [1, 1], [8, 16])
+        self.assertEqual(diagnosis['unreachable'], [])
+        self.assertEqual(diagnosis['short'], [{'location': "L0", 'required': 40}])
+        self.assertEqual(sum(item['count'] for item in diagnosis['extra_stock']), 1)
+
+    def test_competing_locations_get_the_fewest_extra_containers(self):
+        # Each location alone fits, together they need one more 8
+        diagnosis = diagnose([8, 8], [1], [8])
+        self.assertEqual(diagnosis['method'], "milp")
+        self.assertEqual(diagnosis['short'], [])
+        self.assertEqual(diagnosis['extra_stock'], [{'size': 8, 'count': 1}])
+        self.assertEqual(sorted(diagnosis['competing']), ["L0", "L1"])
+
+    def test_extra_stock_makes_random_blocks_feasible_minimally(self):
+        rnd = random.Random(1)
+        checked = 0
+        while checked < 25:
+            sizes = sorted(rnd.sample([2, 4, 8, 16, 24, 32], rnd.randint(1, 3)))
+            requirements = [rnd.randint(1, 12) * sizes[0] for _ in range(rnd.randint(1, 4))]
+            stock = [rnd.randint(0, 3) for _ in sizes]
+            if solve_material_dp("M", requirements, stock, sizes)['status'] != "Infeasible":
+                continue
+            diagnosis = diagnose(requirements, stock, sizes)
+            with self.subTest(requirements=requirements, stock=stock, sizes=sizes):
+                self.assertEqual(diagnosis['unreachable'], [])
+                extra = {item['size']: item['count'] for item in diagnosis['extra_stock']}
+                fixed = [count + extra.get(size, 0) for size, count in zip(sizes, stock)]
+                self.assertEqual(solve_material_dp("M", requirements, fixed, sizes)['status'],
+                                 "Optimal")
+                # No mix of fewer extra containers is enough
+                total = sum(extra.values())
+                for added in itertools.product(range(total), repeat=len(sizes)):
+                    if sum(added) < total:
+                        fewer = [count + more for count, more in zip(stock, added)]
+                        self.assertEqual(
+                            solve_material_dp("M", requirements, fewer, sizes)['status'],
+                            "Infeasible")
+            checked += 1
+
+    def test_negative_values_are_reported_alone(self):
+        diagnosis = diagnose([-8, 7], [-1, 2], [4, 8])
+        self.assertEqual(diagnosis['negative'], [{'location': "L0", 'value': -8},
+                                                 {'size': 4, 'value': -1}])
+        self.assertEqual(diagnosis['unreachable'], [])
+        self.assertEqual(diagnosis['method'], "checks")
+
+
+if __name__ == '__main__':
+    unittest.main()
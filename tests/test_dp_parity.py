@@ -0,0 +1,126 @@
+"""
+DP / MILP Parity
+Random small material blocks solved by the DP engine and by PuLP/CBC must
+agree on feasibility and on the objective value
+"""
+
+import random
+import unittest
+
+from dp_solver import StateSpaceExceeded, solve_material_dp
+from objectives import larger_ranks, normalize_objectives
+from solver import solve_material
+
+
+# Random blocks per test; every one is also solved with CBC
+N_INSTANCES = 150
+
+SIZE_CHOICES = [1, 2, 3, 4, 8, 16, 24, 32]
+
+
+def random_block(seed):
+    """(requirements, stock, sizes, locations) of a small random block"""
+    rnd = random.Random(seed)
+    sizes = sorted(rnd.sample(SIZE_CHOICES, rnd.randint(1, 4)))
+    locations = [f"L{i}" for i in range(rnd.randint(1, 6))]
+    requirements = [rnd.choice([0, rnd.randint(1, 40), rnd.randint(1, 200)]) for _ in locations]
+    stock = [rnd.randint(0, 30) for _ in sizes]
+    return requirements, stock, sizes, locations
+
+
+def pulp_block(requirements, stock, sizes, locations, **options):
+    """Solve a block with CBC only, skipping presolve so the MILP decides"""
+    return solve_material("M", requirements, stock, locations, sizes,
+                          dict(options, backend="pulp", presolve=False))
+
+
+class TestDPParity(unittest.TestCase):
+    def assert_valid(self, block, requirements, stock, sizes):
+        """Optimal allocations meet every requirement exactly within the stock"""
+        if block['status'] != "Optimal":
+            return
+        allocation, n_size = block['allocation'], len(sizes)
+        for i, amount in enumerate(requirements):
+            self.assertEqual(sum(allocation[i * n_size + k] * size
+                                 for k, size in enumerate(sizes)), amount)
+        for k, count in enumerate(stock):
+            self.assertLessEqual(sum(allocation[k::n_size]), count)
+
+    def test_random_blocks_match_milp(self):
+        compared = 0
+        for seed in range(N_INSTANCES):
+            requirements, stock, sizes, locations = random_block(seed)
+            try:
+                dp = solve_material_dp("M", requirements, stock, sizes)
+            except StateSpaceExceeded:
+                continue
+            milp = pulp_block(requirements, stock, sizes, locations)
+            with self.subTest(seed=seed):
+                self.assert_valid(dp, requirements, stock, sizes)
+                self.assert_valid(milp, requirements, stock, sizes)
+                self.assertEqual(dp['status'], milp['status'])
+                if dp['status'] == "Optimal":
+                    self.assertEqual(sum(dp['allocation']), sum(milp['allocation']))
+            compared += 1
+        # Most small blocks fit the default work budget
+        self.assertGreater(compared, N_INSTANCES // 2)
+
+    def test_random_blocks_match_milp_lexicographic(self):
+        objectives = normalize_objectives(["reserve", "stops", "larger"])
+        for seed in range(N_INSTANCES // 3):
+            requirements, stock, sizes, locations = random_block(seed)
+            reserve = tuple(sizes[-1:])
+            ranks = larger_ranks(sizes)
+            try:
+                dp = solve_material_dp("M", requirements, stock, sizes, objectives=objectives,
+                                       reserve_sizes=reserve, ranks=ranks)
+            except StateSpaceExceeded:
+                continue
+            milp = pulp_block(requirements, stock, sizes, locations, objectives=objectives,
+                              reserve_sizes=reserve, size_ranks=ranks)
+            with self.subTest(seed=seed):
+                self.assertEqual(dp['status'], milp['status'])
+                if dp['status'] == "Optimal":
+                    self.assertEqual(self.objective_vector(dp, sizes, reserve, ranks),
+                                     self.objective_vector(milp, sizes, reserve, ranks))
+
+    @staticmethod
+    def objective_vector(block, sizes, reserve, ranks):
+        """(reserve, stops, larger, containers) values of an allocation"""
+        allocation, n_size = block['allocation'], len(sizes)
+        return (
+            sum(count for index, count in enumerate(allocation) if sizes[index % n_size] in reserve),
+            sum(1 for count in allocation if count),
+            sum(count * ranks[index % n_size] for index, count in enumerate(allocation)),
+            sum(allocation)
+        )
+
+    def test_negative_requirement_is_infeasible(self):
+        for requirements in ([-4], [4, -4], [-4, 8, 0]):
+            with self.subTest(requirements=requirements):
+                locations = [f"L{i}" for i in range(len(requirements))]
+                dp = solve_material_dp("M", requirements, [5, 5], [1, 4])
+                milp = pulp_block(requirements, [5, 5], [1, 4], locations)
+                self.assertEqual(dp['status'], "Infeasible")
+                self.assertEqual(milp['status'], "Infeasible")
+
+    def test_negative_stock_is_infeasible(self):
+        dp = solve_material_dp("M", [4], [5, -1], [1, 4])
+        self.assertEqual(dp['status'], "Infeasible")
+        self.assertEqual(pulp_block([4], [5, -1], [1, 4], ["L0"])['status'], "Infeasible")
+
+    def test_state_space_limit(self):
+        with self.assertRaises(StateSpaceExceeded):
+            solve_material_dp("M", [200, 200, 200], [50, 50, 50], [1, 2, 3], max_work=10)
+
+    def test_dp_backend_falls_back_to_pulp(self):
+        requirements, stock, sizes = [200, 200, 200], [300, 300, 300], [1, 2, 3]
+        block = solve_material("M", requirements, stock, ["A", "B", "C"], sizes,
+                               {'backend': "dp", 'presolve': False, 'max_work': 10})
+        self.assertEqual(block['status'], "Optimal")
+        self.assertEqual(block['backend'], "pulp")
+        self.assert_valid(block, requirements, stock, sizes)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+"""
+Direct MPS Model
+The MPS file written for a block is the PuLP model with index-based names,
+and CBC solves it to the same result
+"""
+
+import os
+import random
+import tempfile
+import unittest
+
+from pulp import LpProblem
+
+from mps_model import read_cbc_solution, solve_material_direct, write_material_mps, write_mip_start
+from solver import solve_material_pulp
+
+
+N_INSTANCES = 30
+
+
+def random_block(seed):
+    """(requirements, stock, sizes, locations) of a small random block"""
+    rnd = random.Random(seed)
+    sizes = sorted(rnd.sample([1, 2, 4, 8, 16, 24, 32], rnd.randint(1, 4)))
+    locations = [f"Loc {i}" for i in range(rnd.randint(1, 6))]
+    requirements = [rnd.choice([0, rnd.randint(1, 60), rnd.randint(1, 200)]) for _ in locations]
+    stock = [rnd.randint(0, 20) for _ in sizes]
+    return requirements, stock, sizes, locations
+
+
+class TestMPSModel(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.folder.name, "block.mps")
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def test_rows_columns_and_bounds(self):
+        requirements, stock, sizes = [16, 0, 40], [2, 3, 1], [4, 8, 16]
+        write_material_mps(self.path, requirements, stock, sizes)
+        variables, prob = LpProblem.fromMPS(self.path)
+
+        n_size = len(sizes)
+        self.assertEqual(sorted(variables), sorted(f"x{n}" for n in range(3 * n_size)))
+        for var in variables.values():
+            self.assertEqual(var.cat, "Integer")
+            self.assertEqual(var.lowBound, 0)
+            self.assertIsNone(var.upBound)
+        self.assertEqual({var.name: coef for var, coef in prob.objective.items()},
+                         {name: 1 for name in variables})
+
+        constraints = prob.constraints
+        self.assertEqual(sorted(constraints), ["R0", "R1", "R2", "S0", "S1", "S2"])
+        for i, amount in enumerate(requirements):
+            row = constraints[f"R{i}"]
+            self.assertEqual({var.name: coef for var, coef in row.items()},
+                             {f"x{i * n_size + k}": size for k, size in enumerate(sizes)})
+            self.assertEqual(-row.constant, amount)
+            self.assertEqual(row.sense, 0)
+        for k, count in enumerate(stock):
+            row = constraints[f"S{k}"]
+            self.assertEqual({var.name: coef for var, coef in row.items()},
+                             {f"x{i * n_size + k}": 1 for i in range(3)})
+            self.assertEqual(-row.constant, count)
+            self.assertEqual(row.sense, -1)
+
+    def test_direct_model_solves_like_pulp(self):
+        for seed in range(N_INSTANCES):
+            requirements, stock, sizes, locations = random_block(seed)
+            direct = solve_material_direct("M", requirements, stock, locations, sizes)
+            pulp = solve_material_pulp("M", requirements, stock, locations, sizes)
+            with self.subTest(seed=seed):
+                self.assertEqual(direct['status'], pulp['status'])
+                if direct['status'] == "Optimal":
+                    self.assertEqual(sum(direct['allocation']), sum(pulp['allocation']))
+                    n_size = len(sizes)
+                    for i, amount in enumerate(requirements):
+                        self.assertEqual(sum(direct['allocation'][i * n_size + k] * size
+                                             for k, size in enumerate(sizes)), amount)
+
+    def test_warm_start_gives_the_same_optimum(self):
+        requirements, stock, sizes, locations = [40, 24], [4, 4, 2], [4, 8, 16], ["A", "B"]
+        cold = solve_material_direct("M", requirements, stock, locations, sizes)
+        warm = solve_material_direct("M", requirements, stock, locations, sizes,
+                                     warm_start=cold['allocation'])
+        self.assertEqual(warm['status'], "Optimal")
+        self.assertEqual(sum(warm['allocation']), sum(cold['allocation']))
+
+    def test_mip_start_lists_every_variable(self):
+        write_mip_start(self.path, [3, 0, 1])
+        with open(self.path) as f:
+            lines = f.read().splitlines()
+        self.assertEqual([line.split()[1:3] for line in lines[1:]],
+                         [["x0", "3"], ["x1", "0"], ["x2", "1"]])
+
+    def test_solution_file_is_read_by_index(self):
+        with open(self.path, 'w') as f:
+            f.write("Optimal - objective value 4.00000000\n"
+                    "      0 x0                       2                       1\n"
+                    "      2 x2               0.9999999                       1\n"
+                    "**    3 x3                       1                       1\n"
+                    "      0 R0                       0                       0\n")
+        self.assertEqual(read_cbc_solution(self.path, 4), ("Optimal", [2, 0, 1, 1]))
+
+    def test_solution_status_names(self):
+        for first_line, status in [("Infeasible - objective value 0", "Infeasible"),
+                                   ("Integer infeasible - objective value 0", "Infeasible"),
+                                   ("Stopped on time - objective value 3", "Not Solved"),
+                                   ("", "Undefined")]:
+            with self.subTest(first_line=first_line):
+                with open(self.path, 'w') as f:
+                    f.write(first_line + "\n")
+                self.assertEqual(read_cbc_solution(self.path, 2), (status, [0, 0]))
+
+
+if __name__ == '__main__':
+    unittest.main()
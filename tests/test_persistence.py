@@ -0,0 +1,122 @@
+"""
+Persistence
+Atomic writes leave the old or the new file and nothing else, and the
+background writer turns a burst of submits into one write
+"""
+
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+from persistence import BackgroundWriter, atomic_write, file_state
+
+
+# Delay of the writers under test; long enough to submit a burst in
+DELAY = 0.2
+
+
+class TestAtomicWrite(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.folder.name, "settings.json")
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def read(self):
+        with open(self.path, 'rb') as f:
+            return f.read()
+
+    def test_creates_and_replaces(self):
+        for durable in [True, False]:
+            with self.subTest(durable=durable):
+                atomic_write(self.path, b"old", durable)
+                self.assertEqual(self.read(), b"old")
+                atomic_write(self.path, b"new content", durable)
+                self.assertEqual(self.read(), b"new content")
+                self.assertEqual(os.listdir(self.folder.name), ["settings.json"])
+
+    def test_failed_write_keeps_the_old_file(self):
+        atomic_write(self.path, b"old")
+        with self.assertRaises(TypeError):
+            atomic_write(self.path, "not bytes")
+        self.assertEqual(self.read(), b"old")
+        self.assertEqual(os.listdir(self.folder.name), ["settings.json"])
+
+    def test_missing_folder_raises_os_error(self):
+        with self.assertRaises(OSError):
+            atomic_write(os.path.join(self.folder.name, "missing", "settings.json"), b"data")
+
+    def test_file_state_follows_writes(self):
+        self.assertIsNone(file_state(self.path))
+        atomic_write(self.path, b"one")
+        first = file_state(self.path)
+        atomic_write(self.path, b"three")
+        self.assertNotEqual(file_state(self.path), first)
+        self.assertEqual(file_state(self.path)[1], 5)
+
+
+class TestBackgroundWriter(unittest.TestCase):
+    def setUp(self):
+        self.writer = BackgroundWriter(DELAY)
+        self.runs = []
+        self.lock = threading.Lock()
+
+    def tearDown(self):
+        self.writer.flush(5)
+
+    def task(self, value):
+        def run():
+            with self.lock:
+                self.runs.append((value, time.monotonic()))
+        return run
+
+    def test_burst_is_written_once_with_the_last_task(self):
+        start = time.monotonic()
+        for value in range(5):
+            self.writer.submit("settings", self.task(value))
+            time.sleep(DELAY / 10)
+        self.assertTrue(self.writer.pending("settings"))
+        self.assertTrue(self.writer.flush(5))
+        # Nothing is left to run later
+        time.sleep(DELAY)
+        self.assertEqual([value for value, _ in self.runs], [4])
+        self.assertFalse(self.writer.pending("settings"))
+        self.assertLess(self.runs[0][1] - start, DELAY * 5)
+
+    def test_due_time_is_not_moved_by_later_submits(self):
+        start = time.monotonic()
+        # Keep submitting for longer than the delay; the first submit sets the due time
+        while time.monotonic() - start < DELAY * 2:
+            self.writer.submit("settings", self.task("latest"))
+            time.sleep(DELAY / 20)
+        self.assertTrue(self.runs)
+        self.assertLess(self.runs[0][1] - start, DELAY * 1.5)
+
+    def test_keys_are_written_separately(self):
+        self.writer.submit("a", self.task("a"))
+        self.writer.submit("b", self.task("b"))
+        self.assertTrue(self.writer.flush(5))
+        self.assertEqual(sorted(value for value, _ in self.runs), ["a", "b"])
+
+    def test_flush_writes_at_once(self):
+        writer = BackgroundWriter(delay=60)
+        writer.submit("settings", self.task("now"))
+        self.assertTrue(writer.flush(5))
+        self.assertEqual([value for value, _ in self.runs], ["now"])
+
+    def test_failing_task_does_not_stop_the_writer(self):
+        def fail():
+            raise OSError("disk full")
+
+        self.writer.submit("broken", fail)
+        self.assertTrue(self.writer.flush(5))
+        self.writer.submit("settings", self.task("after"))
+        self.assertTrue(self.writer.flush(5))
+        self.assertEqual([value for value, _ in self.runs], ["after"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+"""
+Block Presolve
+Presolve may only settle a block when it is right: its lower bound never
+exceeds the optimum, a block it calls optimal has the optimal container
+count and one it calls infeasible has no allocation. The exact DP engine is
+the reference.
+"""
+
+import random
+import unittest
+
+from dp_solver import StateSpaceExceeded, solve_material_dp
+from presolve import presolve_material
+
+
+N_INSTANCES = 300
+
+SIZE_CHOICES = [1, 2, 3, 4, 8, 16, 24, 32]
+
+
+def random_block(seed):
+    """(requirements, stock, sizes) of a small random block"""
+    rnd = random.Random(seed)
+    sizes = sorted(rnd.sample(SIZE_CHOICES, rnd.randint(1, 4)))
+    requirements = [rnd.choice([0, rnd.randint(1, 40), rnd.randint(1, 120)])
+                    for _ in range(rnd.randint(1, 5))]
+    stock = [rnd.choice([0, rnd.randint(1, 6), rnd.randint(1, 30)]) for _ in sizes]
+    return requirements, stock, sizes
+
+
+class TestPresolve(unittest.TestCase):
+    def assert_feasible(self, allocation, requirements, stock, sizes):
+        """allocation meets every requirement exactly within the stock"""
+        n_size = len(sizes)
+        self.assertEqual(len(allocation), len(requirements) * n_size)
+        for i, amount in enumerate(requirements):
+            self.assertEqual(sum(allocation[i * n_size + k] * size
+                                 for k, size in enumerate(sizes)), amount)
+        for k, count in enumerate(stock):
+            self.assertLessEqual(sum(allocation[k::n_size]), count)
+
+    def test_random_blocks_agree_with_dp(self):
+        settled = 0
+        for seed in range(N_INSTANCES):
+            requirements, stock, sizes = random_block(seed)
+            try:
+                dp = solve_material_dp("M", requirements, stock, sizes)
+            except StateSpaceExceeded:
+                continue
+            presolved = presolve_material(requirements, stock, sizes)
+            with self.subTest(seed=seed):
+                if presolved['greedy'] is not None:
+                    self.assert_feasible(presolved['greedy'], requirements, stock, sizes)
+                if presolved['status'] == "Infeasible":
+                    self.assertEqual(dp['status'], "Infeasible")
+                elif presolved['status'] == "Optimal":
+                    self.assertEqual(dp['status'], "Optimal")
+                    self.assert_feasible(presolved['allocation'], requirements, stock, sizes)
+                    self.assertEqual(sum(presolved['allocation']), sum(dp['allocation']))
+                if dp['status'] == "Optimal":
+                    self.assertLessEqual(presolved['bound'], sum(dp['allocation']))
+                    if presolved['greedy'] is not None:
+                        self.assertGreaterEqual(sum(presolved['greedy']), sum(dp['allocation']))
+            settled += presolved['status'] is not None
+        # Most random blocks are settled without a solver
+        self.assertGreater(settled, N_INSTANCES // 2)
+
+    def test_drops_empty_locations_and_unusable_sizes(self):
+        # Location 1 needs nothing; size 32 is larger than every amount and
+        # size 4 is out of stock
+        presolved = presolve_material([16, 0, 10], [5, 0, 5, 2], [2, 4, 8, 32])
+        self.assertEqual(presolved['locations'], [0, 2])
+        self.assertEqual(presolved['sizes'], [0, 2])
+        self.assertEqual(presolved['stats']['rows_dropped'], 1)
+        self.assertEqual(presolved['stats']['columns_dropped'], 4 + 2 * 2)
+
+    def test_block_without_requirements_is_optimal(self):
+        presolved = presolve_material([0, 0], [0, 3], [1, 2])
+        self.assertEqual(presolved['status'], "Optimal")
+        self.assertEqual(presolved['allocation'], [0, 0, 0, 0])
+
+    def test_greedy_meeting_the_bound_is_optimal(self):
+        presolved = presolve_material([24, 10], [10, 10, 10], [1, 2, 8])
+        self.assertEqual(presolved['status'], "Optimal")
+        self.assertEqual(presolved['allocation'], [0, 0, 3, 0, 1, 1])
+        self.assertEqual(presolved['bound'], 5)
+
+    def test_amount_no_mix_can_make_is_infeasible(self):
+        self.assertEqual(presolve_material([7], [10, 10], [2, 4])['status'], "Infeasible")
+
+    def test_demand_over_capacity_is_infeasible(self):
+        self.assertEqual(presolve_material([16, 16], [3], [8])['status'], "Infeasible")
+
+    def test_negative_amounts_are_infeasible(self):
+        self.assertEqual(presolve_material([-8], [4], [8])['status'], "Infeasible")
+        self.assertEqual(presolve_material([8], [-1, 4], [4, 8])['status'], "Infeasible")
+
+    def test_block_greedy_cannot_settle_is_left_to_a_solver(self):
+        # 3 + 3 would take two containers but only one 3 is in stock, so the
+        # greedy 4 + 1 + 1 stays above the bound
+        presolved = presolve_material([6], [2, 1, 1], [1, 3, 4])
+        self.assertIsNone(presolved['status'])
+        self.assertIsNone(presolved['allocation'])
+        self.assertEqual(presolved['greedy'], [2, 0, 1])
+        self.assertEqual(presolved['bound'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
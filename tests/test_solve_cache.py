@@ -0,0 +1,50 @@
+"""
+Solve Cache
+Results persisted to the cache folder are read back and the folder keeps at
+most maxsize files
+"""
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from problem import Allocation
+from solve_cache import SolveCache
+
+
+def result(count):
+    allocation = Allocation(["A"], ["X"], [1], [count])
+    return {'success': True, 'allocation': allocation, 'total_containers': count,
+            'material_status': {'X': "Optimal"}}
+
+
+class TestPersistentCache(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.cache_dir = Path(self.folder.name) / ".solve_cache"
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def test_entries_are_read_back_by_a_new_cache(self):
+        SolveCache(cache_dir=self.cache_dir).put("key", result(3))
+        cached = SolveCache(cache_dir=self.cache_dir).get("key")
+        self.assertEqual(cached['total_containers'], 3)
+        self.assertEqual(list(cached['allocation'].counts), [3])
+        # Only finished entries, no temporary files
+        self.assertEqual(os.listdir(self.cache_dir), ["key.json"])
+
+    def test_folder_keeps_the_most_recently_used_files(self):
+        cache = SolveCache(maxsize=3, cache_dir=self.cache_dir)
+        for i in range(3):
+            cache.put(f"key{i}", result(i))
+            os.utime(self.cache_dir / f"key{i}.json", ns=(i, i))
+        # A hit from another instance keeps key0
+        SolveCache(cache_dir=self.cache_dir).get("key0")
+        cache.put("key3", result(3))
+        self.assertEqual(sorted(os.listdir(self.cache_dir)), ["key0.json", "key2.json", "key3.json"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,223 @@
+"""
+Solver Cancel and Shutdown
+Cancelling or closing a solver must stop the blocks already running in its
+process pool, including their CBC processes, and a cancel sent before the
+worker starts solving must not be lost
+"""
+
+import os
+import random
+import threading
+import time
+import unittest
+
+from problem import AllocationProblem
+from solver import ContainerSolver
+from solver_worker import SolverWorker, _read_requests
+
+
+# Seconds to wait for the pool to start CBC on the hard instance
+START_TIMEOUT = 60
+
+# Seconds cancelled or closed processes get to disappear
+STOP_TIMEOUT = 10
+
+SIZES = [1, 2, 4, 8, 16, 24, 32, 48]
+
+
+def hard_problem(n_materials=2, n_locations=200, seed=2):
+    """
+    Instance CBC needs many seconds for when presolve is off
+
+    Every requirement is the SCU of a random container mix and the stock is
+    exactly what the mixes use, so the instance is feasible but tight.
+    """
+    rnd = random.Random(seed)
+    problem = AllocationProblem([f"L{i}" for i in range(n_locations)],
+                                [f"M{j}" for j in range(n_materials)], SIZES)
+    for j in range(n_materials):
+        for i in range(n_locations):
+            amount = 0
+            for k, size in enumerate(SIZES):
+                count = rnd.randint(0, 60)
+                problem.available[j * len(SIZES) + k] += count
+                amount += count * size
+            problem.requirements[i * n_materials + j] = amount
+    return problem
+
+
+def slow_solver(cls):
+    """Solver with two pool workers that leaves the hard instance to CBC"""
+    return cls(workers=2, backend="pulp", model="pulp", presolve=False, diagnose=False,
+               incremental=False)
+
+
+def child_processes():
+    """Map of pid -> parent pid of every process, read from /proc"""
+    parents = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # The command name may contain spaces, so split after its parenthesis
+        parents[int(entry)] = int(stat.rsplit(")", 1)[1].split()[1])
+    return parents
+
+
+def descendants(pid):
+    """Pids of every process started by pid, directly or not"""
+    parents = child_processes()
+    found, frontier = set(), {pid}
+    while frontier:
+        frontier = {child for child, parent in parents.items() if parent in frontier} - found
+        found |= frontier
+    return found
+
+
+def command(pid):
+    try:
+        with open(f"/proc/{pid}/comm") as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def running(pid):
+    """Whether pid exists and is not a zombie"""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            return f.read().rsplit(")", 1)[1].split()[0] != "Z"
+    except OSError:
+        return False
+
+
+def wait_for_cbc(pid):
+    """Descendants of pid once two CBC processes run among them"""
+    deadline = time.monotonic() + START_TIMEOUT
+    while time.monotonic() < deadline:
+        found = descendants(pid)
+        if sum(1 for child in found if command(child) == "cbc") >= 2:
+            return found
+        time.sleep(0.05)
+    raise AssertionError("the pool did not start CBC")
+
+
+class ProcessTestCase(unittest.TestCase):
+    def assert_stopped(self, pids):
+        deadline = time.monotonic() + STOP_TIMEOUT
+        while time.monotonic() < deadline and any(running(pid) for pid in pids):
+            time.sleep(0.05)
+        self.assertEqual({pid for pid in pids if running(pid)}, set())
+
+
+@unittest.skipUnless(os.path.isdir("/proc/self"), "needs /proc to follow child processes")
+class TestPoolCancel(ProcessTestCase):
+    def test_cancel_stops_running_pool_blocks(self):
+        solver = slow_solver(ContainerSolver)
+        results = []
+        thread = threading.Thread(target=lambda: results.append(solver.solve_problem(hard_problem())))
+        try:
+            solver.prepare_solve()
+            thread.start()
+            started = wait_for_cbc(os.getpid())
+            solver.cancel()
+            thread.join(STOP_TIMEOUT)
+            self.assertFalse(thread.is_alive())
+            self.assertTrue(results[0].get('cancelled'))
+            self.assert_stopped(started)
+        finally:
+            solver.cancel()
+            thread.join()
+            solver.close()
+
+    def test_next_solve_after_cancel_uses_a_new_pool(self):
+        solver = ContainerSolver(workers=2, backend="pulp")
+        try:
+            solver._get_executor()
+            solver.stop_pool()
+            problem = AllocationProblem(["A", "B"], ["X", "Y"], [1, 2],
+                                        requirements=[3, 2, 4, 1], available=[5, 5, 5, 5])
+            self.assertTrue(solver.solve_problem(problem)['success'])
+        finally:
+            solver.close()
+
+
+@unittest.skipUnless(os.path.isdir("/proc/self"), "needs /proc to follow child processes")
+class TestWorkerClose(ProcessTestCase):
+    def start_solve(self, worker):
+        """Run a solve of the hard instance in a thread; returns its descendants once CBC runs"""
+        worker.start()
+
+        def solve():
+            try:
+                worker.solve_problem(hard_problem())
+            except Exception:
+                # close() pulls the pipes from under the solve
+                pass
+
+        threading.Thread(target=solve, daemon=True).start()
+        return wait_for_cbc(worker._process.pid) | {worker._process.pid}
+
+    def test_close_during_solve_stops_every_child(self):
+        worker = slow_solver(SolverWorker)
+        started = self.start_solve(worker)
+        worker.close()
+        self.assert_stopped(started)
+
+    def test_terminated_worker_stops_every_child(self):
+        worker = slow_solver(SolverWorker)
+        try:
+            started = self.start_solve(worker)
+            # What close() falls back to when the worker does not stop in time
+            worker._process.terminate()
+            self.assert_stopped(started)
+        finally:
+            worker.close()
+
+
+class FakeConnection:
+    """Request pipe end replaying a fixed list of messages"""
+
+    def __init__(self, messages):
+        self.messages = list(messages)
+
+    def recv(self):
+        if not self.messages:
+            raise EOFError()
+        return self.messages.pop(0)
+
+
+class TestWorkerEarlyCancel(unittest.TestCase):
+    def test_cancel_before_the_solve_starts_is_kept(self):
+        problem = AllocationProblem(["A"], ["X"], [1], requirements=[1], available=[1])
+        solver = ContainerSolver()
+        commands = []
+
+        class Commands:
+            put = commands.append
+
+        # The cancel is read while the solve still waits in the command queue
+        _read_requests(FakeConnection([('solve', problem), ('cancel',), ('close',)]),
+                       solver, Commands())
+        self.assertEqual([message[0] for message in commands], ['solve', 'close'])
+        self.assertTrue(solver.solve_problem(commands[0][1]).get('cancelled'))
+
+    def test_cancel_of_a_previous_solve_is_not_kept(self):
+        problem = AllocationProblem(["A"], ["X"], [1], requirements=[1], available=[1])
+        solver = ContainerSolver()
+        commands = []
+
+        class Commands:
+            put = commands.append
+
+        _read_requests(FakeConnection([('cancel',), ('solve', problem), ('close',)]),
+                       solver, Commands())
+        self.assertTrue(solver.solve_problem(commands[0][1])['success'])
+
+
+if __name__ == '__main__':
+    unittest.main()